@@ -0,0 +1,98 @@
+"""Compare per-record and columnar contact normalization on synthetic payloads.
+
+The ``hook`` path calls each plugin's ``filter_contacts`` through the plugin
+manager, as the routes do, so pluggy dispatch and payload unwrapping are
+included.
+
+Run from the repository root:
+
+    PYTHONPATH=src python benchmarks/bench_normalize.py [--records 100000]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from addons.integration.columnar import ContactColumns
+from addons.integration.hookspec import get_crm_hook_caller, get_plugin_manager
+from addons.integration.mappings import CAPSULE_CONTACT_MAPPING, ZOHO_CONTACT_MAPPING
+from synthetic import capsule_record, zoho_record
+
+
+def peak_memory(fn) -> int:
+    tracemalloc.start()
+    result = fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pm = get_plugin_manager()
+    cases = [
+        ("capsule", CAPSULE_CONTACT_MAPPING, [capsule_record(i) for i in range(args.records)]),
+        ("zoho", ZOHO_CONTACT_MAPPING, [zoho_record(i) for i in range(args.records)]),
+    ]
+
+    print(f"{'crm':<8} {'path':<12} {'seconds':>9} {'records/s':>12} {'peak MiB':>10}")
+    for crm_name, mapping, records in cases:
+        pages = [
+            records[start : start + args.page_size]
+            for start in range(0, len(records), args.page_size)
+        ]
+        batch = ContactColumns.from_records(mapping, records, crm_name)
+        for row, expected in zip(batch.rows(), mapping.map_many(records)):
+            assert all(row[name] == value for name, value in expected.items())
+
+        def per_record():
+            contacts = []
+            for page in pages:
+                contacts.extend(mapping.map_many(page))
+            return contacts
+
+        filter_contacts = get_crm_hook_caller(pm, "filter_contacts", crm_name)
+        envelope = "parties" if crm_name == "capsule" else "data"
+
+        def hook():
+            contacts = []
+            for page in pages:
+                contacts.extend(filter_contacts(contacts={envelope: page})[0])
+            return contacts
+
+        def columnar():
+            batch = ContactColumns()
+            for page in pages:
+                batch.extend(mapping, page, crm_name)
+            return batch
+
+        for path, fn in (
+            ("per-record", per_record),
+            ("hook", hook),
+            ("columnar", columnar),
+        ):
+            seconds = best_of(args.repeat, fn)
+            peak = peak_memory(fn) / 2**20
+            print(
+                f"{crm_name:<8} {path:<12} {seconds:>9.3f} "
+                f"{len(records) / seconds:>12,.0f} {peak:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
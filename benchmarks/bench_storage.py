@@ -0,0 +1,108 @@
+"""Time token/state store and contact store operations on throwaway files.
+
+Run from the repository root:
+
+    PYTHONPATH=src python benchmarks/bench_storage.py [--operations 2000] [--contacts 10000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from addons.integration.mappings import ZOHO_CONTACT_MAPPING
+from addons.storage.contacts import ContactStore
+from addons.storage.json_store import JSONTokenStore
+from addons.storage.sqlite_store import SQLiteTokenStore
+from synthetic import zoho_record
+
+
+def report(name: str, operations: int, fn) -> None:
+    start = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - start
+    print(
+        f"{name:<32} {operations:>8} {seconds:>9.3f} "
+        f"{operations / seconds:>12,.0f} {seconds / operations * 1e6:>9.1f}"
+    )
+
+
+def bench_token_store(label: str, store, operations: int) -> None:
+    crms = ("zoho", "capsule")
+    tokens = {"access_token": "a" * 64, "refresh_token": "r" * 64, "expires_in": 3600}
+
+    def save_tokens():
+        for i in range(operations):
+            store.save_tokens(crms[i % 2], tokens)
+
+    def get_tokens():
+        for i in range(operations):
+            store.get_tokens(crms[i % 2])
+
+    def state_round_trip():
+        for i in range(operations):
+            store.save_state(crms[i % 2], f"state-{i}")
+            store.get_state(crms[i % 2])
+
+    report(f"{label} save_tokens", operations, save_tokens)
+    report(f"{label} get_tokens", operations, get_tokens)
+    report(f"{label} save_state+get_state", operations, state_round_trip)
+    store.close()
+
+
+def bench_contact_store(store: ContactStore, total: int, page_size: int, lookups: int) -> None:
+    contacts = ZOHO_CONTACT_MAPPING.map_many([zoho_record(i) for i in range(total)])
+    pages = [contacts[start : start + page_size] for start in range(0, total, page_size)]
+
+    def upsert():
+        for page in pages:
+            store.upsert_contacts("zoho", page)
+
+    def query_email():
+        for i in range(lookups):
+            store.query(email=contacts[(i * 7919) % total]["email"])
+
+    def get_contact():
+        for i in range(lookups):
+            store.get_contact("zoho", contacts[(i * 7919) % total]["id"])
+
+    report("contacts upsert (insert)", total, upsert)
+    report("contacts upsert (update)", total, upsert)
+    report("contacts query by email", lookups, query_email)
+    report("contacts get_contact", lookups, get_contact)
+    report("contacts query page", lookups, lambda: [store.query(crm="zoho") for _ in range(lookups)])
+    store.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--operations", type=int, default=2000)
+    parser.add_argument("--contacts", type=int, default=10_000)
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'operation':<32} {'count':>8} {'seconds':>9} {'ops/s':>12} {'us/op':>9}")
+    with tempfile.TemporaryDirectory() as workdir:
+        bench_token_store(
+            "sqlite", SQLiteTokenStore(os.path.join(workdir, "tokens.db")), args.operations
+        )
+        bench_token_store(
+            "json",
+            JSONTokenStore(
+                os.path.join(workdir, "tokens.json"),
+                os.path.join(workdir, "states.json"),
+                os.path.join(workdir, "cursors.json"),
+            ),
+            args.operations,
+        )
+        bench_contact_store(
+            ContactStore(os.path.join(workdir, "contacts.db")),
+            args.contacts,
+            args.page_size,
+            args.lookups,
+        )
+
+
+if __name__ == "__main__":
+    main()
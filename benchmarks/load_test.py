@@ -0,0 +1,207 @@
+"""Drive the integration API against the mock CRMs and report throughput and latency.
+
+The mock Capsule/Zoho APIs run on a local uvicorn server; the application is
+driven in-process through httpx's ASGI transport with its lifespan running, so
+the numbers cover routing, plugins, token handling, storage and the real HTTP
+round trip to the mock upstream. Run from the repository root:
+
+    PYTHONPATH=src python benchmarks/load_test.py --concurrency 32 --requests 500
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+from typing import Awaitable, Callable, List
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+
+from mock_crm import MockCRMConfig, MockCRMServer
+
+SCENARIOS = ("contacts", "fanout", "refresh", "callback", "upsert")
+# Capsule writes one request per contact and caps an upsert call at 50 by default.
+UPSERT_BATCH = {"zoho": 500, "capsule": 50}
+
+
+def configure_app_environment(mock_url: str, workdir: str, upstream_rps: float) -> None:
+    """Point both CRMs at the mock server and keep every file in ``workdir``."""
+    endpoints = {
+        "ZOHO": (f"{mock_url}/zoho/crm/v2", f"{mock_url}/zoho/oauth/v2/token"),
+        "CAPSULE": (f"{mock_url}/capsule/api/v2", f"{mock_url}/capsule/oauth/token"),
+    }
+    for crm, (api_base_url, token_url) in endpoints.items():
+        prefix = f"CRMS__{crm}__"
+        os.environ.setdefault(f"{prefix}CLIENT_ID", "bench-client")
+        os.environ.setdefault(f"{prefix}CLIENT_SECRET", "bench-secret")
+        os.environ.setdefault(f"{prefix}CONFIG__AUTH_URL", f"{mock_url}/{crm.lower()}/oauth/authorize")
+        os.environ.setdefault(f"{prefix}CONFIG__SCOPE", "contacts")
+        os.environ.setdefault(f"{prefix}CONFIG__REDIRECT_PATH", f"/integrations/callback/{crm.lower()}")
+        os.environ[f"{prefix}CONFIG__TOKEN_URL"] = token_url
+        os.environ[f"{prefix}HTTP__API_BASE_URL"] = api_base_url
+        os.environ[f"{prefix}RATE_LIMIT__REQUESTS_PER_SECOND"] = str(upstream_rps)
+        os.environ[f"{prefix}RATE_LIMIT__BURST"] = str(max(int(upstream_rps), 1))
+    os.environ["STORAGE__SQLITE_PATH"] = os.path.join(workdir, "bench.db")
+    os.environ["STORAGE__CONTACTS_PATH"] = os.path.join(workdir, "contacts.db")
+    os.environ["STORAGE__SYNC_JOBS_PATH"] = os.path.join(workdir, "sync_jobs.db")
+    os.environ["STORAGE__WEBHOOKS_PATH"] = os.path.join(workdir, "webhooks.db")
+    os.environ.setdefault("LOG_DIR", os.path.join(workdir, "logs"))
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+async def run_scenario(
+    name: str,
+    send: Callable[[int], Awaitable[httpx.Response]],
+    total: int,
+    concurrency: int,
+) -> None:
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal next_index
+        while next_index < total:
+            index = next_index
+            next_index += 1
+            start = time.perf_counter()
+            try:
+                response = await send(index)
+                statuses[response.status_code] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    errors = sum(count for status, count in statuses.items() if status != 200)
+    print(
+        f"{name:<10} {total:>6} {errors:>6} {total / elapsed:>9.1f} "
+        f"{percentile(latencies, 0.5) * 1000:>8.1f} {percentile(latencies, 0.9) * 1000:>8.1f} "
+        f"{percentile(latencies, 0.99) * 1000:>8.1f}  {dict(statuses)}"
+    )
+
+
+async def run(args) -> None:
+    from api.main import app
+
+    pages = max(-(-args.records // args.zoho_page_size), 1)
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=60
+        ) as client:
+            for crm in ("zoho", "capsule"):
+                await client.post(
+                    f"/integrations/refresh-token/{crm}", params={"refresh_token": "seed"}
+                )
+
+            callback_locks = {"zoho": asyncio.Lock(), "capsule": asyncio.Lock()}
+
+            async def contacts(index: int) -> httpx.Response:
+                return await client.get(
+                    "/integrations/contacts",
+                    params={"crm_name": "zoho", "page": random.randint(1, pages)},
+                )
+
+            async def fanout(index: int) -> httpx.Response:
+                return await client.get(
+                    "/integrations/contacts", params={"crm_name": ["zoho", "capsule"]}
+                )
+
+            async def refresh(index: int) -> httpx.Response:
+                crm = ("zoho", "capsule")[index % 2]
+                return await client.post(
+                    f"/integrations/refresh-token/{crm}", params={"refresh_token": "r"}
+                )
+
+            async def callback(index: int) -> httpx.Response:
+                # One pending OAuth state per CRM, so each CRM's flows run one at a time.
+                crm = ("zoho", "capsule")[index % 2]
+                async with callback_locks[crm]:
+                    auth = await client.get(
+                        "/integrations/authorization-url", params={"crm_name": crm}
+                    )
+                    state = parse_qs(urlsplit(auth.json()[crm]).query)["state"][0]
+                    return await client.get(
+                        f"/integrations/callback/{crm}",
+                        params={"code": f"code-{index}", "state": state},
+                    )
+
+            async def upsert(index: int) -> httpx.Response:
+                # Each request writes UPSERT_BATCH[crm] new contacts.
+                crm = ("zoho", "capsule")[index % 2]
+                contacts = [
+                    {"first_name": "Load", "last_name": f"Test {index}-{i}",
+                     "email": f"load.{index}.{i}@example.com"}
+                    for i in range(UPSERT_BATCH[crm])
+                ]
+                return await client.post(
+                    f"/integrations/contacts/{crm}/upsert", json={"contacts": contacts}
+                )
+
+            senders = {
+                "contacts": contacts,
+                "fanout": fanout,
+                "refresh": refresh,
+                "callback": callback,
+                "upsert": upsert,
+            }
+            print(
+                f"{'scenario':<10} {'reqs':>6} {'errors':>6} {'req/s':>9} "
+                f"{'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8}  statuses"
+            )
+            for name in args.scenarios:
+                await run_scenario(name, senders[name], args.requests, args.concurrency)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--zoho-page-size", type=int, default=200)
+    parser.add_argument("--capsule-page-size", type=int, default=100)
+    parser.add_argument("--unauthorized-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limited-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--upstream-rps",
+        type=float,
+        default=1000.0,
+        help="client-side CRM rate limit; the default keeps it out of the way",
+    )
+    parser.add_argument("--mock-port", type=int, default=8900)
+    args = parser.parse_args()
+
+    config = MockCRMConfig(
+        latency_ms=args.latency_ms,
+        total_records=args.records,
+        zoho_page_size=args.zoho_page_size,
+        capsule_page_size=args.capsule_page_size,
+        unauthorized_rate=args.unauthorized_rate,
+        rate_limited_rate=args.rate_limited_rate,
+    )
+    with tempfile.TemporaryDirectory() as workdir, MockCRMServer(
+        config, port=args.mock_port
+    ) as mock:
+        configure_app_environment(mock.base_url, workdir, args.upstream_rps)
+        asyncio.run(run(args))
+        print("mock upstream responses:", dict(config.responses))
+
+
+if __name__ == "__main__":
+    main()
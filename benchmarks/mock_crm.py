@@ -0,0 +1,401 @@
+"""Local stand-in for the Capsule and Zoho APIs used by the benchmarks.
+
+Serves the token endpoints, paged contact listings, Zoho bulk reads and
+contact writes under ``/zoho`` and ``/capsule`` with configurable latency,
+dataset size, and injected 401/429 responses. Run standalone with:
+
+    PYTHONPATH=src python benchmarks/mock_crm.py --port 8900 --latency-ms 50
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import random
+import secrets
+import threading
+import time
+import zipfile
+from collections import Counter
+from dataclasses import dataclass, field
+from urllib.parse import parse_qs
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from synthetic import capsule_record, zoho_record
+
+
+@dataclass
+class MockCRMConfig:
+    latency_ms: float = 50.0
+    jitter_ms: float = 10.0
+    total_records: int = 2000
+    zoho_page_size: int = 200
+    capsule_page_size: int = 100
+    bulk_page_size: int = 200000
+    bulk_polls_until_done: int = 1
+    unauthorized_rate: float = 0.0
+    rate_limited_rate: float = 0.0
+    retry_after: int = 1
+    seed: int = 0
+    responses: Counter = field(default_factory=Counter)
+
+
+def create_app(config: MockCRMConfig) -> FastAPI:
+    app = FastAPI()
+    rng = random.Random(config.seed)
+    zoho_records = [zoho_record(i) for i in range(config.total_records)]
+    capsule_records = [capsule_record(i) for i in range(config.total_records)]
+
+    async def upstream_delay() -> None:
+        delay = config.latency_ms + rng.uniform(-config.jitter_ms, config.jitter_ms)
+        await asyncio.sleep(max(delay, 0) / 1000)
+
+    def injected_failure(crm: str):
+        roll = rng.random()
+        if roll < config.unauthorized_rate:
+            config.responses[(crm, 401)] += 1
+            return JSONResponse({"code": "INVALID_TOKEN"}, status_code=401)
+        if roll < config.unauthorized_rate + config.rate_limited_rate:
+            config.responses[(crm, 429)] += 1
+            return JSONResponse(
+                {"code": "TOO_MANY_REQUESTS"},
+                status_code=429,
+                headers={"Retry-After": str(config.retry_after)},
+            )
+        return None
+
+    def page_slice(records, page: int, per_page: int):
+        start = (page - 1) * per_page
+        return records[start : start + per_page], start + per_page < len(records)
+
+    async def issue_token(crm: str, request: Request):
+        await upstream_delay()
+        # Token requests are form-encoded; parsed here to avoid requiring python-multipart.
+        form = parse_qs((await request.body()).decode())
+        config.responses[(crm, 200)] += 1
+        return {
+            "access_token": secrets.token_hex(16),
+            "refresh_token": form.get("refresh_token", [secrets.token_hex(16)])[0],
+            "expires_in": 3600,
+            "token_type": "Bearer",
+        }
+
+    @app.post("/zoho/oauth/v2/token")
+    async def zoho_token(request: Request):
+        return await issue_token("zoho", request)
+
+    @app.post("/capsule/oauth/token")
+    async def capsule_token(request: Request):
+        return await issue_token("capsule", request)
+
+    @app.get("/zoho/crm/v2/Contacts")
+    async def zoho_contacts(page: int = 1, per_page: int = 0, ids: str = ""):
+        await upstream_delay()
+        failure = injected_failure("zoho")
+        if failure is not None:
+            return failure
+        if ids:
+            wanted = set(ids.split(","))
+            data = [record for record in zoho_records if record["id"] in wanted]
+            config.responses[("zoho", 200 if data else 204)] += 1
+            return {"data": data} if data else Response(status_code=204)
+        per_page = min(per_page or config.zoho_page_size, config.zoho_page_size)
+        data, more = page_slice(zoho_records, page, per_page)
+        if not data:
+            config.responses[("zoho", 204)] += 1
+            return Response(status_code=204)
+        config.responses[("zoho", 200)] += 1
+        return {
+            "data": data,
+            "info": {"page": page, "per_page": per_page, "count": len(data), "more_records": more},
+        }
+
+    @app.get("/capsule/api/v2/parties")
+    async def capsule_parties(request: Request, page: int = 1, perPage: int = 0):
+        await upstream_delay()
+        failure = injected_failure("capsule")
+        if failure is not None:
+            return failure
+        per_page = min(perPage or config.capsule_page_size, config.capsule_page_size)
+        parties, more = page_slice(capsule_records, page, per_page)
+        headers = {}
+        if more:
+            next_url = request.url.include_query_params(page=page + 1, perPage=per_page)
+            headers["Link"] = f'<{next_url}>; rel="next"'
+        config.responses[("capsule", 200)] += 1
+        return JSONResponse({"parties": parties}, headers=headers)
+
+    zoho_channels = {}
+    capsule_hooks = {}
+
+    @app.api_route("/zoho/crm/v2/actions/watch", methods=["POST", "PATCH"])
+    async def zoho_watch(request: Request):
+        await upstream_delay()
+        channels = (await request.json())["watch"]
+        for channel in channels:
+            zoho_channels[str(channel["channel_id"])] = channel
+        config.responses[("zoho", 200)] += 1
+        events = [
+            {"channel_id": channel["channel_id"], "channel_expiry": channel["channel_expiry"]}
+            for channel in channels
+        ]
+        return {"watch": [{"code": "SUCCESS", "status": "success", "details": {"events": events}}]}
+
+    @app.delete("/zoho/crm/v2/actions/watch")
+    async def zoho_unwatch(channel_ids: str):
+        for channel_id in channel_ids.split(","):
+            zoho_channels.pop(channel_id, None)
+        config.responses[("zoho", 200)] += 1
+        return {"watch": [{"code": "SUCCESS", "status": "success"}]}
+
+    @app.get("/capsule/api/v2/resthooks")
+    async def capsule_list_hooks():
+        return {"restHooks": list(capsule_hooks.values())}
+
+    @app.post("/capsule/api/v2/resthooks", status_code=201)
+    async def capsule_create_hook(request: Request):
+        await upstream_delay()
+        hook = {**(await request.json())["restHook"], "id": len(capsule_hooks) + 1}
+        capsule_hooks[str(hook["id"])] = hook
+        config.responses[("capsule", 201)] += 1
+        return {"restHook": hook}
+
+    @app.delete("/capsule/api/v2/resthooks/{hook_id}", status_code=204)
+    async def capsule_delete_hook(hook_id: str):
+        capsule_hooks.pop(hook_id, None)
+        return Response(status_code=204)
+
+    @app.get("/capsule/api/v2/parties/{party_ids}")
+    async def capsule_parties_by_id(party_ids: str):
+        await upstream_delay()
+        wanted = {int(party_id) for party_id in party_ids.split(",")}
+        parties = [party for party in capsule_records if party["id"] in wanted]
+        config.responses[("capsule", 200)] += 1
+        return {"parties": parties}
+
+    zoho_index = {record["id"]: record for record in zoho_records}
+    zoho_emails = {record["Email"]: record for record in zoho_records}
+    capsule_index = {party["id"]: party for party in capsule_records}
+
+    @app.post("/zoho/crm/v2/Contacts/upsert")
+    async def zoho_upsert(request: Request):
+        await upstream_delay()
+        failure = injected_failure("zoho")
+        if failure is not None:
+            return failure
+        outcomes = []
+        for record in (await request.json())["data"]:
+            existing = zoho_index.get(str(record.get("id"))) or zoho_emails.get(record.get("Email"))
+            if existing is None and not record.get("Last_Name"):
+                outcomes.append({
+                    "code": "MANDATORY_NOT_FOUND",
+                    "details": {"api_name": "Last_Name"},
+                    "message": "required field not found",
+                    "status": "error",
+                })
+                continue
+            if existing is None:
+                existing = {"id": str(len(zoho_records) + 1)}
+                zoho_records.append(existing)
+                zoho_index[existing["id"]] = existing
+                action = "insert"
+            else:
+                action = "update"
+            existing.update(record)
+            if existing.get("Email"):
+                zoho_emails[existing["Email"]] = existing
+            outcomes.append({
+                "code": "SUCCESS",
+                "action": action,
+                "details": {"id": existing["id"]},
+                "message": f"record {'added' if action == 'insert' else 'updated'}",
+                "status": "success",
+            })
+        status_code = 200 if any(o["status"] == "success" for o in outcomes) else 400
+        config.responses[("zoho", status_code)] += 1
+        return JSONResponse({"data": outcomes}, status_code=status_code)
+
+    @app.post("/capsule/api/v2/parties")
+    async def capsule_create_party(request: Request):
+        await upstream_delay()
+        failure = injected_failure("capsule")
+        if failure is not None:
+            return failure
+        party = (await request.json())["party"]
+        if not party.get("firstName") and not party.get("lastName"):
+            config.responses[("capsule", 422)] += 1
+            return JSONResponse(
+                {"message": "validation failed", "errors": [{"message": "name is required"}]},
+                status_code=422,
+            )
+        party = {**party, "id": len(capsule_records) + 1}
+        capsule_records.append(party)
+        capsule_index[party["id"]] = party
+        config.responses[("capsule", 201)] += 1
+        return JSONResponse({"party": party}, status_code=201)
+
+    @app.put("/capsule/api/v2/parties/{party_id}")
+    async def capsule_update_party(party_id: int, request: Request):
+        await upstream_delay()
+        failure = injected_failure("capsule")
+        if failure is not None:
+            return failure
+        party = capsule_index.get(party_id)
+        if party is None:
+            config.responses[("capsule", 404)] += 1
+            return JSONResponse({"message": "party not found"}, status_code=404)
+        changes = (await request.json())["party"]
+        for key in ("emailAddresses", "phoneNumbers"):
+            # Like Capsule: items with an id replace (or _delete) that item,
+            # items without one are added.
+            items = {item["id"]: item for item in party.get(key, [])}
+            for item in changes.pop(key, []):
+                if "id" not in item:
+                    new_id = max(items, default=0) + 1
+                    items[new_id] = {**item, "id": new_id}
+                elif item.get("_delete"):
+                    items.pop(item["id"], None)
+                else:
+                    items[item["id"]] = {**items.get(item["id"], {}), **item}
+            party[key] = list(items.values())
+        party.update(changes)
+        config.responses[("capsule", 200)] += 1
+        return {"party": party}
+
+    bulk_jobs = {}
+    bulk_columns = (
+        "Id", "First_Name", "Last_Name", "Full_Name", "Email", "Phone", "Mobile", "Modified_Time",
+        "Owner",
+    )
+
+    def bulk_cell(record, column):
+        if column == "Id":
+            return record["id"]
+        if column == "Owner":
+            # Bulk Read exports lookups as the related record's id.
+            return (record.get("Owner") or {}).get("id")
+        return record.get(column)
+
+    @app.get("/zoho/crm/v2/users")
+    async def zoho_users():
+        await upstream_delay()
+        owners = {
+            record["Owner"]["id"]: record["Owner"] for record in zoho_records if record.get("Owner")
+        }
+        config.responses[("zoho", 200)] += 1
+        return {"users": list(owners.values()), "info": {"page": 1, "more_records": False}}
+
+    @app.post("/zoho/crm/bulk/v2/read", status_code=201)
+    async def zoho_bulk_read(request: Request):
+        await upstream_delay()
+        query = (await request.json())["query"]
+        job_id = str(len(bulk_jobs) + 1)
+        bulk_jobs[job_id] = {"page": query.get("page", 1), "polls": 0}
+        config.responses[("zoho", 201)] += 1
+        return JSONResponse(
+            {"data": [{"status": "success", "code": "ADDED_SUCCESSFULLY",
+                       "details": {"id": job_id, "state": "ADDED"}}]},
+            status_code=201,
+        )
+
+    @app.get("/zoho/crm/bulk/v2/read/{job_id}")
+    async def zoho_bulk_read_status(job_id: str):
+        await upstream_delay()
+        job = bulk_jobs[job_id]
+        job["polls"] += 1
+        config.responses[("zoho", 200)] += 1
+        if job["polls"] < config.bulk_polls_until_done:
+            return {"data": [{"id": job_id, "state": "IN PROGRESS"}]}
+        records, more = page_slice(zoho_records, job["page"], config.bulk_page_size)
+        return {"data": [{"id": job_id, "state": "COMPLETED", "result": {
+            "page": job["page"],
+            "count": len(records),
+            "per_page": config.bulk_page_size,
+            "more_records": more,
+            "download_url": f"/zoho/crm/bulk/v2/read/{job_id}/result",
+        }}]}
+
+    @app.get("/zoho/crm/bulk/v2/read/{job_id}/result")
+    async def zoho_bulk_read_result(job_id: str):
+        await upstream_delay()
+        records, _ = page_slice(zoho_records, bulk_jobs[job_id]["page"], config.bulk_page_size)
+        text = io.StringIO()
+        writer = csv.writer(text)
+        writer.writerow(bulk_columns)
+        for record in records:
+            writer.writerow([bulk_cell(record, column) or "" for column in bulk_columns])
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as bundle:
+            bundle.writestr(f"{job_id}.csv", text.getvalue())
+        config.responses[("zoho", 200)] += 1
+        body = archive.getvalue()
+
+        async def chunks():
+            for start in range(0, len(body), 64 * 1024):
+                yield body[start : start + 64 * 1024]
+
+        return StreamingResponse(chunks(), media_type="application/zip")
+
+    app.state.zoho_channels = zoho_channels
+    app.state.capsule_hooks = capsule_hooks
+    return app
+
+
+class MockCRMServer:
+    """Run the mock APIs with uvicorn on a background thread."""
+
+    def __init__(self, config: MockCRMConfig, host: str = "127.0.0.1", port: int = 8900):
+        self.config = config
+        self.host = host
+        self.port = port
+        self.server = uvicorn.Server(
+            uvicorn.Config(create_app(config), host=host, port=port, log_level="warning")
+        )
+        self._thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def __enter__(self) -> "MockCRMServer":
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self.server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("Mock CRM server did not start")
+            time.sleep(0.05)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.should_exit = True
+        self._thread.join(timeout=10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--zoho-page-size", type=int, default=200)
+    parser.add_argument("--capsule-page-size", type=int, default=100)
+    parser.add_argument("--unauthorized-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limited-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    config = MockCRMConfig(
+        latency_ms=args.latency_ms,
+        total_records=args.records,
+        zoho_page_size=args.zoho_page_size,
+        capsule_page_size=args.capsule_page_size,
+        unauthorized_rate=args.unauthorized_rate,
+        rate_limited_rate=args.rate_limited_rate,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
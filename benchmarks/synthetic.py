@@ -0,0 +1,36 @@
+"""Synthetic Capsule and Zoho contact records shaped like the real API payloads."""
+
+
+def capsule_record(i: int) -> dict:
+    record = {
+        "id": i,
+        "type": "person",
+        "firstName": f"First{i}",
+        "lastName": f"Last{i}",
+        "updatedAt": "2025-01-01T00:00:00Z",
+        "emailAddresses": [
+            {"id": i * 2, "type": "Home", "address": f"home{i}@example.com"},
+            {"id": i * 2 + 1, "type": "Work", "address": f"work{i}@example.com"},
+        ],
+        "phoneNumbers": [{"id": i, "type": "Work", "number": f"+1 555 {i:07d}"}],
+    }
+    if i % 3:
+        record["organisation"] = {"id": i, "name": f"Company {i % 500}"}
+    if i % 5 == 0:
+        record["name"] = f"First{i} Last{i}"
+    return record
+
+
+def zoho_record(i: int) -> dict:
+    record = {
+        "id": str(4150868000000000000 + i),
+        "First_Name": f"First{i}",
+        "Last_Name": f"Last{i}",
+        "Full_Name": f"First{i} Last{i}" if i % 4 else None,
+        "Email": f"user{i}@example.com",
+        "Phone": f"+1 555 {i:07d}",
+        "Modified_Time": "2025-01-01T00:00:00+00:00",
+        "Owner": {"id": "1", "name": "Owner", "email": "owner@example.com"},
+    }
+    record["Mobile"] = f"+1 666 {i:07d}" if i % 2 else None
+    return record
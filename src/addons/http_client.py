@@ -0,0 +1,229 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from addons.metrics import UPSTREAM_LATENCY, UPSTREAM_REQUESTS, UPSTREAM_RETRIES
+from addons.ratelimit import TokenBucket, backoff_delay, parse_retry_after
+from config.settings import AppSettings, CRMHTTPConfig, CRMRateLimitConfig
+from api.utils.logger import get_logger
+
+logger = get_logger()
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+DEFAULT_CONNECTION = "default"
+
+
+class CRMHTTPClient:
+    """Pooled async HTTP access for one CRM, with one client per upstream host.
+
+    Every request first takes a token from the connection's rate limiter.
+    429 responses, and 5xx/transport errors on idempotent requests, are retried
+    with jittered exponential backoff; a Retry-After header sets the delay and
+    pauses the limiter for the whole connection.
+    """
+
+    def __init__(
+        self,
+        crm_name: str,
+        http_config: Optional[CRMHTTPConfig] = None,
+        rate_limit: Optional[CRMRateLimitConfig] = None,
+    ):
+        self.crm_name = crm_name
+        self.http_config = http_config or CRMHTTPConfig()
+        self.rate_limit = rate_limit or CRMRateLimitConfig()
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._limiters: Dict[str, TokenBucket] = {}
+
+    def _build_client(self) -> httpx.AsyncClient:
+        cfg = self.http_config
+        http2 = cfg.http2 and HTTP2_AVAILABLE
+        if cfg.http2 and not HTTP2_AVAILABLE:
+            logger.warning(
+                "HTTP/2 requested for %s but 'h2' is not installed, using HTTP/1.1",
+                self.crm_name,
+            )
+        return httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=cfg.max_connections,
+                max_keepalive_connections=cfg.max_keepalive_connections,
+                keepalive_expiry=cfg.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(cfg.timeout, connect=cfg.connect_timeout),
+        )
+
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        client = self._clients.get(origin)
+        if client is None or client.is_closed:
+            client = self._build_client()
+            self._clients[origin] = client
+            logger.info("Opened HTTP client for %s at %s", self.crm_name, origin)
+        return client
+
+    def warm(self, *urls: Optional[str]) -> None:
+        for url in urls:
+            if url:
+                self.client_for(url)
+
+    def limiter_for(self, connection: str = DEFAULT_CONNECTION) -> TokenBucket:
+        limiter = self._limiters.get(connection)
+        if limiter is None:
+            limiter = TokenBucket(
+                self.rate_limit.requests_per_second, self.rate_limit.burst
+            )
+            self._limiters[connection] = limiter
+        return limiter
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        connection: str = DEFAULT_CONNECTION,
+        **kwargs,
+    ) -> httpx.Response:
+        policy = self.rate_limit
+        limiter = self.limiter_for(connection)
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            await limiter.acquire()
+            started = time.perf_counter()
+            try:
+                response = await self.client_for(url).request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                UPSTREAM_LATENCY.observe(
+                    time.perf_counter() - started, crm=self.crm_name, method=method
+                )
+                UPSTREAM_REQUESTS.inc(crm=self.crm_name, method=method, status="error")
+                if not idempotent or attempt >= policy.max_retries:
+                    raise
+                UPSTREAM_RETRIES.inc(crm=self.crm_name, reason="transport")
+                delay = backoff_delay(attempt, policy.backoff_base, policy.backoff_max)
+                logger.warning(
+                    "%s request failed (%r), retry %s in %.2fs",
+                    self.crm_name,
+                    e,
+                    attempt + 1,
+                    delay,
+                )
+            else:
+                status_code = response.status_code
+                UPSTREAM_LATENCY.observe(
+                    time.perf_counter() - started, crm=self.crm_name, method=method
+                )
+                UPSTREAM_REQUESTS.inc(
+                    crm=self.crm_name, method=method, status=str(status_code)
+                )
+                retryable = status_code in policy.retry_statuses and (
+                    status_code == 429 or idempotent
+                )
+                if not retryable or attempt >= policy.max_retries:
+                    return response
+
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if retry_after is not None and retry_after > policy.backoff_max:
+                    logger.warning(
+                        "%s asked to retry after %.0fs, giving up",
+                        self.crm_name,
+                        retry_after,
+                    )
+                    return response
+                if retry_after is None:
+                    delay = backoff_delay(attempt, policy.backoff_base, policy.backoff_max)
+                else:
+                    delay = retry_after
+                if status_code == 429:
+                    limiter.pause(delay)
+                UPSTREAM_RETRIES.inc(crm=self.crm_name, reason=str(status_code))
+                await response.aclose()
+                logger.warning(
+                    "%s responded %s, retry %s in %.2fs",
+                    self.crm_name,
+                    status_code,
+                    attempt + 1,
+                    delay,
+                )
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        connection: str = DEFAULT_CONNECTION,
+        **kwargs,
+    ) -> AsyncIterator[httpx.Response]:
+        """Send a rate-limited request and yield the response with its body unread.
+
+        For large downloads. Streamed requests are not retried, since part of
+        the body may already have been consumed; latency covers the headers.
+        """
+        await self.limiter_for(connection).acquire()
+        started = time.perf_counter()
+        client = self.client_for(url)
+        try:
+            response = await client.send(client.build_request(method, url, **kwargs), stream=True)
+        except httpx.TransportError:
+            UPSTREAM_REQUESTS.inc(crm=self.crm_name, method=method, status="error")
+            raise
+        UPSTREAM_LATENCY.observe(time.perf_counter() - started, crm=self.crm_name, method=method)
+        UPSTREAM_REQUESTS.inc(crm=self.crm_name, method=method, status=str(response.status_code))
+        try:
+            yield response
+        finally:
+            await response.aclose()
+
+    async def aclose(self) -> None:
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+
+class HTTPClientRegistry:
+    """Holds the shared CRM HTTP clients for the lifetime of the application."""
+
+    def __init__(self, settings: AppSettings):
+        self._clients: Dict[str, CRMHTTPClient] = {
+            crm_name: CRMHTTPClient(
+                crm_name, crm_settings.http, crm_settings.rate_limit
+            )
+            for crm_name, crm_settings in settings.crms.items()
+        }
+
+    def for_crm(self, crm_name: str) -> CRMHTTPClient:
+        crm_name = crm_name.lower()
+        if crm_name not in self._clients:
+            self._clients[crm_name] = CRMHTTPClient(crm_name)
+        return self._clients[crm_name]
+
+    async def aclose(self) -> None:
+        for client in self._clients.values():
+            await client.aclose()
+        logger.info("Closed CRM HTTP clients")
@@ -0,0 +1,678 @@
+"""Cross-CRM identity resolution over the local contact store.
+
+Contacts are linked when they share a canonical email or E.164 phone number,
+or the same normalized name at the same company. Candidates are found through
+indexed blocking keys rather than pairwise comparison, so linking a page costs
+a few index lookups per contact. Keys shared by more than ``max_block_size``
+contacts (role mailboxes, switchboard numbers) are ignored as non-identifying.
+
+Linked contacts form clusters, each with a merged "golden" record that is
+recomputed whenever one of its members changes. Contact writes only queue the
+changed ids; ``IdentityLinker`` links them in batches in the background, so
+golden records trail the contact store by about ``link_interval_seconds``.
+Clusters only merge as contacts are linked; ``rebuild`` recomputes them from
+scratch in bounded chunks into shadow tables and swaps those in at once, which
+also splits clusters whose linking data has since changed.
+
+Phone numbers are parsed with ``phonenumbers`` when it is installed
+(``pip install 'crmintegration[identity]'``) and by a digits-only fallback
+otherwise.
+"""
+
+import asyncio
+import re
+import sqlite3
+import unicodedata
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from addons.metrics import timed_storage
+from addons.serialization import dumps_str, loads
+from addons.storage.sqlite import SQLiteDatabase
+from config.settings import IdentitySettings
+from core.exception import IntegrationError
+from api.utils.logger import get_logger
+
+logger = get_logger()
+
+try:
+    import phonenumbers
+except ImportError:
+    phonenumbers = None
+
+
+
+class _Tables(NamedTuple):
+    members: str
+    keys: str
+    clusters: str
+
+
+LIVE = _Tables("identity_members", "identity_keys", "identity_clusters")
+# ``rebuild`` fills these and then copies them over the live tables.
+SHADOW = _Tables("identity_rebuild_members", "identity_rebuild_keys", "identity_rebuild_clusters")
+
+
+def _index_schema(tables: _Tables) -> str:
+    return f"""
+CREATE TABLE IF NOT EXISTS {tables.members} (
+    crm TEXT NOT NULL,
+    id TEXT NOT NULL,
+    cluster_id TEXT NOT NULL,
+    name_key TEXT NOT NULL DEFAULT '',
+    company_key TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (crm, id)
+);
+CREATE INDEX IF NOT EXISTS idx_{tables.members}_cluster ON {tables.members} (cluster_id);
+CREATE INDEX IF NOT EXISTS idx_{tables.members}_name
+    ON {tables.members} (name_key, company_key);
+CREATE TABLE IF NOT EXISTS {tables.keys} (
+    key TEXT NOT NULL,
+    crm TEXT NOT NULL,
+    id TEXT NOT NULL,
+    PRIMARY KEY (key, crm, id)
+);
+CREATE INDEX IF NOT EXISTS idx_{tables.keys}_member ON {tables.keys} (crm, id);
+CREATE TABLE IF NOT EXISTS {tables.clusters} (
+    cluster_id TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    golden TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+
+SCHEMA = _index_schema(LIVE) + """CREATE TABLE IF NOT EXISTS identity_pending (
+    crm TEXT NOT NULL,
+    id TEXT NOT NULL,
+    PRIMARY KEY (crm, id)
+);
+CREATE TABLE IF NOT EXISTS identity_rebuild (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    owner TEXT NOT NULL,
+    heartbeat TEXT NOT NULL
+);
+"""
+
+_NON_DIGITS = re.compile(r"\D")
+_EXTENSION = re.compile(r"\s*(?:ext\.?|extension|x|#)\s*\d+\s*$", re.IGNORECASE)
+_NON_LETTERS = re.compile(r"[^a-z0-9]+")
+_COMPANY_SUFFIXES = re.compile(
+    r"\b(inc|incorporated|ltd|limited|llc|llp|plc|gmbh|corp|corporation|co|company|sa|ag|bv)\b"
+)
+_GMAIL_DOMAINS = {"gmail.com", "googlemail.com"}
+
+
+def canonical_email(email: Optional[str]) -> str:
+    """Lowercase an address and drop ``+tags`` (and dots, for Gmail) from the local part."""
+    email = (email or "").strip().lower()
+    local, _, domain = email.rpartition("@")
+    if not local or not domain:
+        return ""
+    local = local.split("+", 1)[0]
+    if domain in _GMAIL_DOMAINS:
+        local, domain = local.replace(".", ""), "gmail.com"
+    return f"{local}@{domain}" if local else ""
+
+
+def normalize_phone_e164(phone: Optional[str], default_country_code: str = "1") -> str:
+    """Format a phone number as E.164 (``+15550100``), or return "" if it cannot be."""
+    phone = (phone or "").strip()
+    if not phone:
+        return ""
+    if phonenumbers is not None:
+        region = phonenumbers.region_code_for_country_code(int(default_country_code))
+        try:
+            parsed = phonenumbers.parse(phone, region)
+        except phonenumbers.NumberParseException:
+            return ""
+        if not phonenumbers.is_possible_number(parsed):
+            return ""
+        return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+
+    digits = _NON_DIGITS.sub("", _EXTENSION.sub("", phone))
+    if phone.startswith("+"):
+        number = digits
+    elif digits.startswith("00"):
+        number = digits[2:]
+    elif default_country_code == "1":
+        # North American numbers: ten digits, optionally after 1 or the 011 exit code.
+        if digits.startswith("011"):
+            number = digits[3:]
+        elif len(digits) == 10:
+            number = "1" + digits
+        elif len(digits) == 11 and digits.startswith("1"):
+            number = digits
+        else:
+            return ""
+    else:
+        # Drop the national trunk prefix before adding the country code.
+        number = default_country_code + digits.lstrip("0")
+    return f"+{number}" if 8 <= len(number) <= 15 else ""
+
+
+def _fold(value: Optional[str]) -> str:
+    value = unicodedata.normalize("NFKD", value or "")
+    return "".join(ch for ch in value if not unicodedata.combining(ch)).lower()
+
+
+def name_key(contact: Dict[str, Any]) -> str:
+    """``last|first`` from the normalized name parts, falling back to splitting ``name``."""
+    first = _NON_LETTERS.sub("", _fold(contact.get("first_name")))
+    last = _NON_LETTERS.sub("", _fold(contact.get("last_name")))
+    if not (first and last):
+        parts = _NON_LETTERS.sub(" ", _fold(contact.get("name"))).split()
+        if len(parts) < 2:
+            return ""
+        first, last = parts[0], parts[-1]
+    return f"{last}|{first}"
+
+
+def company_key(company: Optional[str]) -> str:
+    folded = _COMPANY_SUFFIXES.sub(" ", _NON_LETTERS.sub(" ", _fold(company)))
+    return " ".join(folded.split())
+
+
+def merge_golden(
+    cluster_id: str,
+    members: List[Tuple[str, Dict[str, Any]]],
+    default_country_code: str = "1",
+) -> Dict[str, Any]:
+    """Merge ``(crm, contact)`` members; the most recently updated non-empty value wins."""
+    ordered = sorted(members, key=lambda member: member[1].get("updated_at") or "", reverse=True)
+    golden: Dict[str, Any] = {"cluster_id": cluster_id}
+    for field in ("first_name", "last_name", "name", "company", "owner_email", "updated_at"):
+        golden[field] = next(
+            (contact[field] for _, contact in ordered if contact.get(field)), ""
+        )
+    emails, phones = [], []
+    for _, contact in ordered:
+        email = (contact.get("email") or "").strip().lower()
+        if email and email not in emails:
+            emails.append(email)
+        for field in ("phone", "mobile"):
+            phone = normalize_phone_e164(contact.get(field), default_country_code)
+            if phone and phone not in phones:
+                phones.append(phone)
+    golden["emails"] = emails
+    golden["phones"] = phones
+    golden["sources"] = [{"crm": crm, "id": str(contact.get("id"))} for crm, contact in ordered]
+    return golden
+
+
+def _select_in(
+    conn: sqlite3.Connection, sql: str, params: List[Any], values: Iterable[Any], chunk: int = 500
+) -> Iterator[sqlite3.Row]:
+    """Run ``sql`` with its ``IN ({})`` placeholder filled in chunks of ``values``."""
+    values = list(values)
+    for start in range(0, len(values), chunk):
+        batch = values[start : start + chunk]
+        yield from conn.execute(sql.format(", ".join("?" for _ in batch)), [*params, *batch])
+
+
+class IdentityIndex:
+    """Blocking-key index and golden records kept in the contact store's database.
+
+    ``enqueue`` takes the connection of the contact store's open transaction,
+    so a contact write and its queue entry commit together. ``link_pending``
+    later links the queued contacts that still exist and unlinks the rest.
+    """
+
+    def __init__(self, db: SQLiteDatabase, settings: IdentitySettings):
+        self.db = db
+        self.settings = settings
+        db.connection().executescript(SCHEMA)
+
+    def contact_keys(self, contact: Dict[str, Any]) -> List[str]:
+        keys = []
+        email = canonical_email(contact.get("email"))
+        if email:
+            keys.append(f"e:{email}")
+        for field in ("phone", "mobile"):
+            phone = normalize_phone_e164(contact.get(field), self.settings.default_country_code)
+            if phone and f"p:{phone}" not in keys:
+                keys.append(f"p:{phone}")
+        return keys
+
+    def enqueue_changes(self, conn: sqlite3.Connection, crm: str, data: Dict[str, str]) -> None:
+        """Queue the contacts whose serialized ``data`` differs from the stored row.
+
+        Called before the upsert writes ``data``, so re-fetching unchanged
+        pages does not relink them.
+        """
+        stored = {
+            row["id"]: row["data"]
+            for row in _select_in(
+                conn, "SELECT id, data FROM contacts WHERE crm = ? AND id IN ({})", [crm], data
+            )
+        }
+        self.enqueue(
+            conn,
+            crm,
+            [contact_id for contact_id, value in data.items() if stored.get(contact_id) != value],
+        )
+
+    def enqueue(self, conn: sqlite3.Connection, crm: str, contact_ids: Iterable[str]) -> None:
+        conn.executemany(
+            "INSERT OR IGNORE INTO identity_pending (crm, id) VALUES (?, ?)",
+            [(crm, str(contact_id)) for contact_id in contact_ids],
+        )
+
+    @timed_storage
+    def link_pending(self, limit: int) -> int:
+        """Link or unlink up to ``limit`` queued contacts in one transaction; returns how many."""
+        with self.db.transaction() as conn:
+            if self._rebuild_running(conn):
+                # The rebuild swaps in its own tables; the queue is linked after it.
+                return 0
+            rows = conn.execute(
+                "SELECT p.crm, p.id, c.data FROM identity_pending p LEFT JOIN contacts c "
+                "ON c.crm = p.crm AND c.id = p.id ORDER BY p.rowid LIMIT ?",
+                (limit,),
+            ).fetchall()
+            for crm in dict.fromkeys(row["crm"] for row in rows):
+                queued = [row for row in rows if row["crm"] == crm]
+                removed = [row["id"] for row in queued if row["data"] is None]
+                if removed:
+                    self.unlink(conn, crm, removed)
+                self.link(
+                    conn, crm, [loads(row["data"]) for row in queued if row["data"] is not None]
+                )
+            conn.executemany(
+                "DELETE FROM identity_pending WHERE crm = ? AND id = ?",
+                [(row["crm"], row["id"]) for row in rows],
+            )
+        return len(rows)
+
+    def link(
+        self,
+        conn: sqlite3.Connection,
+        crm: str,
+        contacts: Iterable[Dict[str, Any]],
+        tables: _Tables = LIVE,
+    ) -> Set[str]:
+        """Index contacts already in the contacts table and merge their clusters.
+
+        The page is resolved with a handful of set-based queries: existing
+        memberships and blocks are looked up in bulk, links are resolved with
+        an in-memory union-find (so contacts within the page link to each
+        other too), and merges are applied by relabelling the smaller clusters.
+        Returns the ids of the clusters whose golden records were refreshed.
+        """
+        members: Dict[str, Tuple[List[str], str, str]] = {}
+        for contact in contacts:
+            members[str(contact.get("id"))] = (
+                self.contact_keys(contact),
+                name_key(contact),
+                company_key(contact.get("company")),
+            )
+        if not members:
+            return set()
+        ids = list(members)
+        conn.executemany(
+            f"DELETE FROM {tables.keys} WHERE crm = ? AND id = ?", [(crm, i) for i in ids]
+        )
+        current = {
+            row["id"]: row["cluster_id"]
+            for row in _select_in(
+                conn,
+                f"SELECT id, cluster_id FROM {tables.members} WHERE crm = ? AND id IN ({{}})",
+                [crm],
+                ids,
+            )
+        }
+
+        # Blocks: every key or (name, company) pair of the page, with the
+        # clusters already holding it. Oversized blocks are dropped.
+        blocks: Dict[str, List[str]] = {}
+        for contact_id, (keys, member_name, member_company) in members.items():
+            for key in keys:
+                blocks.setdefault(f"k:{key}", []).append(contact_id)
+            if member_name and member_company:
+                blocks.setdefault(f"n:{member_name}|{member_company}", []).append(contact_id)
+
+        limit = self.settings.max_block_size
+        parent: Dict[str, str] = {}
+
+        def find(node: str) -> str:
+            parent.setdefault(node, node)
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+
+        def union(first: str, second: str) -> None:
+            parent[find(first)] = find(second)
+
+        def member_node(contact_id: str) -> str:
+            cluster_id = current.get(contact_id)
+            return f"c:{cluster_id}" if cluster_id else f"m:{contact_id}"
+
+        for contact_id in ids:
+            find(member_node(contact_id))
+        for block, block_members in blocks.items():
+            if len(block_members) > limit:
+                continue
+            if block.startswith("k:"):
+                rows = conn.execute(
+                    f"SELECT m.cluster_id FROM {tables.keys} k JOIN {tables.members} m "
+                    "ON m.crm = k.crm AND m.id = k.id WHERE k.key = ? LIMIT ?",
+                    (block[2:], limit + 1),
+                ).fetchall()
+            else:
+                # name_key holds a "|" itself; company_key never does.
+                member_name, _, member_company = block[2:].rpartition("|")
+                rows = conn.execute(
+                    f"SELECT cluster_id FROM {tables.members} "
+                    "WHERE name_key = ? AND company_key = ? LIMIT ?",
+                    (member_name, member_company, limit + 1),
+                ).fetchall()
+            if len(rows) + len(block_members) > limit:
+                continue
+            for row in rows:
+                union(block, f"c:{row['cluster_id']}")
+            for contact_id in block_members:
+                union(block, member_node(contact_id))
+
+        # Each group holds the existing clusters and the new contacts that link together.
+        groups: Dict[str, Tuple[List[str], List[str]]] = {}
+        for node in parent:
+            if node.startswith(("c:", "m:")):
+                clusters, new_ids = groups.setdefault(find(node), ([], []))
+                (clusters if node.startswith("c:") else new_ids).append(node[2:])
+        sizes = {
+            row["cluster_id"]: row["size"]
+            for row in _select_in(
+                conn,
+                f"SELECT cluster_id, size FROM {tables.clusters} WHERE cluster_id IN ({{}})",
+                [],
+                [cluster_id for clusters, _ in groups.values() for cluster_id in clusters],
+            )
+        }
+
+        relabels, dropped, new_sizes, new_members = [], [], {}, []
+        for clusters, new_ids in groups.values():
+            # New clusters get an opaque id; one derived from a member could
+            # still name a cluster that member has since left.
+            survivor = (
+                max(clusters, key=lambda cluster_id: (sizes.get(cluster_id, 0), cluster_id))
+                if clusters
+                else uuid.uuid4().hex
+            )
+            new_sizes[survivor] = sum(sizes.get(cluster_id, 0) for cluster_id in clusters)
+            for cluster_id in clusters:
+                if cluster_id != survivor and cluster_id in sizes:
+                    relabels.append((survivor, cluster_id))
+                    dropped.append((cluster_id,))
+            for contact_id in new_ids:
+                _, member_name, member_company = members[contact_id]
+                new_members.append((crm, contact_id, survivor, member_name, member_company))
+                new_sizes[survivor] += 1
+
+        conn.executemany(
+            f"UPDATE {tables.members} SET cluster_id = ? WHERE cluster_id = ?", relabels
+        )
+        conn.executemany(f"DELETE FROM {tables.clusters} WHERE cluster_id = ?", dropped)
+        conn.executemany(
+            f"UPDATE {tables.members} SET name_key = ?, company_key = ? WHERE crm = ? AND id = ?",
+            [
+                (member_name, member_company, crm, contact_id)
+                for contact_id, (_, member_name, member_company) in members.items()
+                if contact_id in current
+            ],
+        )
+        conn.executemany(
+            f"INSERT INTO {tables.members} (crm, id, cluster_id, name_key, company_key) "
+            "VALUES (?, ?, ?, ?, ?)",
+            new_members,
+        )
+        conn.executemany(
+            f"INSERT OR IGNORE INTO {tables.keys} (key, crm, id) VALUES (?, ?, ?)",
+            [(key, crm, contact_id) for contact_id, (keys, _, _) in members.items() for key in keys],
+        )
+        conn.executemany(
+            f"INSERT INTO {tables.clusters} (cluster_id, size, golden, updated_at) "
+            "VALUES (?, ?, '{}', '') "
+            "ON CONFLICT (cluster_id) DO UPDATE SET size = excluded.size",
+            list(new_sizes.items()),
+        )
+        return self._refresh(conn, new_sizes, tables)
+
+    def unlink(self, conn: sqlite3.Connection, crm: str, contact_ids: Iterable[str]) -> None:
+        ids = [str(contact_id) for contact_id in contact_ids]
+        removed: Dict[str, int] = {}
+        for row in _select_in(
+            conn,
+            "SELECT cluster_id FROM identity_members WHERE crm = ? AND id IN ({})",
+            [crm],
+            ids,
+        ):
+            removed[row["cluster_id"]] = removed.get(row["cluster_id"], 0) + 1
+        rows = [(crm, contact_id) for contact_id in ids]
+        conn.executemany("DELETE FROM identity_keys WHERE crm = ? AND id = ?", rows)
+        conn.executemany("DELETE FROM identity_members WHERE crm = ? AND id = ?", rows)
+        conn.executemany(
+            "UPDATE identity_clusters SET size = size - ? WHERE cluster_id = ?",
+            [(count, cluster_id) for cluster_id, count in removed.items()],
+        )
+        conn.execute("DELETE FROM identity_clusters WHERE size <= 0")
+        self._refresh(conn, removed)
+
+    def _refresh(
+        self, conn: sqlite3.Connection, cluster_ids: Iterable[str], tables: _Tables = LIVE
+    ) -> Set[str]:
+        """Recompute the golden records of the given clusters that still have members."""
+        members: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+        for row in _select_in(
+            conn,
+            f"SELECT m.cluster_id, c.crm, c.data FROM {tables.members} m JOIN contacts c "
+            "ON c.crm = m.crm AND c.id = m.id WHERE m.cluster_id IN ({})",
+            [],
+            cluster_ids,
+        ):
+            members.setdefault(row["cluster_id"], []).append((row["crm"], loads(row["data"])))
+        now = datetime.now(timezone.utc).isoformat()
+        conn.executemany(
+            f"UPDATE {tables.clusters} SET golden = ?, updated_at = ? WHERE cluster_id = ?",
+            [
+                (
+                    dumps_str(merge_golden(cluster_id, rows, self.settings.default_country_code)),
+                    now,
+                    cluster_id,
+                )
+                for cluster_id, rows in members.items()
+            ],
+        )
+        return set(members)
+
+    def _rebuild_running(self, conn: sqlite3.Connection) -> bool:
+        row = conn.execute("SELECT heartbeat FROM identity_rebuild").fetchone()
+        return row is not None and row["heartbeat"] >= self._lease_cutoff()
+
+    def _lease_cutoff(self) -> str:
+        lease = timedelta(seconds=self.settings.rebuild_lease_seconds)
+        return (datetime.now(timezone.utc) - lease).isoformat(timespec="microseconds")
+
+    def _renew_rebuild(self, conn: sqlite3.Connection, owner: str) -> None:
+        renewed = conn.execute(
+            "UPDATE identity_rebuild SET heartbeat = ? WHERE owner = ?",
+            (datetime.now(timezone.utc).isoformat(timespec="microseconds"), owner),
+        ).rowcount
+        if not renewed:
+            raise IntegrationError(detail="Identity rebuild lease was lost", status_code=409)
+
+    @timed_storage
+    def rebuild(self) -> Dict[str, int]:
+        """Recompute every cluster into shadow tables, then swap them in at once.
+
+        The shadow index is built ``rebuild_chunk_size`` contacts per
+        transaction, so contact writes carry on and readers keep seeing the
+        previous index until the swap. A lease row held for the duration
+        stops linkers in every worker from draining the queue, so changes
+        made during the rebuild are linked against the new index afterwards.
+        """
+        owner = uuid.uuid4().hex
+        with self.db.transaction() as conn:
+            claimed = conn.execute(
+                "INSERT INTO identity_rebuild (id, owner, heartbeat) VALUES (1, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET owner = excluded.owner, "
+                "heartbeat = excluded.heartbeat WHERE identity_rebuild.heartbeat < ?",
+                (
+                    owner,
+                    datetime.now(timezone.utc).isoformat(timespec="microseconds"),
+                    self._lease_cutoff(),
+                ),
+            ).rowcount
+        if not claimed:
+            raise IntegrationError(detail="An identity rebuild is already running", status_code=409)
+
+        conn = self.db.connection()
+        try:
+            conn.executescript(
+                "".join(f"DROP TABLE IF EXISTS {table};" for table in SHADOW)
+                + _index_schema(SHADOW)
+            )
+            last: Tuple[str, str] = ("", "")
+            linked = 0
+            while True:
+                rows = conn.execute(
+                    "SELECT crm, id, data FROM contacts WHERE (crm, id) > (?, ?) "
+                    "ORDER BY crm, id LIMIT ?",
+                    (*last, self.settings.rebuild_chunk_size),
+                ).fetchall()
+                if not rows:
+                    break
+                with self.db.transaction() as conn:
+                    self._renew_rebuild(conn, owner)
+                    for crm in dict.fromkeys(row["crm"] for row in rows):
+                        self.link(
+                            conn,
+                            crm,
+                            [loads(row["data"]) for row in rows if row["crm"] == crm],
+                            SHADOW,
+                        )
+                linked += len(rows)
+                last = (rows[-1]["crm"], rows[-1]["id"])
+
+            with self.db.transaction() as conn:
+                self._renew_rebuild(conn, owner)
+                for live, shadow in zip(LIVE, SHADOW):
+                    conn.execute(f"DELETE FROM {live}")
+                    conn.execute(f"INSERT INTO {live} SELECT * FROM {shadow}")
+                    conn.execute(f"DROP TABLE {shadow}")
+                conn.execute("DELETE FROM identity_rebuild WHERE owner = ?", (owner,))
+        except BaseException:
+            with self.db.transaction() as conn:
+                conn.execute("DELETE FROM identity_rebuild WHERE owner = ?", (owner,))
+            raise
+        return {"contacts": linked, **self.stats()}
+
+    @timed_storage
+    def get_golden(self, cluster_id: str) -> Optional[Dict[str, Any]]:
+        row = (
+            self.db.connection()
+            .execute("SELECT golden FROM identity_clusters WHERE cluster_id = ?", (cluster_id,))
+            .fetchone()
+        )
+        return loads(row["golden"]) if row else None
+
+    @timed_storage
+    def find_golden(
+        self,
+        email: Optional[str] = None,
+        phone: Optional[str] = None,
+        crm: Optional[str] = None,
+        contact_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Golden records for a contact reference, email address or phone number."""
+        conn = self.db.connection()
+        if crm and contact_id:
+            rows = conn.execute(
+                "SELECT DISTINCT g.golden FROM identity_members m JOIN identity_clusters g "
+                "ON g.cluster_id = m.cluster_id WHERE m.crm = ? AND m.id = ?",
+                (crm.lower(), str(contact_id)),
+            ).fetchall()
+            return [loads(row["golden"]) for row in rows]
+        keys = []
+        if email and canonical_email(email):
+            keys.append(f"e:{canonical_email(email)}")
+        if phone and normalize_phone_e164(phone, self.settings.default_country_code):
+            keys.append(f"p:{normalize_phone_e164(phone, self.settings.default_country_code)}")
+        if not keys:
+            return []
+        rows = conn.execute(
+            "SELECT DISTINCT g.cluster_id, g.golden FROM identity_keys k "
+            "JOIN identity_members m ON m.crm = k.crm AND m.id = k.id "
+            "JOIN identity_clusters g ON g.cluster_id = m.cluster_id "
+            f"WHERE k.key IN ({', '.join('?' for _ in keys)})",
+            keys,
+        ).fetchall()
+        return [loads(row["golden"]) for row in rows]
+
+    @timed_storage
+    def list_golden(
+        self, page: int = 1, per_page: int = 50, min_size: int = 1
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        conn = self.db.connection()
+        total = conn.execute(
+            "SELECT COUNT(*) FROM identity_clusters WHERE size >= ?", (min_size,)
+        ).fetchone()[0]
+        rows = conn.execute(
+            "SELECT golden FROM identity_clusters WHERE size >= ? "
+            "ORDER BY cluster_id LIMIT ? OFFSET ?",
+            (min_size, per_page, (page - 1) * per_page),
+        ).fetchall()
+        return [loads(row["golden"]) for row in rows], total
+
+    def stats(self) -> Dict[str, int]:
+        conn = self.db.connection()
+        clusters, members, merged = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(size > 1), 0) "
+            "FROM identity_clusters"
+        ).fetchone()
+        pending = conn.execute("SELECT COUNT(*) FROM identity_pending").fetchone()[0]
+        return {
+            "clusters": clusters,
+            "members": members,
+            "merged_clusters": merged,
+            "pending": pending,
+        }
+
+
+class IdentityLinker:
+    """Background task that drains the identity queue ``link_batch_size`` contacts at a time.
+
+    Contact writes only queue ids, so ``/contacts``, fan-out and sync upserts
+    never wait for linking. The queue lives in the database: contacts queued
+    by any worker, or before a restart, are picked up by whichever linker
+    runs next.
+    """
+
+    def __init__(self, index: IdentityIndex, settings: IdentitySettings):
+        self.index = index
+        self.settings = settings
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._drain(), name="identity-linker")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _drain(self) -> None:
+        while True:
+            try:
+                linked = await run_in_threadpool(
+                    self.index.link_pending, self.settings.link_batch_size
+                )
+            except Exception:
+                logger.exception("Linking queued contacts failed")
+                linked = 0
+            if linked < self.settings.link_batch_size:
+                await asyncio.sleep(self.settings.link_interval_seconds)
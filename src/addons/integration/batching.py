@@ -0,0 +1,51 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+CREATED = "created"
+UPDATED = "updated"
+FAILED = "failed"
+
+
+def chunked(items: Sequence[T], size: int) -> List[Tuple[int, Sequence[T]]]:
+    """Split ``items`` into ``(offset, chunk)`` pairs of at most ``size`` items."""
+    return [(start, items[start : start + size]) for start in range(0, len(items), size)]
+
+
+async def run_concurrently(
+    worker: Callable[[T], Awaitable[R]], items: Iterable[T], concurrency: int = 1
+) -> List[R]:
+    """Await ``worker`` over ``items`` with at most ``concurrency`` calls in flight.
+
+    A fixed pool of tasks pulls from a shared iterator, so large inputs do
+    not create a task per item. Results are returned in input order; the
+    first exception cancels the remaining work and is raised.
+    """
+    pending = iter(enumerate(items))
+    results: Dict[int, R] = {}
+
+    async def drain() -> None:
+        for index, item in pending:
+            results[index] = await worker(item)
+
+    tasks = [asyncio.ensure_future(drain()) for _ in range(max(concurrency, 1))]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    return [results[index] for index in range(len(results))]
+
+
+def write_result(
+    index: int, status: str, record_id: Optional[Any] = None, error: Optional[str] = None
+) -> Dict[str, Any]:
+    """One entry of an ``upsert_contacts`` result, for the contact at ``index``."""
+    result = {"index": index, "id": None if record_id is None else str(record_id), "status": status}
+    if error is not None:
+        result["error"] = error
+    return result
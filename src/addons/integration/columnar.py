@@ -0,0 +1,139 @@
+import io
+from typing import Any, Dict, Iterable, Iterator, List
+
+from addons.integration.field_mapping import FieldMapping
+
+CONTACT_COLUMNS = (
+    "crm",
+    "id",
+    "first_name",
+    "last_name",
+    "name",
+    "email",
+    "phone",
+    "mobile",
+    "company",
+    "owner_email",
+    "updated_at",
+)
+
+
+class ContactColumns:
+    """Normalized contacts held column-wise, one list per field.
+
+    Every batch shares the ``CONTACT_COLUMNS`` schema: fields a CRM does not
+    map are filled with empty strings, so batches from different CRMs can be
+    concatenated. ``to_pydict`` is directly consumable by
+    ``pyarrow.Table.from_pydict``; ``to_arrow`` and ``ParquetStream`` need
+    pyarrow (``pip install 'crmintegration[arrow]'``).
+    """
+
+    def __init__(self):
+        self.columns: Dict[str, List[Any]] = {name: [] for name in CONTACT_COLUMNS}
+        self.length = 0
+
+    @classmethod
+    def from_records(
+        cls, mapping: FieldMapping, records: Iterable[Dict[str, Any]], crm_name: str
+    ) -> "ContactColumns":
+        batch = cls()
+        batch.extend(mapping, records, crm_name)
+        return batch
+
+    def extend(
+        self, mapping: FieldMapping, records: Iterable[Dict[str, Any]], crm_name: str
+    ) -> None:
+        mapped = mapping.map_columns(records)
+        size = len(next(iter(mapped.values()), ()))
+        for name, column in self.columns.items():
+            if name == "crm":
+                column.extend([crm_name] * size)
+            elif name in mapped:
+                column.extend(mapped[name])
+            else:
+                column.extend([""] * size)
+        self.length += size
+
+    def concat(self, other: "ContactColumns") -> None:
+        for name, column in self.columns.items():
+            column.extend(other.columns[name])
+        self.length += other.length
+
+    def __len__(self) -> int:
+        return self.length
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        names = list(self.columns)
+        for values in zip(*self.columns.values()):
+            yield dict(zip(names, values))
+
+    def to_pydict(self) -> Dict[str, List[Any]]:
+        columns = dict(self.columns)
+        columns["id"] = [None if value is None else str(value) for value in columns["id"]]
+        return columns
+
+    def to_arrow(self):
+        pa = require_pyarrow()
+        return pa.Table.from_pydict(self.to_pydict(), schema=_arrow_schema(pa))
+
+
+def require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise RuntimeError(
+            "pyarrow is required for Arrow output: pip install 'crmintegration[arrow]'"
+        ) from e
+    return pyarrow
+
+
+def _arrow_schema(pa):
+    return pa.schema([(name, pa.string()) for name in CONTACT_COLUMNS])
+
+
+class _ByteSink(io.RawIOBase):
+    """Write-only file that keeps what was written until ``take`` hands it over."""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def take(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+class ParquetStream:
+    """One Parquet file written a batch (row group) at a time, returned in pieces.
+
+    ``write`` encodes a ``ContactColumns`` batch and returns the bytes it
+    produced; ``close`` returns the rest, including the footer. Concatenated,
+    the pieces form the file, so it can be streamed without being held whole.
+    """
+
+    def __init__(self):
+        pa = require_pyarrow()
+        self._sink = _ByteSink()
+        self._writer = pa.parquet.ParquetWriter(self._sink, _arrow_schema(pa))
+
+    def write(self, batch: ContactColumns) -> bytes:
+        if len(batch):
+            self._writer.write_table(batch.to_arrow())
+        return self._sink.take()
+
+    def close(self) -> bytes:
+        self._writer.close()
+        return self._sink.take()
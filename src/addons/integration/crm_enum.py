@@ -4,12 +4,16 @@ from addons.integration.plugins.zoho import ZohoCRMPlugin
 from addons.integration.plugins.capsule import CapsuleCRMPlugin
 
 
+_plugin_instances: Dict["CRMName", Any] = {}
+
+
 class CRMName(str, Enum):
     ZOHO = "zoho"
     CAPSULE = "capsule"
 
     @classmethod
     def get_plugin(cls, crm_name: str) -> Any:
+        """Return the process-wide plugin instance for ``crm_name``, creating it once."""
         crm_name = crm_name.lower()
         plugin_classes = {
             cls.ZOHO: ZohoCRMPlugin,
@@ -17,7 +21,10 @@ class CRMName(str, Enum):
         }
         try:
             crm_enum = cls(crm_name)
-            return plugin_classes[crm_enum]()
+            plugin = _plugin_instances.get(crm_enum)
+            if plugin is None:
+                plugin = _plugin_instances[crm_enum] = plugin_classes[crm_enum]()
+            return plugin
         except ValueError:
             supported_crms = [e.value for e in cls]
             raise ValueError(
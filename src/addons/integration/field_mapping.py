@@ -0,0 +1,269 @@
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+Getter = Callable[[Dict[str, Any]], Any]
+Fallback = Callable[[Dict[str, Any], Dict[str, Any]], Any]
+
+
+class Field:
+    """Top-level value taken from the first candidate key present in the record.
+
+    ``fallback(mapped, record)`` supplies the value when the resolved one is
+    empty; it runs after every other field has been mapped. Values are
+    written back under the first key unless the field is ``read_only``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *keys: str,
+        default: Any = "",
+        transform: Optional[Callable[[Any], Any]] = None,
+        fallback: Optional[Fallback] = None,
+        read_only: bool = False,
+    ):
+        self.name = name
+        self.keys = keys or (name,)
+        self.default = default
+        self.transform = transform
+        self.fallback = fallback
+        self.read_only = read_only
+
+    def put(
+        self, record: Dict[str, Any], value: Any, existing: Optional[Dict[str, Any]] = None
+    ) -> None:
+        record[self.keys[0]] = value
+
+    def getter(self, resolve: Optional[Callable[[str], Optional[str]]]) -> Getter:
+        if resolve is None:
+            keys, default, transform = self.keys, self.default, self.transform
+            if len(keys) == 1 and transform is None:
+                key = keys[0]
+                return lambda record: record.get(key, default)
+
+            def get(record):
+                for key in keys:
+                    if key in record:
+                        value = record[key]
+                        break
+                else:
+                    value = default
+                return value if transform is None else transform(value)
+
+            return get
+
+        for key in self.keys:
+            record_key = resolve(key)
+            if record_key is not None:
+                get = itemgetter(record_key)
+                if self.transform is None:
+                    return get
+                transform = self.transform
+                return lambda record: transform(get(record))
+        value = self.default if self.transform is None else self.transform(self.default)
+        return lambda record: value
+
+
+class Nested:
+    """Value read from a dict stored under ``key``; non-dict values give the default."""
+
+    def __init__(
+        self, name: str, key: str, subkey: str, default: Any = "", read_only: bool = False
+    ):
+        self.name = name
+        self.key = key
+        self.subkey = subkey
+        self.default = default
+        self.fallback = None
+        self.read_only = read_only
+
+    def put(
+        self, record: Dict[str, Any], value: Any, existing: Optional[Dict[str, Any]] = None
+    ) -> None:
+        record.setdefault(self.key, {})[self.subkey] = value
+
+    def getter(self, resolve: Optional[Callable[[str], Optional[str]]]) -> Getter:
+        record_key = self.key if resolve is None else resolve(self.key)
+        subkey, default = self.subkey, self.default
+        if record_key is None:
+            return lambda record: default
+
+        def get(record):
+            value = record.get(record_key)
+            return value.get(subkey, default) if isinstance(value, dict) else default
+
+        return get
+
+
+class Pick:
+    """Value from the first item of a list under ``key`` whose fields match ``where``."""
+
+    def __init__(
+        self,
+        name: str,
+        key: str,
+        value_key: str,
+        where: Dict[str, Any],
+        default: Any = "",
+        read_only: bool = False,
+    ):
+        self.name = name
+        self.key = key
+        self.value_key = value_key
+        self.where = tuple(where.items())
+        self.default = default
+        self.fallback = None
+        self.read_only = read_only
+
+    def put(
+        self, record: Dict[str, Any], value: Any, existing: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Append an item for ``value``, carrying the ``id`` of the item it replaces.
+
+        APIs such as Capsule add list items sent without an id, so updating
+        the matching item of ``existing`` needs that item's id.
+        """
+        item = {**dict(self.where), self.value_key: value}
+        for current in (existing or {}).get(self.key) or ():
+            if all(current.get(k) == v for k, v in self.where):
+                if "id" in current:
+                    item["id"] = current["id"]
+                break
+        record.setdefault(self.key, []).append(item)
+
+    def getter(self, resolve: Optional[Callable[[str], Optional[str]]]) -> Getter:
+        record_key = self.key if resolve is None else resolve(self.key)
+        value_key, where, default = self.value_key, self.where, self.default
+        if record_key is None:
+            return lambda record: default
+
+        def get(record):
+            for item in record.get(record_key) or ():
+                if all(item.get(k) == v for k, v in where):
+                    return item[value_key]
+            return default
+
+        return get
+
+
+class FieldMapping:
+    """Declarative CRM-to-normalized contact mapping.
+
+    With ``case_insensitive`` set, key resolution (exact match first, then
+    case-insensitive) is done once per distinct record shape and cached, so
+    mapping a record costs one lookup per field instead of a scan over the
+    record's keys. Case-sensitive mappings compile a single set of getters.
+    """
+
+    MAX_SHAPES = 256
+
+    def __init__(self, fields: Iterable, case_insensitive: bool = True):
+        self.fields = list(fields)
+        self.case_insensitive = case_insensitive
+        self._fallbacks = [(f.name, f.fallback) for f in self.fields if f.fallback]
+        self._writable = [f for f in self.fields if not f.read_only]
+        self._shapes: Dict[Tuple[str, ...], List[Tuple[str, Getter]]] = {}
+        self._static: Optional[List[Tuple[str, Getter]]] = None
+        if not case_insensitive:
+            self._static = [(f.name, f.getter(None)) for f in self.fields]
+
+    def _compile(self, shape: Tuple[str, ...]) -> List[Tuple[str, Getter]]:
+        present = set(shape)
+        lowered: Dict[str, str] = {}
+        for key in reversed(shape):
+            lowered[key.lower()] = key
+
+        def resolve(key: str) -> Optional[str]:
+            if key in present:
+                return key
+            return lowered.get(key.lower())
+
+        if len(self._shapes) >= self.MAX_SHAPES:
+            self._shapes.clear()
+        getters = [(f.name, f.getter(resolve)) for f in self.fields]
+        self._shapes[shape] = getters
+        return getters
+
+    def getters_for(self, record: Dict[str, Any]) -> List[Tuple[str, Getter]]:
+        if self._static is not None:
+            return self._static
+        shape = tuple(record)
+        getters = self._shapes.get(shape)
+        if getters is None:
+            getters = self._compile(shape)
+        return getters
+
+    def map(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        mapped = {name: get(record) for name, get in self.getters_for(record)}
+        for name, fallback in self._fallbacks:
+            if not mapped[name]:
+                mapped[name] = fallback(mapped, record)
+        return mapped
+
+    def map_many(self, records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [self.map(record) for record in records if isinstance(record, dict)]
+
+    def unmap(
+        self, contact: Dict[str, Any], existing: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Build a CRM record from a normalized contact, for writing back.
+
+        Read-only fields and empty values are left out, so a partial contact
+        only updates the fields it carries. ``existing`` is the current CRM
+        record when updating; list items are then addressed by their ids.
+        """
+        record: Dict[str, Any] = {}
+        for field in self._writable:
+            value = contact.get(field.name)
+            if value is not None and value != "":
+                field.put(record, value, existing)
+        return record
+
+    def map_columns(self, records: Iterable[Dict[str, Any]]) -> Dict[str, List[Any]]:
+        """Map records into one list per field instead of one dict per record.
+
+        Each field is filled by a single pass over the batch, so no per-record
+        dict is built. Fallbacks only run for the rows whose value is empty.
+        """
+        records = [record for record in records if isinstance(record, dict)]
+        if not records:
+            return {field.name: [] for field in self.fields}
+        getters = self._static
+        if getters is None:
+            row_getters = [self.getters_for(record) for record in records]
+            first = row_getters[0]
+            if all(row is first for row in row_getters):
+                getters = first
+        if getters is not None:
+            columns = {name: [get(record) for record in records] for name, get in getters}
+        else:
+            columns = {
+                field.name: [
+                    getters[i][1](record)
+                    for getters, record in zip(row_getters, records)
+                ]
+                for i, field in enumerate(self.fields)
+            }
+
+        for name, fallback in self._fallbacks:
+            column = columns[name]
+            for row in [row for row, value in enumerate(column) if not value]:
+                column[row] = fallback(_RowView(columns, row), records[row])
+        return columns
+
+
+class _RowView:
+    """Read-only ``mapped`` view of one row of a columnar batch, for fallbacks."""
+
+    __slots__ = ("columns", "row")
+
+    def __init__(self, columns: Dict[str, List[Any]], row: int):
+        self.columns = columns
+        self.row = row
+
+    def __getitem__(self, name: str) -> Any:
+        return self.columns[name][self.row]
+
+    def get(self, name: str, default: Any = None) -> Any:
+        column = self.columns.get(name)
+        return default if column is None else column[self.row]
@@ -1,4 +1,22 @@
+import asyncio
+import inspect
+from typing import Any, List
+
 import pluggy
 
 hookspec = pluggy.HookspecMarker("crmintegration")
 hookimpl = pluggy.HookimplMarker("crmintegration")
+
+
+async def _as_awaitable(value: Any) -> Any:
+    return value
+
+
+async def acall_hook(hook_caller, **kwargs) -> List[Any]:
+    """Call a hook whose implementations are coroutines and await their results concurrently."""
+    results = hook_caller(**kwargs)
+    return list(
+        await asyncio.gather(
+            *(r if inspect.isawaitable(r) else _as_awaitable(r) for r in results)
+        )
+    )
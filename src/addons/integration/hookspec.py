@@ -1,10 +1,22 @@
-from typing import Dict, List, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from weakref import WeakKeyDictionary
 from fastapi import Request
+from addons.integration.columnar import ContactColumns
 from addons.integration.crm_enum import CRMName
 from config.settings import AppSettings
-from addons.integration.hooks import hookspec
-from addons.integration.plugins.capsule import CapsuleCRMPlugin
-from addons.integration.plugins.zoho import ZohoCRMPlugin
+from addons.integration.hooks import acall_hook, hookspec
+from core.exception import UnsupportedCRMError
 import pluggy
 
 
@@ -15,38 +27,218 @@ class Spec:
         ...
 
     @hookspec
-    def exchange_token(crm_name: str, code: str, settings: AppSettings) -> dict:
-        """Exchange authorization code for access token."""
+    async def exchange_token(crm_name: str, code: str, settings: AppSettings) -> dict:
+        """Exchange authorization code for access token (coroutine)."""
         ...
 
     @hookspec
-    def refresh_access_token(
+    async def refresh_access_token(
         crm_name: str, refresh_token: str, settings: AppSettings
     ) -> dict:
-        """Refresh access token using refresh token."""
+        """Refresh access token using refresh token (coroutine)."""
         ...
 
     @hookspec
-    def get_contacts(
-        crm_name: str, access_token: str, refresh_token: str, page: int = 1
+    async def get_contacts(
+        crm_name: str,
+        access_token: str,
+        page: int,
+        validators: Optional[Dict[str, str]],
     ) -> dict:
-        """Fetch contacts from the CRM."""
+        """Fetch contacts from the CRM (coroutine).
+
+        ``validators`` (ETag/Last-Modified of a cached copy) make the request
+        conditional; ``{"not_modified": True}`` is returned if it still holds.
+        Fresh results carry their own ``"validators"``.
+        """
         ...
 
+    @hookspec
+    def iter_contacts(
+        crm_name: str,
+        with_tokens: Callable,
+        per_page: Optional[int],
+        modified_since: Optional[str],
+        start_page: int,
+        columnar: bool,
+    ) -> AsyncIterator[Union[List[Dict], ContactColumns]]:
+        """Walk every contacts page, yielding normalized records page by page (async generator).
+
+        ``with_tokens`` runs a coroutine function with the connection's current
+        tokens, refreshing them as needed between pages. ``modified_since`` (ISO
+        8601) limits the walk to records changed after that time. Pages are
+        yielded in order from ``start_page``, so an interrupted walk can resume.
+        With ``columnar``, each page is a ``ContactColumns`` batch mapped
+        straight from the raw records instead of a list of dicts.
+        """
+
+    @hookspec
+    def iter_contacts_bulk(
+        crm_name: str, with_tokens: Callable, modified_since: Optional[str], columnar: bool
+    ) -> AsyncIterator[Union[List[Dict], ContactColumns]]:
+        """Export every contact through the CRM's bulk API, yielding normalized chunks (async generator).
+
+        Only implemented by CRMs with an asynchronous bulk export. Results are
+        spooled to disk and mapped chunk by chunk, so memory use does not grow
+        with the export size. ``columnar`` works as for ``iter_contacts``.
+        """
+
     @hookspec
     def filter_contacts(contacts: Union[List, Dict]) -> List[Dict]:
      """Filter fetched contacts."""
     ...
 
+    @hookspec
+    async def upsert_contacts(
+        crm_name: str, with_tokens: Callable, contacts: List[Dict]
+    ) -> List[Dict]:
+        """Create or update normalized contacts in the CRM (coroutine).
+
+        Contacts carrying an ``id`` update that record; the rest are created.
+        Records are sent in the API's largest batches, each batch through
+        ``with_tokens``. Returns one ``{"index", "id", "status", "error"}``
+        result per contact, in input order; a rejected record or batch fails
+        only its own results.
+        """
+
+    @hookspec
+    def parse_webhook(crm_name: str, payload: Dict) -> Dict:
+        """Validate a pushed contact notification and describe the changes it announces.
+
+        Returns ``{"token", "records", "record_ids", "deleted_ids"}``: the
+        verification token carried in the body (or None), raw records delivered
+        with the notification, ids whose current data must be fetched, and ids
+        of deleted contacts. Raises InvalidWebhookError for anything else.
+        """
+
+    @hookspec
+    async def fetch_contacts_by_ids(
+        crm_name: str, access_token: str, ids: List[str]
+    ) -> List[Dict]:
+        """Fetch raw contact records by id (coroutine); missing ids are skipped."""
+
+    @hookspec
+    async def subscribe_webhook(
+        crm_name: str,
+        access_token: str,
+        notify_url: str,
+        token: str,
+        expires_at: str,
+        subscription_id: Optional[str],
+    ) -> Dict:
+        """Create, or renew when ``subscription_id`` is given, the contact change subscription (coroutine).
+
+        Returns ``{"subscription_id", "expires_at"}``; ``expires_at`` is None
+        for subscriptions that do not expire.
+        """
+
+    @hookspec
+    async def unsubscribe_webhook(
+        crm_name: str, access_token: str, subscription_id: str
+    ) -> None:
+        """Remove a contact change subscription (coroutine)."""
+
 
 def get_plugin_manager(crm_name: str = None) -> pluggy.PluginManager:
     pm = pluggy.PluginManager("crmintegration")
     pm.add_hookspecs(Spec)
 
-    if crm_name is None:
-        pm.register(CapsuleCRMPlugin(), name="CapsuleCRMPlugin")
-        pm.register(ZohoCRMPlugin(), name="ZohoCRMPlugin")
-    else:
-        plugin = CRMName.get_plugin(crm_name)
+    crm_names = [crm.value for crm in CRMName] if crm_name is None else [crm_name]
+    for name in crm_names:
+        plugin = CRMName.get_plugin(name)
         pm.register(plugin, name=f"{plugin.__class__.__name__}")
     return pm
+
+
+class CRMHookCallers:
+    """Plugins of one plugin manager indexed by CRM name, with memoized subset callers.
+
+    Subset hook callers are cached per hook and frozen set of CRM names. The
+    index is rebuilt when plugins are registered or unregistered.
+    """
+
+    def __init__(self, pm: pluggy.PluginManager):
+        self.pm = pm
+        self._plugin_ids: FrozenSet[int] = frozenset()
+        self._plugins: Dict[str, object] = {}
+        self._callers: Dict[Tuple[str, FrozenSet[str]], Any] = {}
+
+    def _sync(self) -> None:
+        plugins = self.pm.get_plugins()
+        plugin_ids = frozenset(map(id, plugins))
+        if plugin_ids != self._plugin_ids:
+            self._plugin_ids = plugin_ids
+            self._plugins = {
+                plugin.crm_name: plugin
+                for plugin in plugins
+                if getattr(plugin, "crm_name", None)
+            }
+            self._callers.clear()
+
+    def plugin(self, crm_name: str):
+        self._sync()
+        plugin = self._plugins.get(crm_name.lower())
+        if plugin is None:
+            raise UnsupportedCRMError(crm_name=crm_name)
+        return plugin
+
+    def supported(self) -> FrozenSet[str]:
+        self._sync()
+        return frozenset(self._plugins)
+
+    def caller(self, hook_name: str, crm_names: Iterable[str]):
+        """Return a hook caller limited to the plugins serving ``crm_names``.
+
+        Names without a plugin are ignored, so the memo only ever holds
+        subsets of the registered CRMs whatever names callers pass in.
+        """
+        self._sync()
+        requested = frozenset(name.lower() for name in crm_names)
+        key = (hook_name, requested.intersection(self._plugins))
+        if not key[1]:
+            raise UnsupportedCRMError(crm_name=", ".join(sorted(requested)))
+        hook_caller = self._callers.get(key)
+        if hook_caller is None:
+            hook_caller = self.pm.subset_hook_caller(
+                hook_name,
+                remove_plugins=[
+                    plugin
+                    for crm_name, plugin in self._plugins.items()
+                    if crm_name not in key[1]
+                ]
+                + [
+                    plugin
+                    for plugin in self.pm.get_plugins()
+                    if not getattr(plugin, "crm_name", None)
+                ],
+            )
+            self._callers[key] = hook_caller
+        return hook_caller
+
+
+_hook_callers: "WeakKeyDictionary[pluggy.PluginManager, CRMHookCallers]" = WeakKeyDictionary()
+
+
+def crm_hook_callers(pm: pluggy.PluginManager) -> CRMHookCallers:
+    hook_callers = _hook_callers.get(pm)
+    if hook_callers is None:
+        hook_callers = _hook_callers[pm] = CRMHookCallers(pm)
+    return hook_callers
+
+
+def get_crm_hook_caller(pm: pluggy.PluginManager, hook_name: str, crm_name: str):
+    """Return a hook caller restricted to the plugin serving ``crm_name``."""
+    return crm_hook_callers(pm).caller(hook_name, (crm_name,))
+
+
+async def call_crm_hook(pm: pluggy.PluginManager, hook_name: str, crm_name: str, **kwargs):
+    """Await a coroutine hook on the plugin serving ``crm_name`` and return its result."""
+    hook_caller = get_crm_hook_caller(pm, hook_name, crm_name)
+    results = await acall_hook(hook_caller, crm_name=crm_name, **kwargs)
+    return results[0]
+
+
+def iter_crm_hook(pm: pluggy.PluginManager, hook_name: str, crm_name: str, **kwargs):
+    """Return the async generator produced by a generator hook on ``crm_name``'s plugin."""
+    hook_caller = get_crm_hook_caller(pm, hook_name, crm_name)
+    return hook_caller(crm_name=crm_name, **kwargs)[0]
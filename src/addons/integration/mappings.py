@@ -0,0 +1,45 @@
+from addons.integration.field_mapping import Field, FieldMapping, Nested, Pick
+
+
+def _full_name(mapped, record):
+    return f"{mapped['first_name']} {mapped['last_name']}".strip()
+
+
+CAPSULE_CONTACT_MAPPING = FieldMapping(
+    [
+        Field("id", "id", default=None),
+        Field("first_name", "firstName"),
+        Field("last_name", "lastName"),
+        Field(
+            "name",
+            "name",
+            fallback=_full_name,
+            read_only=True,
+        ),
+        Pick("email", "emailAddresses", "address", where={"type": "Work"}),
+        Pick("phone", "phoneNumbers", "number", where={"type": "Work"}),
+        Nested("company", "organisation", "name"),
+        Field("updated_at", "updatedAt", read_only=True),
+    ],
+    case_insensitive=False,
+)
+
+ZOHO_CONTACT_MAPPING = FieldMapping(
+    [
+        Field("id", "id", transform=str),
+        Field("first_name", "First_Name", "first_name"),
+        Field("last_name", "Last_Name", "last_name"),
+        Field(
+            "name",
+            "Full_Name",
+            "full_name",
+            fallback=_full_name,
+            read_only=True,
+        ),
+        Field("email", "Email", "email"),
+        Field("phone", "Phone", "phone"),
+        Field("mobile", "Mobile", "mobile", "Other_Phone", "other_phone"),
+        Field("updated_at", "Modified_Time", "modified_time", read_only=True),
+        Nested("owner_email", "Owner", "email", read_only=True),
+    ]
+)
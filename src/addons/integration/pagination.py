@@ -0,0 +1,55 @@
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, NamedTuple, Optional
+
+
+class Page(NamedTuple):
+    number: int
+    items: List[Dict[str, Any]]
+    has_more: bool
+    total_pages: Optional[int] = None
+
+
+PageFetcher = Callable[[int], Awaitable[Page]]
+
+
+async def iter_pages(
+    fetch_page: PageFetcher, concurrency: int = 1, start_page: int = 1
+) -> AsyncIterator[Page]:
+    """Yield pages in order while keeping up to ``concurrency`` requests in flight.
+
+    The first page is fetched alone. If it reports ``total_pages`` only the
+    remaining known pages are requested; otherwise pages are fetched
+    speculatively ahead and anything past the first page without
+    ``has_more`` is cancelled. At most ``concurrency`` pages are buffered.
+    """
+    first = await fetch_page(start_page)
+    yield first
+    if not first.has_more:
+        return
+
+    last_page = first.total_pages
+    next_page = start_page + 1
+    window: Deque[asyncio.Task] = deque()
+
+    def schedule() -> None:
+        nonlocal next_page
+        while len(window) < max(concurrency, 1) and (
+            last_page is None or next_page <= last_page
+        ):
+            window.append(asyncio.ensure_future(fetch_page(next_page)))
+            next_page += 1
+
+    try:
+        schedule()
+        while window:
+            page = await window.popleft()
+            yield page
+            if not page.has_more:
+                break
+            schedule()
+    finally:
+        for task in window:
+            task.cancel()
+        if window:
+            await asyncio.gather(*window, return_exceptions=True)
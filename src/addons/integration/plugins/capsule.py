@@ -1,10 +1,21 @@
 import random
 import string
 from datetime import datetime, timedelta
-from typing import Dict, List, Union
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
 from urllib.parse import urlencode
 import httpx
+from addons.integration.mappings import CAPSULE_CONTACT_MAPPING as CONTACT_MAPPING
+from addons.integration.columnar import ContactColumns
+from addons.integration.batching import (
+    CREATED,
+    FAILED,
+    UPDATED,
+    chunked,
+    run_concurrently,
+    write_result,
+)
 from addons.integration.hooks import hookimpl
+from addons.integration.pagination import Page, iter_pages
 from addons.storage import get_state, save_state
 from config import settings
 from core.exception import (
@@ -12,8 +23,14 @@ from core.exception import (
     OAuthError,
     TokenRefreshError,
     TokenExchangeError,
+    TokenExpiredError,
     APIRequestError,
+    InvalidWebhookError,
 )
+from addons.http_client import CRMHTTPClient
+from addons.metrics import timed_hook
+from addons.response_cache import conditional_headers, response_validators
+from addons.serialization import loads
 from api.utils.logger import get_logger
 
 logger = get_logger()
@@ -22,18 +39,39 @@ settings = settings.AppSettings()
 
 
 class CapsuleCRMPlugin:
+    MAX_PAGE_SIZE = 100
+    MAX_IDS_PER_REQUEST = 10
+    # No batch write endpoint: every party is its own POST or PUT.
+    MAX_UPSERT_BATCH = 1
+    WEBHOOK_EVENTS = ("party/created", "party/updated", "party/deleted")
+
     def __init__(self):
         self.crm_name = "capsule"
         self.crm_settings = settings.crms.get(self.crm_name)
         if not self.crm_settings:
             logger.error("Capsule CRM configuration not found.")
             raise OAuthError("Capsule CRM not configured")
+        self.api_base_url = (
+            self.crm_settings.http.api_base_url or "https://api.capsulecrm.com/api/v2"
+        )
+        self._http_client = None
         logger.info("CapsuleCRMPlugin initialized successfully.")
 
+    def bind_http_client(self, http_client: CRMHTTPClient) -> None:
+        self._http_client = http_client
+
+    @property
+    def http(self) -> CRMHTTPClient:
+        if self._http_client is None:
+            self._http_client = CRMHTTPClient(
+                self.crm_name, self.crm_settings.http, self.crm_settings.rate_limit
+            )
+        return self._http_client
+
     def _generate_random_value(self) -> str:
         state = "".join(random.choices(string.ascii_letters + string.digits, k=32))
         save_state(state, self.crm_name)
-        logger.debug(f"Generated and saved state: {state}")
+        logger.debug("Generated and saved state: %s", state)
         return state
 
     @hookimpl
@@ -47,11 +85,11 @@ class CapsuleCRMPlugin:
             "state": state,
         }
         auth_url = f"{self.crm_settings.config.auth_url}?{urlencode(params)}"
-        logger.info(f"Generated auth URL: {auth_url}")
+        logger.info("Generated auth URL for %s", self.crm_name)
         return {self.crm_name: auth_url}
 
     @hookimpl
-    def exchange_token(self, code: str, state: str = None) -> dict:
+    async def exchange_token(self, code: str, state: str = None) -> dict:
         if state:
             stored_state = get_state(self.crm_name)
             if not stored_state or stored_state != state:
@@ -68,21 +106,20 @@ class CapsuleCRMPlugin:
                 "redirect_uri": f"http://localhost:8000{self.crm_settings.config.redirect_path}",
             }
 
-            with httpx.Client(timeout=30) as client:
-                response = client.post(
-                    self.crm_settings.config.token_url,
-                    data=data,
-                    headers={"Content-Type": "application/x-www-form-urlencoded"},
-                )
+            response = await self.http.post(
+                self.crm_settings.config.token_url,
+                data=data,
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+            )
 
             if response.status_code != 200:
-                error_data = response.json()
-                logger.error(f"Token exchange failed: {error_data}")
+                error_data = loads(response.content)
+                logger.error("Token exchange failed: %s", error_data)
                 raise TokenExchangeError(
                     f"Token exchange failed: {error_data.get('error', 'Unknown error')}"
                 )
 
-            token_data = response.json()
+            token_data = loads(response.content)
             token_data["crm_name"] = self.crm_name
             logger.info("Token exchanged successfully.")
             return token_data
@@ -91,7 +128,7 @@ class CapsuleCRMPlugin:
             raise TokenExchangeError(f"Token exchange request failed: {str(e)}")
 
     @hookimpl
-    def refresh_access_token(self, refresh_token: str) -> dict:
+    async def refresh_access_token(self, refresh_token: str) -> dict:
         try:
             data = {
                 "grant_type": "refresh_token",
@@ -100,21 +137,20 @@ class CapsuleCRMPlugin:
                 "client_secret": self.crm_settings.client_secret,
             }
 
-            with httpx.Client(timeout=30) as client:
-                response = client.post(
-                    self.crm_settings.config.token_url,
-                    data=data,
-                    headers={"Content-Type": "application/x-www-form-urlencoded"},
-                )
+            response = await self.http.post(
+                self.crm_settings.config.token_url,
+                data=data,
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+            )
 
             if response.status_code != 200:
-                error_data = response.json()
-                logger.error(f"Token refresh failed: {error_data}")
+                error_data = loads(response.content)
+                logger.error("Token refresh failed: %s", error_data)
                 raise TokenRefreshError(
                     f"Token refresh failed: {error_data.get('error', 'Unknown error')}"
                 )
 
-            token_data = response.json()
+            token_data = loads(response.content)
             token_data["expires_at"] = (
                 datetime.now() + timedelta(seconds=token_data.get("expires_in", 3600))
             ).isoformat()
@@ -133,88 +169,330 @@ class CapsuleCRMPlugin:
         else:
             contact_list = contacts
 
-        standardized_contacts = []
-        for contact in contact_list:
-            emails = contact.get("emailAddresses", [])
-            primary_email = next(
-                (e["address"] for e in emails if e.get("type") == "Work"), ""
-            )
+        return CONTACT_MAPPING.map_many(contact_list)
 
-            phones = contact.get("phoneNumbers", [])
-            primary_phone = next(
-                (p["number"] for p in phones if p.get("type") == "Work"), ""
+    def _normalize(self, contacts: Union[List, Dict]) -> List[Dict]:
+        # The fetch path calls the hook directly, so it is timed here.
+        with timed_hook("filter_contacts", self.crm_name):
+            return self.filter_contacts(contacts)
+
+    def _normalize_columns(self, contacts: Dict) -> ContactColumns:
+        with timed_hook("filter_contacts", self.crm_name):
+            return ContactColumns.from_records(
+                CONTACT_MAPPING, contacts.get("parties", []), self.crm_name
             )
 
-            standardized_contacts.append(
-                {
-                    "id": contact.get("id"),
-                    "first_name": contact.get("firstName", ""),
-                    "last_name": contact.get("lastName", ""),
-                    "name": contact.get(
-                        "name",
-                        f"{contact.get('firstName', '')} {contact.get('lastName', '')}".strip(),
-                    ),
-                    "email": primary_email,
-                    "phone": primary_phone,
-                    "company": (
-                        contact.get("organisation", {}).get("name", "")
-                        if isinstance(contact.get("organisation"), dict)
-                        else ""
-                    ),
-                }
+    async def _fetch_contacts_page(
+        self,
+        access_token: str,
+        page: int,
+        per_page: Optional[int] = None,
+        modified_since: Optional[str] = None,
+        validators: Optional[Dict[str, str]] = None,
+    ) -> Tuple[Optional[dict], bool, Dict[str, str]]:
+        """Fetch one raw page of parties, whether another page follows it, and its validators.
+
+        With ``validators`` from an earlier response the request is conditional;
+        the page is then None when Capsule answers 304 Not Modified.
+        """
+        params = {"page": page}
+        if per_page:
+            params["perPage"] = per_page
+        if modified_since:
+            params["since"] = modified_since
+        headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Accept": "application/json",
+            **conditional_headers(validators),
+        }
+
+        try:
+            response = await self.http.get(
+                f"{self.api_base_url}/parties", params=params, headers=headers
             )
 
-        return standardized_contacts
+            if response.status_code == 304 and validators:
+                logger.info("Contacts page %s not modified.", page)
+                return None, False, validators
+
+            if response.status_code == 200:
+                logger.info("Fetched contacts page %s successfully.", page)
+                return (
+                    loads(response.content),
+                    "next" in response.links,
+                    response_validators(response),
+                )
+
+            if response.status_code == 401:
+                logger.warning("Access token rejected by Capsule.")
+                raise TokenExpiredError()
+
+            logger.error(
+                "Failed to fetch contacts, status code: %s", response.status_code
+            )
+            raise APIRequestError(f"Failed with status {response.status_code}")
+        except httpx.HTTPError as e:
+            logger.exception("Request to fetch contacts failed.")
+            raise APIRequestError(f"Request failed: {str(e)}")
 
     @hookimpl
-    def get_contacts(
-        self, access_token: str, refresh_token: str, page: int = 1
+    async def get_contacts(
+        self,
+        access_token: str,
+        page: int,
+        validators: Optional[Dict[str, str]],
     ) -> dict:
-        url = f"https://api.capsulecrm.com/api/v2/parties?page={page}"
-        headers = {
+        raw_contacts, _, validators = await self._fetch_contacts_page(
+            access_token, page, validators=validators
+        )
+        if raw_contacts is None:
+            return {"not_modified": True, "page": page}
+        filtered_contacts = self._normalize(raw_contacts)
+        return {
+            "data": filtered_contacts,
+            "page": page,
+            "total": raw_contacts.get("total", len(filtered_contacts)),
+            "validators": validators,
+        }
+
+    @hookimpl
+    async def iter_contacts(
+        self,
+        with_tokens: Callable,
+        per_page: Optional[int],
+        modified_since: Optional[str],
+        start_page: int,
+        columnar: bool,
+    ) -> AsyncIterator[Union[List[Dict], ContactColumns]]:
+        per_page = min(per_page or self.MAX_PAGE_SIZE, self.MAX_PAGE_SIZE)
+        normalize = self._normalize_columns if columnar else self._normalize
+
+        async def fetch_page(page: int) -> Page:
+            raw_contacts, has_more, _ = await with_tokens(
+                lambda tokens: self._fetch_contacts_page(
+                    tokens["access_token"], page, per_page, modified_since
+                )
+            )
+            total = raw_contacts.get("total")
+            return Page(
+                number=page,
+                items=normalize(raw_contacts),
+                has_more=has_more,
+                total_pages=-(-total // per_page) if isinstance(total, int) else None,
+            )
+
+        pages = iter_pages(fetch_page, self.crm_settings.http.page_concurrency, start_page)
+        try:
+            async for page in pages:
+                yield page.items
+        finally:
+            # Cancel speculative page requests as soon as the consumer stops.
+            await pages.aclose()
+
+    def _auth_headers(self, access_token: str) -> Dict[str, str]:
+        return {
             "Authorization": f"Bearer {access_token}",
             "Accept": "application/json",
         }
 
+    async def _write_party(
+        self, access_token: str, index: int, contact: Dict, existing: Optional[Dict]
+    ) -> Dict:
+        """Create (POST) or update (PUT) one person; Capsule has no batch write endpoint.
+
+        Capsule adds email and phone entries sent without an id, so updates
+        address the entries of the current party (``existing``, looked up
+        here when not prefetched) by id.
+        """
+        party_id = contact.get("id")
+        if party_id and existing is None:
+            found = await self.fetch_contacts_by_ids(access_token, [str(party_id)])
+            if not found:
+                return write_result(index, FAILED, party_id, "party not found")
+            existing = found[0]
+        party = CONTACT_MAPPING.unmap(contact, existing)
+        party.pop("id", None)
+        if party_id:
+            method, url = "PUT", f"{self.api_base_url}/parties/{party_id}"
+        else:
+            method, url = "POST", f"{self.api_base_url}/parties"
+            party["type"] = "person"
         try:
-            with httpx.Client(timeout=30) as client:
-                response = client.get(url, headers=headers)
-
-                if response.status_code == 200:
-                    logger.info(f"Fetched contacts page {page} successfully.")
-                    raw_contacts = response.json()
-                    filtered_contacts = self.filter_contacts(raw_contacts)
-                    return {
-                        "data": filtered_contacts,
-                        "page": page,
-                        "total": raw_contacts.get("total", len(filtered_contacts)),
-                    }
+            response = await self.http.request(
+                method, url, json={"party": party}, headers=self._auth_headers(access_token)
+            )
+        except httpx.HTTPError as e:
+            logger.exception("Party write request failed.")
+            raise APIRequestError(f"Request failed: {str(e)}")
+        if response.status_code == 401:
+            logger.warning("Access token rejected by Capsule.")
+            raise TokenExpiredError()
+        if response.status_code in (200, 201):
+            saved = loads(response.content).get("party", {})
+            status = CREATED if method == "POST" else UPDATED
+            return write_result(index, status, saved.get("id", party_id))
+        if response.status_code in (400, 404, 422):
+            # Validation failures name the offending fields under "errors".
+            data = loads(response.content) if response.content else {}
+            messages = [error.get("message") for error in data.get("errors", [])]
+            detail = "; ".join(filter(None, [data.get("message"), *messages]))
+            return write_result(
+                index, FAILED, party_id, detail or f"Failed with status {response.status_code}"
+            )
+        logger.error("Failed to write party, status code: %s", response.status_code)
+        raise APIRequestError(f"Failed with status {response.status_code}")
+
+    @hookimpl
+    async def upsert_contacts(self, with_tokens: Callable, contacts: List[Dict]) -> List[Dict]:
+        """Write parties one request each, ``write_concurrency`` at a time.
+
+        The parties being updated are read first, ``MAX_IDS_PER_REQUEST`` per
+        lookup, so their email and phone entries can be replaced in place.
+        """
+        concurrency = self.crm_settings.http.write_concurrency
+        update_ids = list(dict.fromkeys(str(c["id"]) for c in contacts if c.get("id")))
 
-                if response.status_code == 401:
-                    logger.warning("Access token expired, attempting refresh.")
-                    new_tokens = self.refresh_access_token(refresh_token)
-                    headers["Authorization"] = f"Bearer {new_tokens['access_token']}"
-                    retry_response = client.get(url, headers=headers)
-
-                    if retry_response.status_code == 200:
-                        logger.info(
-                            f"Fetched contacts page {page} after token refresh."
-                        )
-                        raw_contacts = retry_response.json()
-                        filtered_contacts = self.filter_contacts(raw_contacts)
-                        return {
-                            "data": filtered_contacts,
-                            "page": page,
-                            "total": raw_contacts.get("total", len(filtered_contacts)),
-                        }
-
-                    logger.error("Failed to fetch contacts even after token refresh.")
-                    raise APIRequestError("Failed after token refresh")
-
-                logger.error(
-                    f"Failed to fetch contacts, status code: {response.status_code}"
+        async def lookup(batch) -> List[Dict]:
+            _, ids = batch
+            try:
+                return await with_tokens(
+                    lambda tokens: self.fetch_contacts_by_ids(tokens["access_token"], list(ids))
                 )
+            except APIRequestError:
+                # Parties missing here are looked up one by one before writing.
+                return []
+
+        existing = {
+            str(party["id"]): party
+            for parties in await run_concurrently(
+                lookup, chunked(update_ids, self.MAX_IDS_PER_REQUEST), concurrency
+            )
+            for party in parties
+        }
+
+        async def write(item) -> Dict:
+            index, contact = item
+            current = existing.get(str(contact["id"])) if contact.get("id") else None
+            try:
+                return await with_tokens(
+                    lambda tokens: self._write_party(
+                        tokens["access_token"], index, contact, current
+                    )
+                )
+            except APIRequestError as e:
+                return write_result(index, FAILED, contact.get("id"), e.detail)
+
+        return await run_concurrently(write, enumerate(contacts), concurrency)
+
+    @hookimpl
+    def parse_webhook(self, payload: Dict) -> Dict:
+        """Read a REST hook delivery; Capsule sends the affected parties in full."""
+        event = payload.get("event")
+        parties = payload.get("payload")
+        if event not in self.WEBHOOK_EVENTS or not isinstance(parties, list):
+            raise InvalidWebhookError(f"Unsupported Capsule REST hook event: {event}")
+        parties = [party for party in parties if isinstance(party, dict) and "id" in party]
+        if event == "party/deleted":
+            return {
+                "token": None,
+                "records": [],
+                "record_ids": [],
+                "deleted_ids": [str(party["id"]) for party in parties],
+            }
+        return {"token": None, "records": parties, "record_ids": [], "deleted_ids": []}
+
+    @hookimpl
+    async def fetch_contacts_by_ids(self, access_token: str, ids: List[str]) -> List[Dict]:
+        parties = []
+        for start in range(0, len(ids), self.MAX_IDS_PER_REQUEST):
+            chunk = ids[start : start + self.MAX_IDS_PER_REQUEST]
+            try:
+                response = await self.http.get(
+                    f"{self.api_base_url}/parties/{','.join(chunk)}",
+                    headers=self._auth_headers(access_token),
+                )
+            except httpx.HTTPError as e:
+                logger.exception("Party lookup by id failed.")
+                raise APIRequestError(f"Request failed: {str(e)}")
+            if response.status_code == 404:
+                continue
+            if response.status_code == 401:
+                logger.warning("Access token rejected by Capsule.")
+                raise TokenExpiredError()
+            if response.status_code != 200:
+                logger.error("Failed to fetch parties by id, status code: %s", response.status_code)
                 raise APIRequestError(f"Failed with status {response.status_code}")
+            data = loads(response.content)
+            # One id answers with {"party": ...}, several with {"parties": [...]}.
+            parties.extend(data.get("parties") or ([data["party"]] if "party" in data else []))
+        return parties
+
+    async def _resthooks_request(
+        self, method: str, access_token: str, path: str = "", **kwargs
+    ) -> dict:
+        try:
+            response = await self.http.request(
+                method,
+                f"{self.api_base_url}/resthooks{path}",
+                headers=self._auth_headers(access_token),
+                **kwargs,
+            )
         except httpx.HTTPError as e:
-            logger.exception("Request to fetch contacts failed.")
+            logger.exception("Capsule REST hook request failed.")
             raise APIRequestError(f"Request failed: {str(e)}")
+        if response.status_code == 401:
+            raise TokenExpiredError()
+        if response.status_code == 404 and method == "DELETE":
+            return {}
+        if response.status_code not in (200, 201, 204):
+            logger.error("Capsule REST hook request failed, status code: %s", response.status_code)
+            raise APIRequestError(f"Failed with status {response.status_code}")
+        return loads(response.content) if response.content else {}
+
+    @hookimpl
+    async def subscribe_webhook(
+        self,
+        access_token: str,
+        notify_url: str,
+        token: str,
+        expires_at: str,
+        subscription_id: Optional[str],
+    ) -> Dict:
+        """Register one REST hook per party event, recreating any that were removed.
+
+        REST hooks do not expire; the token travels in ``notify_url``.
+        """
+        registered = {}
+        if subscription_id:
+            existing = await self._resthooks_request("GET", access_token)
+            registered = {
+                hook["event"]: str(hook["id"])
+                for hook in existing.get("restHooks", [])
+                if hook.get("targetUrl") == notify_url
+            }
+        for event in self.WEBHOOK_EVENTS:
+            if event in registered:
+                continue
+            created = await self._resthooks_request(
+                "POST",
+                access_token,
+                json={
+                    "restHook": {
+                        "event": event,
+                        "targetUrl": notify_url,
+                        "description": "crmintegration contact sync",
+                    }
+                },
+            )
+            registered[event] = str(created["restHook"]["id"])
+        logger.info("Capsule REST hooks registered: %s", ", ".join(registered))
+        return {
+            "subscription_id": ",".join(registered[event] for event in self.WEBHOOK_EVENTS),
+            "expires_at": None,
+        }
+
+    @hookimpl
+    async def unsubscribe_webhook(self, access_token: str, subscription_id: str) -> None:
+        for hook_id in subscription_id.split(","):
+            await self._resthooks_request("DELETE", access_token, f"/{hook_id}")
+        logger.info("Capsule REST hooks %s removed.", subscription_id)
@@ -1,12 +1,32 @@
+import asyncio
+import csv
+import io
 import json
 import random
+import secrets
 import string
-from typing import Dict, List, Union
-from urllib.parse import urlencode
-import httpx
+import tempfile
+import zipfile
+from datetime import datetime, timezone
+from functools import partial
+from itertools import islice
+from typing import IO, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlencode, urljoin
+from fastapi.concurrency import run_in_threadpool
 from httpx import HTTPError
 
+from addons.integration.mappings import ZOHO_CONTACT_MAPPING as CONTACT_MAPPING
+from addons.integration.columnar import ContactColumns
+from addons.integration.batching import (
+    CREATED,
+    FAILED,
+    UPDATED,
+    chunked,
+    run_concurrently,
+    write_result,
+)
 from addons.integration.hooks import hookimpl
+from addons.integration.pagination import Page, iter_pages
 from addons.storage import get_state, save_state
 from config import settings
 from core.exception import (
@@ -14,8 +34,14 @@ from core.exception import (
     OAuthError,
     TokenRefreshError,
     TokenExchangeError,
+    TokenExpiredError,
     APIRequestError,
+    InvalidWebhookError,
 )
+from addons.http_client import CRMHTTPClient
+from addons.metrics import timed_hook
+from addons.response_cache import response_validators
+from addons.serialization import loads
 from api.utils.logger import get_logger
 
 logger = get_logger()
@@ -24,18 +50,53 @@ settings = settings.AppSettings()
 
 
 class ZohoCRMPlugin:
+    MAX_PAGE_SIZE = 200
+    MAX_IDS_PER_REQUEST = 100
+    MAX_UPSERT_BATCH = 100
+    DUPLICATE_CHECK_FIELDS = ("Email",)
+    BULK_FIELDS = (
+        "First_Name",
+        "Last_Name",
+        "Full_Name",
+        "Email",
+        "Phone",
+        "Mobile",
+        "Modified_Time",
+        "Owner",
+    )
+    BULK_CHUNK_SIZE = 5000
+    BULK_MAX_POLL_SECONDS = 30.0
+
     def __init__(self):
         self.crm_name = "zoho"
         self.crm_settings = settings.crms.get(self.crm_name)
         if not self.crm_settings:
             logger.error("Zoho CRM not configured")
             raise OAuthError("Zoho CRM not configured")
+        self.api_base_url = (
+            self.crm_settings.http.api_base_url or "https://www.zohoapis.com/crm/v2"
+        )
+        # .../crm/v2 -> .../crm/bulk/v2
+        base, version = self.api_base_url.rstrip("/").rsplit("/", 1)
+        self.bulk_api_base_url = f"{base}/bulk/{version}"
+        self._http_client = None
         logger.info("ZohoCRMPlugin initialized successfully")
 
+    def bind_http_client(self, http_client: CRMHTTPClient) -> None:
+        self._http_client = http_client
+
+    @property
+    def http(self) -> CRMHTTPClient:
+        if self._http_client is None:
+            self._http_client = CRMHTTPClient(
+                self.crm_name, self.crm_settings.http, self.crm_settings.rate_limit
+            )
+        return self._http_client
+
     def _generate_random_value(self) -> str:
         state = "".join(random.choices(string.ascii_letters + string.digits, k=32))
         save_state(state, self.crm_name)
-        logger.debug(f"Generated state: {state}")
+        logger.debug("Generated state: %s", state)
         return state
 
     @hookimpl
@@ -56,7 +117,7 @@ class ZohoCRMPlugin:
         return {self.crm_name: auth_url}
 
     @hookimpl
-    def exchange_token(self, code: str, state: str = None) -> dict:
+    async def exchange_token(self, code: str, state: str = None) -> dict:
         if state:
             stored_state = get_state(self.crm_name)
             if not stored_state or stored_state != state:
@@ -75,17 +136,16 @@ class ZohoCRMPlugin:
                 "redirect_uri": f"http://localhost:8000{self.crm_settings.config.redirect_path}",
             }
 
-            response = httpx.post(
+            response = await self.http.post(
                 self.crm_settings.config.token_url,
                 data=data,
                 headers={"Content-Type": "application/x-www-form-urlencoded"},
-                timeout=30.0,
             )
             if response.status_code != 200:
-                error_data = response.json()
-                logger.error(f"Token exchange failed: {error_data}")
+                error_data = loads(response.content)
+                logger.error("Token exchange failed: %s", error_data)
                 raise TokenExchangeError("Token exchange failed")
-            token_data = response.json()
+            token_data = loads(response.content)
             logger.info("Token exchanged successfully")
             return token_data
         except HTTPError as e:
@@ -93,7 +153,7 @@ class ZohoCRMPlugin:
             raise TokenExchangeError(f"Token exchange request failed: {str(e)}")
 
     @hookimpl
-    def refresh_access_token(self, refresh_token: str) -> dict:
+    async def refresh_access_token(self, refresh_token: str) -> dict:
         try:
             data = {
                 "grant_type": "refresh_token",
@@ -102,17 +162,16 @@ class ZohoCRMPlugin:
                 "client_secret": self.crm_settings.client_secret,
             }
 
-            response = httpx.post(
+            response = await self.http.post(
                 self.crm_settings.config.token_url,
                 data=data,
                 headers={"Content-Type": "application/x-www-form-urlencoded"},
-                timeout=30.0,
             )
             if response.status_code != 200:
-                error_data = response.json()
-                logger.error(f"Token refresh failed: {error_data}")
+                error_data = loads(response.content)
+                logger.error("Token refresh failed: %s", error_data)
                 raise TokenRefreshError("Token refresh failed")
-            token_data = response.json()
+            token_data = loads(response.content)
             logger.info("Access token refreshed successfully")
             return token_data
         except HTTPError as e:
@@ -126,97 +185,489 @@ class ZohoCRMPlugin:
         else:
             contact_list = contacts if isinstance(contacts, list) else [contacts]
 
-        standardized_contacts = []
-        for contact in contact_list:
-            if not isinstance(contact, dict):
-                continue
+        return CONTACT_MAPPING.map_many(contact_list)
 
-            def get_field(data, *keys):
-                for key in keys:
-                    if key in data:
-                        return data[key]
-                    lower_key = key.lower()
-                    for k, v in data.items():
-                        if k.lower() == lower_key:
-                            return v
-                return ""
-
-            standardized = {
-                "id": str(get_field(contact, "id")),
-                "first_name": get_field(contact, "First_Name", "first_name"),
-                "last_name": get_field(contact, "Last_Name", "last_name"),
-                "name": get_field(contact, "Full_Name", "full_name")
-                or f"{get_field(contact, 'First_Name', 'first_name')} {get_field(contact, 'Last_Name', 'last_name')}".strip(),
-                "email": get_field(contact, "Email", "email"),
-                "phone": get_field(contact, "Phone", "phone"),
-                "mobile": get_field(
-                    contact, "Mobile", "mobile", "Other_Phone", "other_phone"
-                ),
-            }
+    def _normalize(self, contacts: Union[List, Dict]) -> List[Dict]:
+        # The fetch path calls the hook directly, so it is timed here.
+        with timed_hook("filter_contacts", self.crm_name):
+            return self.filter_contacts(contacts)
+
+    def _normalize_columns(self, contacts: List[Dict]) -> ContactColumns:
+        with timed_hook("filter_contacts", self.crm_name):
+            return ContactColumns.from_records(CONTACT_MAPPING, contacts, self.crm_name)
+
+    async def _fetch_contacts_page(
+        self,
+        access_token: str,
+        page: int,
+        per_page: Optional[int] = None,
+        modified_since: Optional[str] = None,
+        validators: Optional[Dict[str, str]] = None,
+    ) -> Tuple[Optional[dict], bool, Dict[str, str]]:
+        """Fetch one raw page of Contacts, whether another page follows it, and its validators.
+
+        Zoho only revalidates through If-Modified-Since, which is module-wide:
+        304 means no contact changed since the page was fetched, and the page
+        is then None. Otherwise Zoho returns just the changed records, so the
+        full page is fetched again.
+        """
+        params = {"page": page}
+        if per_page:
+            params["per_page"] = per_page
+        headers = {
+            "Authorization": f"Zoho-oauthtoken {access_token}",
+            "Accept": "application/json",
+        }
+        if modified_since:
+            headers["If-Modified-Since"] = modified_since
+        elif validators and validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        fetched_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+        try:
+            response = await self.http.get(
+                f"{self.api_base_url}/Contacts", params=params, headers=headers
+            )
+            if response.status_code == 304 and validators and not modified_since:
+                logger.info("Contacts page %s not modified", page)
+                return None, False, validators
+
+            if response.status_code in (204, 304):
+                logger.info("Contacts page %s is empty", page)
+                empty = {"data": [], "info": {"count": 0, "more_records": False}}
+                return empty, False, {"last_modified": fetched_at}
 
-            owner_data = contact.get("Owner", {})
-            if isinstance(owner_data, dict):
-                standardized["owner_email"] = owner_data.get("email", "")
+            if response.status_code == 200:
+                if "If-Modified-Since" in headers and not modified_since:
+                    return await self._fetch_contacts_page(access_token, page, per_page)
+                logger.info("Fetched contacts page %s successfully", page)
+                raw_data = loads(response.content)
+                return (
+                    raw_data,
+                    bool(raw_data.get("info", {}).get("more_records")),
+                    {**response_validators(response), "last_modified": fetched_at},
+                )
 
-            standardized_contacts.append(standardized)
+            if response.status_code == 401:
+                logger.warning("Access token rejected by Zoho")
+                raise TokenExpiredError()
 
-        return standardized_contacts
+            logger.error("Failed to fetch contacts: Status %s", response.status_code)
+            raise APIRequestError(f"Failed with status {response.status_code}")
+        except HTTPError as e:
+            logger.exception("Contact request failed")
+            raise APIRequestError(f"Request failed: {str(e)}")
 
     @hookimpl
-    def get_contacts(
-        self, access_token: str, refresh_token: str, page: int = 1
+    async def get_contacts(
+        self,
+        access_token: str,
+        page: int,
+        validators: Optional[Dict[str, str]],
     ) -> dict:
+        raw_data, _, validators = await self._fetch_contacts_page(
+            access_token, page, validators=validators
+        )
+        if raw_data is None:
+            return {"not_modified": True, "page": page}
+
+        # Extract the contacts array from the Zoho response
+        contacts_data = raw_data.get("data", [])
+
+        filtered_contacts = self._normalize(contacts_data)
+        return {
+            "data": filtered_contacts,
+            "page": page,
+            "total": raw_data.get("info", {}).get("count", len(filtered_contacts)),
+            "validators": validators,
+        }
+
+    @hookimpl
+    async def iter_contacts(
+        self,
+        with_tokens: Callable,
+        per_page: Optional[int],
+        modified_since: Optional[str],
+        start_page: int,
+        columnar: bool,
+    ) -> AsyncIterator[Union[List[Dict], ContactColumns]]:
+        per_page = min(per_page or self.MAX_PAGE_SIZE, self.MAX_PAGE_SIZE)
+        normalize = self._normalize_columns if columnar else self._normalize
+
+        async def fetch_page(page: int) -> Page:
+            raw_data, has_more, _ = await with_tokens(
+                lambda tokens: self._fetch_contacts_page(
+                    tokens["access_token"], page, per_page, modified_since
+                )
+            )
+            return Page(
+                number=page,
+                items=normalize(raw_data.get("data", [])),
+                has_more=has_more,
+            )
+
+        pages = iter_pages(fetch_page, self.crm_settings.http.page_concurrency, start_page)
         try:
-            url = f"https://www.zohoapis.com/crm/v2/Contacts?page={page}"
-            headers = {
-                "Authorization": f"Zoho-oauthtoken {access_token}",
-                "Accept": "application/json",
+            async for page in pages:
+                yield page.items
+        finally:
+            # Cancel speculative page requests as soon as the consumer stops.
+            await pages.aclose()
+
+    def _auth_headers(self, access_token: str) -> Dict[str, str]:
+        return {
+            "Authorization": f"Zoho-oauthtoken {access_token}",
+            "Accept": "application/json",
+        }
+
+    async def _bulk_read_request(
+        self, method: str, access_token: str, path: str = "", **kwargs
+    ) -> dict:
+        try:
+            response = await self.http.request(
+                method,
+                f"{self.bulk_api_base_url}/read{path}",
+                headers=self._auth_headers(access_token),
+                **kwargs,
+            )
+        except HTTPError as e:
+            logger.exception("Zoho bulk read request failed")
+            raise APIRequestError(f"Request failed: {str(e)}")
+        if response.status_code == 401:
+            logger.warning("Access token rejected by Zoho")
+            raise TokenExpiredError()
+        if response.status_code not in (200, 201):
+            logger.error("Zoho bulk read request failed: Status %s", response.status_code)
+            raise APIRequestError(f"Failed with status {response.status_code}")
+        return next(iter(loads(response.content).get("data", [])), {})
+
+    async def _submit_bulk_read(
+        self, access_token: str, page: int, modified_since: Optional[str]
+    ) -> str:
+        query = {"module": "Contacts", "fields": list(self.BULK_FIELDS), "page": page}
+        if modified_since:
+            query["criteria"] = {
+                "api_name": "Modified_Time",
+                "comparator": "greater_than",
+                "value": modified_since,
             }
+        job = await self._bulk_read_request("POST", access_token, json={"query": query})
+        job_id = job.get("details", {}).get("id")
+        if job.get("status") != "success" or not job_id:
+            logger.error("Zoho bulk read job was not created: %s", job)
+            raise APIRequestError(f"Bulk read job was not created: {job.get('message')}")
+        logger.info("Submitted Zoho bulk read job %s for page %s", job_id, page)
+        return str(job_id)
 
-            response = httpx.get(url, headers=headers, timeout=30.0)
-            if response.status_code == 200:
-                logger.info(f"Fetched contacts page {page} successfully")
-                raw_data = response.json()
-
-                # Extract the contacts array from the Zoho response
-                contacts_data = raw_data.get("data", [])
-
-                filtered_contacts = self.filter_contacts(contacts_data)
-                return {
-                    "data": filtered_contacts,
-                    "page": page,
-                    "total": raw_data.get("info", {}).get(
-                        "count", len(filtered_contacts)
-                    ),
-                }
+    async def _wait_for_bulk_read(self, with_tokens: Callable, job_id: str) -> dict:
+        """Poll a bulk read job until it completes, backing off up to 30s between polls."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.crm_settings.http.bulk_timeout_seconds
+        delay = self.crm_settings.http.bulk_poll_seconds
+        while True:
+            await asyncio.sleep(min(delay, max(deadline - loop.time(), 0)))
+            job = await with_tokens(
+                lambda tokens: self._bulk_read_request(
+                    "GET", tokens["access_token"], f"/{job_id}"
+                )
+            )
+            state = job.get("state")
+            if state == "COMPLETED":
+                return job.get("result", {})
+            if state == "FAILURE":
+                raise APIRequestError(f"Bulk read job {job_id} failed")
+            if loop.time() >= deadline:
+                raise APIRequestError(f"Bulk read job {job_id} did not finish in time")
+            logger.debug("Zoho bulk read job %s is %s", job_id, state)
+            delay = min(delay * 1.5, self.BULK_MAX_POLL_SECONDS)
+
+    async def _download_bulk_result(
+        self, access_token: str, download_url: str, archive: IO[bytes]
+    ) -> None:
+        """Stream a job's zipped CSV into ``archive``, replacing any partial earlier attempt."""
+        archive.seek(0)
+        archive.truncate()
+        try:
+            async with self.http.stream(
+                "GET",
+                urljoin(self.api_base_url, download_url),
+                headers=self._auth_headers(access_token),
+            ) as response:
+                if response.status_code == 401:
+                    raise TokenExpiredError()
+                if response.status_code != 200:
+                    logger.error("Zoho bulk read download failed: Status %s", response.status_code)
+                    raise APIRequestError(f"Failed with status {response.status_code}")
+                async for chunk in response.aiter_bytes():
+                    archive.write(chunk)
+        except HTTPError as e:
+            logger.exception("Zoho bulk read download failed")
+            raise APIRequestError(f"Request failed: {str(e)}")
 
+    async def _owner_emails(self, access_token: str) -> Dict[str, str]:
+        """Map every CRM user id to its email, for the Owner ids in Bulk Read CSVs."""
+        emails = {}
+        page = 1
+        while True:
+            try:
+                response = await self.http.get(
+                    f"{self.api_base_url}/users",
+                    params={"type": "AllUsers", "page": page, "per_page": self.MAX_PAGE_SIZE},
+                    headers=self._auth_headers(access_token),
+                )
+            except HTTPError as e:
+                logger.exception("Zoho users request failed")
+                raise APIRequestError(f"Request failed: {str(e)}")
             if response.status_code == 401:
-                logger.warning("Access token expired, attempting refresh")
-                new_tokens = self.refresh_access_token(refresh_token)
-                headers["Authorization"] = (
-                    f"Zoho-oauthtoken {new_tokens['access_token']}"
+                logger.warning("Access token rejected by Zoho")
+                raise TokenExpiredError()
+            if response.status_code == 204:
+                return emails
+            if response.status_code != 200:
+                logger.error("Failed to fetch users: Status %s", response.status_code)
+                raise APIRequestError(f"Failed with status {response.status_code}")
+            body = loads(response.content)
+            for user in body.get("users", []):
+                emails[str(user.get("id"))] = user.get("email") or ""
+            if not body.get("info", {}).get("more_records"):
+                return emails
+            page += 1
+
+    @staticmethod
+    def _bulk_rows(archive: IO[bytes], owner_emails: Dict[str, str]) -> Iterator[Dict]:
+        archive.seek(0)
+        with zipfile.ZipFile(archive) as bundle:
+            name = next(name for name in bundle.namelist() if name.endswith(".csv"))
+            with bundle.open(name) as raw:
+                for row in csv.DictReader(io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")):
+                    # The CSV carries the owner's user id where the REST API
+                    # returns an Owner object.
+                    owner_id = row.get("Owner")
+                    if owner_id:
+                        row["Owner"] = {"id": owner_id, "email": owner_emails.get(owner_id, "")}
+                    yield row
+
+    @hookimpl
+    async def iter_contacts_bulk(
+        self, with_tokens: Callable, modified_since: Optional[str], columnar: bool
+    ) -> AsyncIterator[Union[List[Dict], ContactColumns]]:
+        """Export Contacts through Bulk Read jobs of up to 200,000 records each.
+
+        Each job costs a submit call, a few polls and one download, against
+        one call per 200 records for the paged API. The zipped CSV is spooled
+        to a temporary file and read back in chunks of ``BULK_CHUNK_SIZE``
+        rows on a worker thread, mapped with the same field mapping as
+        ``filter_contacts``. The CSV only has the owner's user id, so the
+        users are listed once per export to fill in ``owner_email``.
+        """
+        if columnar:
+            normalize = partial(
+                ContactColumns.from_records, CONTACT_MAPPING, crm_name=self.crm_name
+            )
+        else:
+            normalize = CONTACT_MAPPING.map_many
+        owner_emails = await with_tokens(
+            lambda tokens: self._owner_emails(tokens["access_token"])
+        )
+        page = 1
+        while True:
+            job_id = await with_tokens(
+                lambda tokens: self._submit_bulk_read(
+                    tokens["access_token"], page, modified_since
+                )
+            )
+            result = await self._wait_for_bulk_read(with_tokens, job_id)
+            with tempfile.TemporaryFile() as archive:
+                await with_tokens(
+                    lambda tokens: self._download_bulk_result(
+                        tokens["access_token"], result["download_url"], archive
+                    )
                 )
-                retry_response = httpx.get(url, headers=headers, timeout=30.0)
-                if retry_response.status_code == 200:
-                    logger.info("Fetched contacts after token refresh")
-                    raw_data = retry_response.json()
-                    contacts_data = raw_data.get("data", [])
-                    filtered_contacts = self.filter_contacts(contacts_data)
-                    return {
-                        "data": filtered_contacts,
-                        "page": page,
-                        "total": raw_data.get("info", {}).get(
-                            "count", len(filtered_contacts)
-                        ),
-                        "access_token": new_tokens[
-                            "access_token"
-                        ],  # Return the new token
-                    }
-                logger.error("Failed to fetch contacts after token refresh")
-                raise APIRequestError("Failed after token refresh")
-
-            logger.error(f"Failed to fetch contacts: Status {response.status_code}")
+                rows = self._bulk_rows(archive, owner_emails)
+                try:
+                    while True:
+                        contacts = await run_in_threadpool(
+                            normalize, islice(rows, self.BULK_CHUNK_SIZE)
+                        )
+                        if not contacts:
+                            break
+                        yield contacts
+                finally:
+                    rows.close()
+            logger.info(
+                "Exported Zoho bulk read job %s: %s records", job_id, result.get("count")
+            )
+            if not result.get("more_records"):
+                return
+            page += 1
+
+    async def _upsert_batch(
+        self, access_token: str, offset: int, contacts: List[Dict]
+    ) -> List[Dict]:
+        """Send one ``/Contacts/upsert`` call and read Zoho's per-record outcomes."""
+        body = {
+            "data": [CONTACT_MAPPING.unmap(contact) for contact in contacts],
+            "duplicate_check_fields": list(self.DUPLICATE_CHECK_FIELDS),
+        }
+        try:
+            response = await self.http.post(
+                f"{self.api_base_url}/Contacts/upsert",
+                json=body,
+                headers=self._auth_headers(access_token),
+            )
+        except HTTPError as e:
+            logger.exception("Contact upsert request failed")
+            raise APIRequestError(f"Request failed: {str(e)}")
+        if response.status_code == 401:
+            logger.warning("Access token rejected by Zoho")
+            raise TokenExpiredError()
+        # Zoho answers 200/201/202, or 400 when every record was rejected,
+        # with one outcome per record in request order.
+        outcomes = None
+        if response.status_code in (200, 201, 202, 207, 400) and response.content:
+            outcomes = loads(response.content).get("data")
+        if not isinstance(outcomes, list) or len(outcomes) != len(contacts):
+            logger.error("Contact upsert failed: Status %s", response.status_code)
             raise APIRequestError(f"Failed with status {response.status_code}")
+
+        results = []
+        for index, (contact, outcome) in enumerate(zip(contacts, outcomes), offset):
+            details = outcome.get("details") or {}
+            if outcome.get("status") == "success":
+                status = CREATED if outcome.get("action") == "insert" else UPDATED
+                results.append(write_result(index, status, details.get("id")))
+            else:
+                field = details.get("api_name")
+                error = f"{outcome.get('code')}: {outcome.get('message')}"
+                results.append(
+                    write_result(
+                        index,
+                        FAILED,
+                        contact.get("id"),
+                        f"{error} ({field})" if field else error,
+                    )
+                )
+        return results
+
+    @hookimpl
+    async def upsert_contacts(self, with_tokens: Callable, contacts: List[Dict]) -> List[Dict]:
+        """Upsert in batches of 100, matching existing records by id, then email."""
+
+        async def write(batch) -> List[Dict]:
+            offset, chunk = batch
+            try:
+                return await with_tokens(
+                    lambda tokens: self._upsert_batch(tokens["access_token"], offset, chunk)
+                )
+            except APIRequestError as e:
+                return [
+                    write_result(index, FAILED, contact.get("id"), e.detail)
+                    for index, contact in enumerate(chunk, offset)
+                ]
+
+        batches = await run_concurrently(
+            write,
+            chunked(contacts, self.MAX_UPSERT_BATCH),
+            self.crm_settings.http.write_concurrency,
+        )
+        return [result for batch in batches for result in batch]
+
+    @hookimpl
+    def parse_webhook(self, payload: Dict) -> Dict:
+        """Read a notification-channel event; Zoho sends only the affected ids."""
+        ids = payload.get("ids")
+        if payload.get("module") != "Contacts" or not isinstance(ids, list):
+            raise InvalidWebhookError("Not a Zoho Contacts notification")
+        operation = payload.get("operation")
+        if operation not in ("insert", "update", "delete"):
+            raise InvalidWebhookError(f"Unsupported Zoho operation: {operation}")
+        token = payload.get("token")
+        if token is not None and not isinstance(token, str):
+            raise InvalidWebhookError("Invalid webhook token", status_code=401)
+        ids = [str(record_id) for record_id in ids]
+        return {
+            "token": token,
+            "records": [],
+            "record_ids": [] if operation == "delete" else ids,
+            "deleted_ids": ids if operation == "delete" else [],
+        }
+
+    @hookimpl
+    async def fetch_contacts_by_ids(self, access_token: str, ids: List[str]) -> List[Dict]:
+        records = []
+        for start in range(0, len(ids), self.MAX_IDS_PER_REQUEST):
+            chunk = ids[start : start + self.MAX_IDS_PER_REQUEST]
+            try:
+                response = await self.http.get(
+                    f"{self.api_base_url}/Contacts",
+                    params={"ids": ",".join(chunk)},
+                    headers=self._auth_headers(access_token),
+                )
+            except HTTPError as e:
+                logger.exception("Contact lookup by id failed")
+                raise APIRequestError(f"Request failed: {str(e)}")
+            if response.status_code == 204:
+                continue
+            if response.status_code == 401:
+                logger.warning("Access token rejected by Zoho")
+                raise TokenExpiredError()
+            if response.status_code != 200:
+                logger.error("Failed to fetch contacts by id: Status %s", response.status_code)
+                raise APIRequestError(f"Failed with status {response.status_code}")
+            records.extend(loads(response.content).get("data", []))
+        return records
+
+    async def _watch_request(self, method: str, access_token: str, **kwargs) -> dict:
+        try:
+            response = await self.http.request(
+                method,
+                f"{self.api_base_url}/actions/watch",
+                headers=self._auth_headers(access_token),
+                **kwargs,
+            )
         except HTTPError as e:
-            logger.exception("Contact request failed")
+            logger.exception("Zoho notification channel request failed")
             raise APIRequestError(f"Request failed: {str(e)}")
+        if response.status_code == 401:
+            raise TokenExpiredError()
+        if response.status_code not in (200, 201, 202):
+            logger.error("Zoho notification channel request failed: Status %s", response.status_code)
+            raise APIRequestError(f"Failed with status {response.status_code}")
+        return loads(response.content) if response.content else {}
+
+    @hookimpl
+    async def subscribe_webhook(
+        self,
+        access_token: str,
+        notify_url: str,
+        token: str,
+        expires_at: str,
+        subscription_id: Optional[str],
+    ) -> Dict:
+        """Enable (POST) or extend (PATCH) a notification channel for Contacts."""
+        channel_id = subscription_id or str(secrets.randbelow(9 * 10**15) + 10**15)
+        body = {
+            "watch": [
+                {
+                    "channel_id": channel_id,
+                    "events": ["Contacts.all"],
+                    "channel_expiry": expires_at,
+                    "token": token,
+                    "notify_url": notify_url,
+                }
+            ]
+        }
+        result = await self._watch_request(
+            "PATCH" if subscription_id else "POST", access_token, json=body
+        )
+        events = next(iter(result.get("watch", [])), {}).get("details", {}).get("events", [])
+        confirmed_expiry = next(iter(events), {}).get("channel_expiry", expires_at)
+        logger.info("Zoho notification channel %s active until %s", channel_id, confirmed_expiry)
+        return {"subscription_id": channel_id, "expires_at": confirmed_expiry}
+
+    @hookimpl
+    async def unsubscribe_webhook(self, access_token: str, subscription_id: str) -> None:
+        await self._watch_request(
+            "DELETE", access_token, params={"channel_ids": subscription_id}
+        )
+        logger.info("Zoho notification channel %s disabled", subscription_id)
@@ -0,0 +1,300 @@
+"""In-process metrics rendered in the Prometheus text exposition format."""
+
+import inspect
+import threading
+from abc import ABC, abstractmethod
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import pluggy
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """Exposition lines for every labelled series of this metric."""
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self.samples(),
+        ]
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {value}"
+            for key, value in items
+        ]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            # Per-bucket (non-cumulative) counts, then +Inf count and sum.
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        lines = []
+        for key, series in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {series[-2]}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_count{labels} {series[-2]}")
+            lines.append(f"{self.name}_sum{labels} {series[-1]}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+REGISTRY = Registry()
+
+HOOK_LATENCY = REGISTRY.register(
+    Histogram(
+        "crm_hook_duration_seconds",
+        "Duration of pluggy hook calls, including awaiting coroutine hooks.",
+        ("hook", "crm", "outcome"),
+    )
+)
+UPSTREAM_REQUESTS = REGISTRY.register(
+    Counter(
+        "crm_upstream_responses_total",
+        "Responses received from CRM APIs by status code.",
+        ("crm", "method", "status"),
+    )
+)
+UPSTREAM_LATENCY = REGISTRY.register(
+    Histogram(
+        "crm_upstream_request_duration_seconds",
+        "Duration of single HTTP attempts against CRM APIs.",
+        ("crm", "method"),
+    )
+)
+UPSTREAM_RETRIES = REGISTRY.register(
+    Counter(
+        "crm_upstream_retries_total",
+        "Retried CRM API requests by reason.",
+        ("crm", "reason"),
+    )
+)
+TOKEN_REFRESHES = REGISTRY.register(
+    Counter(
+        "crm_token_refreshes_total",
+        "OAuth token refreshes sent to the CRM token endpoint.",
+        ("crm", "outcome"),
+    )
+)
+STORAGE_LATENCY = REGISTRY.register(
+    Histogram(
+        "storage_operation_duration_seconds",
+        "Duration of token, state, cursor and contact store operations.",
+        ("store", "operation"),
+    )
+)
+WEBHOOK_EVENTS = REGISTRY.register(
+    Counter(
+        "crm_webhook_events_total",
+        "Pushed contact notifications by outcome (accepted, rejected, dropped, stored, failed).",
+        ("crm", "outcome"),
+    )
+)
+CONTACT_WRITES = REGISTRY.register(
+    Counter(
+        "crm_contact_writes_total",
+        "Contacts written back to a CRM by outcome (created, updated, failed).",
+        ("crm", "outcome"),
+    )
+)
+
+
+def timed_storage(method):
+    """Record a store method's duration under its class and method name."""
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with STORAGE_LATENCY.time(store=type(self).__name__, operation=method.__name__):
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def timed_hook(hook_name: str, crm: str) -> Iterator[None]:
+    """Time a hook implementation that a plugin calls directly, bypassing ``monitor_hooks``."""
+    start = time.perf_counter()
+    outcome = "success"
+    try:
+        yield
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        HOOK_LATENCY.observe(time.perf_counter() - start, hook=hook_name, crm=crm, outcome=outcome)
+
+
+_hook_starts = threading.local()
+
+
+def _hook_crm(hook_impls, kwargs) -> str:
+    crm_name = kwargs.get("crm_name")
+    if crm_name:
+        return str(crm_name).lower()
+    crms = {getattr(impl.plugin, "crm_name", None) for impl in hook_impls}
+    return crms.pop() if len(crms) == 1 and None not in crms else "all"
+
+
+async def _timed_coroutine(coro, hook_name: str, crm: str, start: float):
+    outcome = "success"
+    try:
+        return await coro
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        HOOK_LATENCY.observe(time.perf_counter() - start, hook=hook_name, crm=crm, outcome=outcome)
+
+
+async def _timed_async_generator(agen, hook_name: str, crm: str, start: float):
+    outcome = "success"
+    try:
+        async for item in agen:
+            yield item
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        HOOK_LATENCY.observe(time.perf_counter() - start, hook=hook_name, crm=crm, outcome=outcome)
+
+
+def monitor_hooks(pm: pluggy.PluginManager) -> None:
+    """Time every hook call on ``pm`` into ``HOOK_LATENCY``.
+
+    Synchronous hooks are timed around the call. Results that are coroutines
+    or async generators are swapped for wrappers (``force_result``) so their
+    duration is measured up to completion, when the caller awaits them.
+    """
+
+    def before(hook_name, hook_impls, kwargs):
+        stack = getattr(_hook_starts, "stack", None)
+        if stack is None:
+            stack = _hook_starts.stack = []
+        stack.append(time.perf_counter())
+
+    def after(outcome, hook_name, hook_impls, kwargs):
+        start = _hook_starts.stack.pop()
+        crm = _hook_crm(hook_impls, kwargs)
+        if outcome.exception is not None:
+            HOOK_LATENCY.observe(time.perf_counter() - start, hook=hook_name, crm=crm, outcome="error")
+            return
+
+        results = outcome.get_result()
+        if not isinstance(results, list):
+            results = [results]
+        deferred = False
+        wrapped = []
+        for result in results:
+            if inspect.iscoroutine(result):
+                result = _timed_coroutine(result, hook_name, crm, start)
+                deferred = True
+            elif inspect.isasyncgen(result):
+                result = _timed_async_generator(result, hook_name, crm, start)
+                deferred = True
+            wrapped.append(result)
+        if deferred:
+            outcome.force_result(wrapped if isinstance(outcome.get_result(), list) else wrapped[0])
+        else:
+            HOOK_LATENCY.observe(time.perf_counter() - start, hook=hook_name, crm=crm, outcome="success")
+
+    pm.add_hookcall_monitoring(before, after)
@@ -0,0 +1,154 @@
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+from addons.serialization import dumps
+from addons.singleflight import SingleFlight
+
+Validators = Dict[str, str]
+Loader = Callable[[Optional[Validators]], Awaitable[Dict[str, Any]]]
+
+HIT = "hit"
+MISS = "miss"
+REVALIDATED = "revalidated"
+SHARED = "shared"
+
+
+def response_validators(response) -> Validators:
+    """Collect the ETag/Last-Modified validators of an HTTP response."""
+    validators = {}
+    if response.headers.get("ETag"):
+        validators["etag"] = response.headers["ETag"]
+    if response.headers.get("Last-Modified"):
+        validators["last_modified"] = response.headers["Last-Modified"]
+    return validators
+
+
+def conditional_headers(validators: Optional[Validators]) -> Dict[str, str]:
+    """Request headers revalidating a cached response against its validators."""
+    headers = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+class CacheEntry(NamedTuple):
+    value: Dict[str, Any]
+    validators: Validators
+    size: int
+    stored_at: float
+
+
+class ResponseCache:
+    """Bounded LRU of upstream responses with a TTL and conditional revalidation.
+
+    Entries are evicted least recently used first once either ``max_entries``
+    or ``max_bytes`` (measured on the JSON encoding) is exceeded. An expired
+    entry is kept until evicted so its validators (ETag, Last-Modified) can be
+    sent upstream; a "not modified" answer renews it without a new download.
+    Concurrent misses for the same key share one upstream call; the callers
+    that joined it rather than making it get ``SHARED`` as their outcome.
+    """
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 256, max_bytes: int = 32 * 2**20):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._flights = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.shared = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _fresh(self, entry: CacheEntry) -> bool:
+        return time.monotonic() - entry.stored_at < self.ttl
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: Hashable, value: Dict[str, Any], validators: Optional[Validators] = None) -> None:
+        size = len(dumps(value))
+        if size > self.max_bytes:
+            self.discard(key)
+            return
+        self._store(key, CacheEntry(value, validators or {}, size, time.monotonic()))
+
+    def _store(self, key: Hashable, entry: CacheEntry) -> None:
+        self.discard(key)
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.evictions += 1
+
+    def discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def invalidate(self, prefix: Tuple = ()) -> int:
+        """Drop every entry whose tuple key starts with ``prefix``; returns the count."""
+        keys = [key for key in self._entries if key[: len(prefix)] == prefix]
+        for key in keys:
+            self.discard(key)
+        return len(keys)
+
+    async def fetch(self, key: Hashable, load: Loader) -> Tuple[Dict[str, Any], str]:
+        """Return ``(value, outcome)`` for ``key``, calling ``load`` on a miss or expiry.
+
+        ``load`` receives the stale entry's validators (or None) and returns
+        either a fresh value, optionally carrying ``"validators"``, or
+        ``{"not_modified": True}``.
+        """
+        entry = self.get(key)
+        if entry is not None and self._fresh(entry):
+            self.hits += 1
+            return entry.value, HIT
+
+        led = False
+
+        async def refresh() -> Tuple[Dict[str, Any], str]:
+            nonlocal led
+            led = True
+            result = await load(entry.validators if entry else None)
+            if entry is not None and result.get("not_modified"):
+                self._store(key, entry._replace(stored_at=time.monotonic()))
+                self.revalidated += 1
+                return entry.value, REVALIDATED
+            value = {k: v for k, v in result.items() if k != "validators"}
+            self.set(key, value, result.get("validators"))
+            self.misses += 1
+            return value, MISS
+
+        value, outcome = await self._flights.do(key, refresh)
+        if not led:
+            self.shared += 1
+            return value, SHARED
+        return value, outcome
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.revalidated + self.shared
+        served = self.hits + self.revalidated + self.shared
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "shared": self.shared,
+            "evictions": self.evictions,
+            "hit_ratio": round(served / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,74 @@
+"""JSON encoding shared by upstream parsing, persistence and API responses.
+
+Uses orjson when installed, then msgspec, then the standard library. Every
+backend produces compact UTF-8 and encodes datetimes as ISO 8601 strings.
+"""
+
+import json
+from datetime import date, datetime
+from typing import Any, Union
+
+try:
+    import orjson
+
+    BACKEND = "orjson"
+except ImportError:
+    orjson = None
+    try:
+        import msgspec
+
+        BACKEND = "msgspec"
+    except ImportError:
+        msgspec = None
+        BACKEND = "json"
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+if BACKEND == "orjson":
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any, indent: bool = False) -> bytes:
+        options = _OPTIONS | orjson.OPT_INDENT_2 if indent else _OPTIONS
+        return orjson.dumps(obj, default=_default, option=options)
+
+    def loads(data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+elif BACKEND == "msgspec":
+    _encoder = msgspec.json.Encoder(enc_hook=_default)
+    _decoder = msgspec.json.Decoder()
+
+    def dumps(obj: Any, indent: bool = False) -> bytes:
+        data = _encoder.encode(obj)
+        return msgspec.json.format(data, indent=2) if indent else data
+
+    def loads(data: Union[bytes, str]) -> Any:
+        try:
+            return _decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+else:
+
+    def dumps(obj: Any, indent: bool = False) -> bytes:
+        return json.dumps(
+            obj,
+            default=_default,
+            ensure_ascii=False,
+            indent=2 if indent else None,
+            separators=None if indent else (",", ":"),
+        ).encode("utf-8")
+
+    def loads(data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+def dumps_str(obj: Any, indent: bool = False) -> str:
+    return dumps(obj, indent).decode("utf-8")
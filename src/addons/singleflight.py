@@ -0,0 +1,84 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class _LeaderCancelled(Exception):
+    """Set on a shared call whose leader was cancelled before finishing."""
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into a single execution.
+
+    The first caller for a key runs the work; callers arriving while it is in
+    flight, from other asyncio tasks or other threads, wait for and share its
+    result or exception. The key is released as soon as the call completes.
+    If the leader is cancelled, its cancellation stays with it: the waiting
+    callers retry, and one of them runs the work again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def _finish(self, key: Hashable, future: Future) -> None:
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def in_flight(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._calls
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                break
+            try:
+                # Shielded so a cancelled follower does not cancel the shared call.
+                return await asyncio.shield(asyncio.wrap_future(future))
+            except _LeaderCancelled:
+                continue
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            self._finish(key, future)
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            self._finish(key, future)
+            raise
+        future.set_result(result)
+        self._finish(key, future)
+        return result
+
+    def do_sync(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                break
+            try:
+                return future.result()
+            except _LeaderCancelled:
+                continue
+        try:
+            result = fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            self._finish(key, future)
+            raise
+        future.set_result(result)
+        self._finish(key, future)
+        return result
@@ -0,0 +1,129 @@
+from datetime import timedelta
+import os
+import threading
+from typing import Optional, Dict, Any
+
+from addons.storage.base import DEFAULT_TENANT, TokenStore
+from addons.storage.json_store import JSONTokenStore
+from addons.storage.sqlite_store import SQLiteTokenStore
+from config.settings import StorageSettings
+from api.utils.logger import get_logger
+
+logger = get_logger()
+
+_token_store: Optional[TokenStore] = None
+_token_store_lock = threading.Lock()
+
+
+def create_token_store(storage_settings: StorageSettings) -> TokenStore:
+    state_ttl = timedelta(minutes=storage_settings.state_ttl_minutes)
+    backend = storage_settings.backend.lower()
+    if backend == "sqlite":
+        store = SQLiteTokenStore(storage_settings.sqlite_path, state_ttl=state_ttl)
+        import_json_tokens(store, storage_settings)
+        return store
+    if backend == "json":
+        return JSONTokenStore(
+            storage_settings.token_file_path,
+            storage_settings.state_file_path,
+            storage_settings.cursor_file_path,
+            state_ttl=state_ttl,
+        )
+    raise ValueError(f"Unsupported storage backend: {storage_settings.backend}")
+
+
+def import_json_tokens(store: SQLiteTokenStore, storage_settings: StorageSettings) -> None:
+    """Carry tokens and sync cursors from the JSON files over on the first SQLite start.
+
+    SQLite replaced tokens.json as the default backend; without this,
+    deployments upgrading in place would lose every connection. Each token
+    file is imported at most once, and connections already in SQLite win.
+    """
+    if not os.path.exists(storage_settings.token_file_path):
+        return
+    legacy = JSONTokenStore(
+        storage_settings.token_file_path,
+        storage_settings.state_file_path,
+        storage_settings.cursor_file_path,
+    )
+    tokens, cursors = legacy.export_records()
+    imported = store.import_records(
+        os.path.abspath(storage_settings.token_file_path), tokens, cursors
+    )
+    if imported is not None:
+        logger.warning(
+            "Imported %s connection(s) from %s into %s; the JSON file is no longer read",
+            imported,
+            storage_settings.token_file_path,
+            storage_settings.sqlite_path,
+        )
+
+
+def get_token_store() -> TokenStore:
+    global _token_store
+    if _token_store is None:
+        with _token_store_lock:
+            if _token_store is None:
+                from config.settings import AppSettings
+
+                _token_store = create_token_store(AppSettings().storage)
+    return _token_store
+
+
+def set_token_store(store: TokenStore) -> None:
+    global _token_store
+    _token_store = store
+
+
+def save_tokens(
+    tokens: Dict[str, Any], crm_name: str, tenant: str = DEFAULT_TENANT
+) -> Dict[str, Any]:
+    record = get_token_store().save_tokens(crm_name, tokens, tenant)
+    logger.info("Tokens saved under '%s'", crm_name)
+    return record
+
+
+def get_stored_tokens(
+    crm_name: Optional[str] = None, tenant: str = DEFAULT_TENANT
+) -> Optional[Dict[str, Any]]:
+    """Retrieve stored tokens for a specific CRM (or the most recently used CRM if none specified)."""
+    try:
+        if crm_name:
+            token_data = get_token_store().get_tokens(crm_name, tenant)
+            if token_data is None:
+                logger.info("No tokens found for %s", crm_name)
+            return token_data
+        return get_token_store().get_latest_tokens(tenant)
+    except Exception as e:
+        logger.error("Error reading stored tokens: %s", e)
+        return None
+
+
+def clear_tokens(crm_name: Optional[str] = None, tenant: str = DEFAULT_TENANT) -> bool:
+    try:
+        removed = get_token_store().clear_tokens(crm_name, tenant)
+        if removed:
+            logger.info("Token(s) removed for '%s'", crm_name or "all CRMs")
+        else:
+            logger.info("No token found for '%s' to remove", crm_name or "any CRM")
+        return removed
+    except Exception as e:
+        logger.error("Error removing token(s): %s", e)
+        return False
+
+
+def save_state(state: str, crm_name: str, tenant: str = DEFAULT_TENANT) -> None:
+    """Save the state parameter for OAuth CSRF protection"""
+    get_token_store().save_state(crm_name, state, tenant)
+    logger.info("State saved for %s", crm_name)
+
+
+def get_state(crm_name: str, tenant: str = DEFAULT_TENANT) -> Optional[str]:
+    try:
+        state = get_token_store().get_state(crm_name, tenant)
+        if state is None:
+            logger.info("No valid state found for %s", crm_name)
+        return state
+    except Exception as e:
+        logger.error("Error retrieving state: %s", e)
+        return None
@@ -0,0 +1,73 @@
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+DEFAULT_TENANT = "default"
+
+
+class TokenStore(ABC):
+    """Persistence for OAuth tokens, CSRF states and sync cursors, keyed by CRM name and tenant."""
+
+    def __init__(self, state_ttl: timedelta = timedelta(minutes=10)):
+        self.state_ttl = state_ttl
+
+    @staticmethod
+    def prepare_tokens(tokens: Dict[str, Any]) -> Dict[str, Any]:
+        tokens = dict(tokens)
+        if "expires_in" in tokens and "expires_at" not in tokens:
+            expires_at = datetime.now() + timedelta(seconds=tokens["expires_in"])
+            tokens["expires_at"] = expires_at.isoformat()
+        tokens["last_authenticated"] = datetime.now().isoformat()
+        return {"status": "success", **tokens}
+
+    def is_state_expired(self, created_at: str) -> bool:
+        return datetime.now() - datetime.fromisoformat(created_at) > self.state_ttl
+
+    @abstractmethod
+    def save_tokens(
+        self, crm_name: str, tokens: Dict[str, Any], tenant: str = DEFAULT_TENANT
+    ) -> Dict[str, Any]:
+        """Store tokens for a connection and return the stored record."""
+
+    @abstractmethod
+    def get_tokens(
+        self, crm_name: str, tenant: str = DEFAULT_TENANT
+    ) -> Optional[Dict[str, Any]]:
+        """Return the tokens for a connection, or None."""
+
+    @abstractmethod
+    def get_latest_tokens(
+        self, tenant: str = DEFAULT_TENANT
+    ) -> Optional[Dict[str, Any]]:
+        """Return the most recently authenticated connection's tokens, or None."""
+
+    @abstractmethod
+    def clear_tokens(
+        self, crm_name: Optional[str] = None, tenant: str = DEFAULT_TENANT
+    ) -> bool:
+        """Remove tokens for one CRM, or every CRM of the tenant when none is given."""
+
+    @abstractmethod
+    def save_state(
+        self, crm_name: str, state: str, tenant: str = DEFAULT_TENANT
+    ) -> None:
+        """Store the OAuth state parameter for CSRF protection."""
+
+    @abstractmethod
+    def get_state(self, crm_name: str, tenant: str = DEFAULT_TENANT) -> Optional[str]:
+        """Return the unexpired OAuth state for a connection, or None."""
+
+    @abstractmethod
+    def save_sync_cursor(
+        self, crm_name: str, cursor: str, tenant: str = DEFAULT_TENANT
+    ) -> None:
+        """Store the contact sync high-water mark (an ISO timestamp) for a connection."""
+
+    @abstractmethod
+    def get_sync_cursor(
+        self, crm_name: str, tenant: str = DEFAULT_TENANT
+    ) -> Optional[str]:
+        """Return the contact sync high-water mark for a connection, or None."""
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,176 @@
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from addons.identity import IdentityIndex
+from addons.metrics import timed_storage
+from addons.serialization import dumps_str, loads
+from addons.storage.sqlite import SQLiteDatabase
+from config.settings import IdentitySettings
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    crm TEXT NOT NULL,
+    id TEXT NOT NULL,
+    first_name TEXT NOT NULL DEFAULT '',
+    last_name TEXT NOT NULL DEFAULT '',
+    name TEXT NOT NULL DEFAULT '',
+    email TEXT NOT NULL DEFAULT '',
+    email_normalized TEXT NOT NULL DEFAULT '',
+    phone TEXT NOT NULL DEFAULT '',
+    phone_normalized TEXT NOT NULL DEFAULT '',
+    company TEXT NOT NULL DEFAULT '',
+    owner_email TEXT NOT NULL DEFAULT '',
+    updated_at TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL,
+    synced_at TEXT NOT NULL,
+    PRIMARY KEY (crm, id)
+);
+CREATE INDEX IF NOT EXISTS idx_contacts_email ON contacts (email_normalized);
+CREATE INDEX IF NOT EXISTS idx_contacts_phone ON contacts (phone_normalized);
+CREATE INDEX IF NOT EXISTS idx_contacts_company ON contacts (company COLLATE NOCASE);
+"""
+
+UPSERT_SQL = """
+INSERT INTO contacts (
+    crm, id, first_name, last_name, name, email, email_normalized, phone,
+    phone_normalized, company, owner_email, updated_at, data, synced_at
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (crm, id) DO UPDATE SET
+    first_name = excluded.first_name,
+    last_name = excluded.last_name,
+    name = excluded.name,
+    email = excluded.email,
+    email_normalized = excluded.email_normalized,
+    phone = excluded.phone,
+    phone_normalized = excluded.phone_normalized,
+    company = excluded.company,
+    owner_email = excluded.owner_email,
+    updated_at = excluded.updated_at,
+    data = excluded.data,
+    synced_at = excluded.synced_at
+"""
+
+_NON_DIGITS = re.compile(r"\D")
+
+
+def normalize_email(email: Optional[str]) -> str:
+    return (email or "").strip().lower()
+
+
+def normalize_phone(phone: Optional[str]) -> str:
+    return _NON_DIGITS.sub("", phone or "")
+
+
+class ContactStore:
+    """Local SQLite copy of normalized contacts, upserted on (crm, id).
+
+    With identity resolution enabled, each upsert and delete also queues the
+    ids whose data changed for the ``IdentityIndex`` in the same database, in
+    the same transaction; ``IdentityLinker`` links them in the background.
+    """
+
+    def __init__(self, path: str = "contacts.db", identity: Optional[IdentitySettings] = None):
+        self.db = SQLiteDatabase(path, SCHEMA)
+        self.identity = (
+            IdentityIndex(self.db, identity) if identity and identity.enabled else None
+        )
+
+    @staticmethod
+    def _row_values(crm: str, contact: Dict[str, Any], synced_at: str) -> Tuple:
+        phone = contact.get("phone") or contact.get("mobile") or ""
+        return (
+            crm,
+            str(contact.get("id")),
+            contact.get("first_name") or "",
+            contact.get("last_name") or "",
+            contact.get("name") or "",
+            contact.get("email") or "",
+            normalize_email(contact.get("email")),
+            phone,
+            normalize_phone(phone),
+            contact.get("company") or "",
+            contact.get("owner_email") or "",
+            contact.get("updated_at") or "",
+            dumps_str(contact),
+            synced_at,
+        )
+
+    @timed_storage
+    def upsert_contacts(self, crm: str, contacts: Iterable[Dict[str, Any]]) -> int:
+        crm = crm.lower()
+        synced_at = datetime.now().isoformat()
+        contacts = [contact for contact in contacts if contact.get("id") is not None]
+        rows = [self._row_values(crm, contact, synced_at) for contact in contacts]
+        if rows:
+            with self.db.transaction() as conn:
+                if self.identity is not None:
+                    self.identity.enqueue_changes(conn, crm, {row[1]: row[12] for row in rows})
+                conn.executemany(UPSERT_SQL, rows)
+        return len(rows)
+
+    @timed_storage
+    def delete_contacts(self, crm: str, contact_ids: Iterable[str]) -> int:
+        crm = crm.lower()
+        contact_ids = [str(contact_id) for contact_id in contact_ids]
+        if not contact_ids:
+            return 0
+        with self.db.transaction() as conn:
+            if self.identity is not None:
+                self.identity.enqueue(conn, crm, contact_ids)
+            before = conn.total_changes
+            conn.executemany(
+                "DELETE FROM contacts WHERE crm = ? AND id = ?",
+                [(crm, contact_id) for contact_id in contact_ids],
+            )
+            return conn.total_changes - before
+
+    @timed_storage
+    def get_contact(self, crm: str, contact_id: str) -> Optional[Dict[str, Any]]:
+        row = (
+            self.db.connection()
+            .execute(
+                "SELECT data FROM contacts WHERE crm = ? AND id = ?",
+                (crm.lower(), str(contact_id)),
+            )
+            .fetchone()
+        )
+        return loads(row["data"]) if row else None
+
+    @timed_storage
+    def query(
+        self,
+        crm: Optional[str] = None,
+        email: Optional[str] = None,
+        phone: Optional[str] = None,
+        company: Optional[str] = None,
+        page: int = 1,
+        per_page: int = 50,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Return one page of matching contacts and the total number of matches."""
+        clauses, params = [], []
+        if crm:
+            clauses.append("crm = ?")
+            params.append(crm.lower())
+        if email:
+            clauses.append("email_normalized = ?")
+            params.append(normalize_email(email))
+        if phone:
+            clauses.append("phone_normalized = ?")
+            params.append(normalize_phone(phone))
+        if company:
+            clauses.append("company = ? COLLATE NOCASE")
+            params.append(company)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        conn = self.db.connection()
+        total = conn.execute(f"SELECT COUNT(*) FROM contacts {where}", params).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT crm, data FROM contacts {where} ORDER BY crm, id LIMIT ? OFFSET ?",
+            [*params, per_page, (page - 1) * per_page],
+        ).fetchall()
+        contacts = [{"crm": row["crm"], **loads(row["data"])} for row in rows]
+        return contacts, total
+
+    def close(self) -> None:
+        self.db.close()
@@ -0,0 +1,167 @@
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from addons.metrics import timed_storage
+from addons.serialization import dumps, loads
+from addons.storage.base import DEFAULT_TENANT, TokenStore
+
+
+class JSONTokenStore(TokenStore):
+    """Development backend keeping tokens, states and sync cursors in JSON files.
+
+    Writes go through a temporary file and an atomic rename under a process-wide
+    lock; the files are still rewritten whole, so use the SQLite backend when
+    several workers share the store.
+    """
+
+    def __init__(
+        self,
+        token_file_path: str = "tokens.json",
+        state_file_path: str = "states.json",
+        cursor_file_path: str = "sync_cursors.json",
+        state_ttl: timedelta = timedelta(minutes=10),
+    ):
+        super().__init__(state_ttl)
+        self.token_file_path = token_file_path
+        self.state_file_path = state_file_path
+        self.cursor_file_path = cursor_file_path
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _key(crm_name: str, tenant: str) -> str:
+        crm_name = crm_name.lower()
+        return crm_name if tenant == DEFAULT_TENANT else f"{crm_name}:{tenant}"
+
+    @staticmethod
+    def _split_key(key: str):
+        crm_name, _, tenant = key.partition(":")
+        return crm_name, tenant or DEFAULT_TENANT
+
+    def _read(self, path: str) -> Dict[str, Any]:
+        if not os.path.exists(path):
+            return {}
+        with open(path, "rb") as file:
+            return loads(file.read())
+
+    def _write(self, path: str, data: Dict[str, Any]) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(dumps(data, indent=True))
+        os.replace(tmp_path, path)
+
+    @timed_storage
+    def save_tokens(
+        self, crm_name: str, tokens: Dict[str, Any], tenant: str = DEFAULT_TENANT
+    ) -> Dict[str, Any]:
+        record = self.prepare_tokens(tokens)
+        with self._lock:
+            all_tokens = self._read(self.token_file_path)
+            all_tokens[self._key(crm_name, tenant)] = record
+            self._write(self.token_file_path, all_tokens)
+        return record
+
+    @timed_storage
+    def get_tokens(
+        self, crm_name: str, tenant: str = DEFAULT_TENANT
+    ) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            token_data = self._read(self.token_file_path).get(
+                self._key(crm_name, tenant)
+            )
+        if not token_data:
+            return None
+        token_data["crm_name"] = crm_name.lower()
+        return token_data
+
+    @timed_storage
+    def get_latest_tokens(
+        self, tenant: str = DEFAULT_TENANT
+    ) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            all_tokens = self._read(self.token_file_path)
+
+        latest_token = None
+        latest_auth_time = None
+        for key, token_data in all_tokens.items():
+            crm_name, key_tenant = self._split_key(key)
+            if key_tenant != tenant or not token_data:
+                continue
+            auth_time_str = token_data.get("last_authenticated")
+            if not auth_time_str:
+                continue
+            auth_time = datetime.fromisoformat(auth_time_str)
+            if latest_auth_time is None or auth_time > latest_auth_time:
+                latest_auth_time = auth_time
+                latest_token = token_data
+                latest_token["crm_name"] = crm_name
+        return latest_token
+
+    @timed_storage
+    def clear_tokens(
+        self, crm_name: Optional[str] = None, tenant: str = DEFAULT_TENANT
+    ) -> bool:
+        with self._lock:
+            all_tokens = self._read(self.token_file_path)
+            if crm_name:
+                keys = [self._key(crm_name, tenant)]
+            else:
+                keys = [k for k in all_tokens if self._split_key(k)[1] == tenant]
+            removed = [k for k in keys if all_tokens.pop(k, None) is not None]
+            if removed:
+                self._write(self.token_file_path, all_tokens)
+        return bool(removed)
+
+    @timed_storage
+    def save_state(
+        self, crm_name: str, state: str, tenant: str = DEFAULT_TENANT
+    ) -> None:
+        with self._lock:
+            all_states = self._read(self.state_file_path)
+            all_states[self._key(crm_name, tenant)] = {
+                "state": state,
+                "created_at": datetime.now().isoformat(),
+            }
+            self._write(self.state_file_path, all_states)
+
+    @timed_storage
+    def get_state(self, crm_name: str, tenant: str = DEFAULT_TENANT) -> Optional[str]:
+        with self._lock:
+            state_data = self._read(self.state_file_path).get(
+                self._key(crm_name, tenant)
+            )
+        if not state_data or self.is_state_expired(state_data["created_at"]):
+            return None
+        return state_data["state"]
+
+    def export_records(
+        self,
+    ) -> Tuple[List[Tuple[str, str, Dict[str, Any]]], List[Tuple[str, str, str]]]:
+        """Return every ``(crm_name, tenant, record)`` and ``(crm_name, tenant, cursor)``."""
+        with self._lock:
+            all_tokens = self._read(self.token_file_path)
+            all_cursors = self._read(self.cursor_file_path)
+        tokens = [
+            (*self._split_key(key), record) for key, record in all_tokens.items() if record
+        ]
+        cursors = [
+            (*self._split_key(key), cursor) for key, cursor in all_cursors.items() if cursor
+        ]
+        return tokens, cursors
+
+    @timed_storage
+    def save_sync_cursor(
+        self, crm_name: str, cursor: str, tenant: str = DEFAULT_TENANT
+    ) -> None:
+        with self._lock:
+            all_cursors = self._read(self.cursor_file_path)
+            all_cursors[self._key(crm_name, tenant)] = cursor
+            self._write(self.cursor_file_path, all_cursors)
+
+    @timed_storage
+    def get_sync_cursor(
+        self, crm_name: str, tenant: str = DEFAULT_TENANT
+    ) -> Optional[str]:
+        with self._lock:
+            return self._read(self.cursor_file_path).get(self._key(crm_name, tenant))
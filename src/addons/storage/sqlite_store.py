@@ -0,0 +1,218 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from addons.metrics import timed_storage
+from addons.serialization import dumps_str, loads
+from addons.storage.base import DEFAULT_TENANT, TokenStore
+from addons.storage.sqlite import SQLiteDatabase
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS oauth_tokens (
+    crm_name TEXT NOT NULL,
+    tenant TEXT NOT NULL,
+    data TEXT NOT NULL,
+    last_authenticated TEXT NOT NULL,
+    PRIMARY KEY (crm_name, tenant)
+);
+CREATE INDEX IF NOT EXISTS idx_oauth_tokens_latest
+    ON oauth_tokens (tenant, last_authenticated);
+CREATE TABLE IF NOT EXISTS oauth_states (
+    crm_name TEXT NOT NULL,
+    tenant TEXT NOT NULL,
+    state TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (crm_name, tenant)
+);
+CREATE TABLE IF NOT EXISTS sync_cursors (
+    crm_name TEXT NOT NULL,
+    tenant TEXT NOT NULL,
+    cursor TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (crm_name, tenant)
+);
+CREATE TABLE IF NOT EXISTS store_imports (
+    source TEXT PRIMARY KEY,
+    imported_at TEXT NOT NULL
+);
+"""
+
+
+class SQLiteTokenStore(TokenStore):
+    """Token/state store backed by one row per connection in a WAL-mode SQLite file."""
+
+    def __init__(
+        self,
+        path: str = "crmintegration.db",
+        state_ttl: timedelta = timedelta(minutes=10),
+    ):
+        super().__init__(state_ttl)
+        self.db = SQLiteDatabase(path, SCHEMA)
+
+    @staticmethod
+    def _row_to_tokens(row) -> Dict[str, Any]:
+        token_data = loads(row["data"])
+        token_data["crm_name"] = row["crm_name"]
+        return token_data
+
+    @timed_storage
+    def save_tokens(
+        self, crm_name: str, tokens: Dict[str, Any], tenant: str = DEFAULT_TENANT
+    ) -> Dict[str, Any]:
+        record = self.prepare_tokens(tokens)
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT INTO oauth_tokens (crm_name, tenant, data, last_authenticated) "
+                "VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (crm_name, tenant) DO UPDATE SET "
+                "data = excluded.data, last_authenticated = excluded.last_authenticated",
+                (
+                    crm_name.lower(),
+                    tenant,
+                    dumps_str(record),
+                    record["last_authenticated"],
+                ),
+            )
+        return record
+
+    @timed_storage
+    def get_tokens(
+        self, crm_name: str, tenant: str = DEFAULT_TENANT
+    ) -> Optional[Dict[str, Any]]:
+        row = (
+            self.db.connection()
+            .execute(
+                "SELECT crm_name, data FROM oauth_tokens WHERE crm_name = ? AND tenant = ?",
+                (crm_name.lower(), tenant),
+            )
+            .fetchone()
+        )
+        return self._row_to_tokens(row) if row else None
+
+    @timed_storage
+    def get_latest_tokens(
+        self, tenant: str = DEFAULT_TENANT
+    ) -> Optional[Dict[str, Any]]:
+        row = (
+            self.db.connection()
+            .execute(
+                "SELECT crm_name, data FROM oauth_tokens WHERE tenant = ? "
+                "ORDER BY last_authenticated DESC LIMIT 1",
+                (tenant,),
+            )
+            .fetchone()
+        )
+        return self._row_to_tokens(row) if row else None
+
+    @timed_storage
+    def clear_tokens(
+        self, crm_name: Optional[str] = None, tenant: str = DEFAULT_TENANT
+    ) -> bool:
+        with self.db.transaction() as conn:
+            if crm_name:
+                cursor = conn.execute(
+                    "DELETE FROM oauth_tokens WHERE crm_name = ? AND tenant = ?",
+                    (crm_name.lower(), tenant),
+                )
+            else:
+                cursor = conn.execute(
+                    "DELETE FROM oauth_tokens WHERE tenant = ?", (tenant,)
+                )
+        return cursor.rowcount > 0
+
+    @timed_storage
+    def save_state(
+        self, crm_name: str, state: str, tenant: str = DEFAULT_TENANT
+    ) -> None:
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT INTO oauth_states (crm_name, tenant, state, created_at) "
+                "VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (crm_name, tenant) DO UPDATE SET "
+                "state = excluded.state, created_at = excluded.created_at",
+                (crm_name.lower(), tenant, state, datetime.now().isoformat()),
+            )
+
+    @timed_storage
+    def get_state(self, crm_name: str, tenant: str = DEFAULT_TENANT) -> Optional[str]:
+        row = (
+            self.db.connection()
+            .execute(
+                "SELECT state, created_at FROM oauth_states WHERE crm_name = ? AND tenant = ?",
+                (crm_name.lower(), tenant),
+            )
+            .fetchone()
+        )
+        if not row or self.is_state_expired(row["created_at"]):
+            return None
+        return row["state"]
+
+    @timed_storage
+    def save_sync_cursor(
+        self, crm_name: str, cursor: str, tenant: str = DEFAULT_TENANT
+    ) -> None:
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT INTO sync_cursors (crm_name, tenant, cursor, updated_at) "
+                "VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (crm_name, tenant) DO UPDATE SET "
+                "cursor = excluded.cursor, updated_at = excluded.updated_at",
+                (crm_name.lower(), tenant, cursor, datetime.now().isoformat()),
+            )
+
+    @timed_storage
+    def get_sync_cursor(
+        self, crm_name: str, tenant: str = DEFAULT_TENANT
+    ) -> Optional[str]:
+        row = (
+            self.db.connection()
+            .execute(
+                "SELECT cursor FROM sync_cursors WHERE crm_name = ? AND tenant = ?",
+                (crm_name.lower(), tenant),
+            )
+            .fetchone()
+        )
+        return row["cursor"] if row else None
+
+    @timed_storage
+    def import_records(
+        self,
+        source: str,
+        tokens: Iterable[Tuple[str, str, Dict[str, Any]]],
+        cursors: Iterable[Tuple[str, str, str]],
+    ) -> Optional[int]:
+        """Copy token records and sync cursors kept in ``source`` into this store, once.
+
+        Rows already present here are kept. Returns the number of connections
+        imported, or None when ``source`` was imported before.
+        """
+        now = datetime.now().isoformat()
+        with self.db.transaction() as conn:
+            if conn.execute(
+                "SELECT 1 FROM store_imports WHERE source = ?", (source,)
+            ).fetchone():
+                return None
+            imported = 0
+            for crm_name, tenant, record in tokens:
+                record = {k: v for k, v in record.items() if k != "crm_name"}
+                imported += conn.execute(
+                    "INSERT OR IGNORE INTO oauth_tokens "
+                    "(crm_name, tenant, data, last_authenticated) VALUES (?, ?, ?, ?)",
+                    (
+                        crm_name.lower(),
+                        tenant,
+                        dumps_str(record),
+                        record.get("last_authenticated") or now,
+                    ),
+                ).rowcount
+            conn.executemany(
+                "INSERT OR IGNORE INTO sync_cursors (crm_name, tenant, cursor, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(crm_name.lower(), tenant, cursor, now) for crm_name, tenant, cursor in cursors],
+            )
+            conn.execute(
+                "INSERT INTO store_imports (source, imported_at) VALUES (?, ?)", (source, now)
+            )
+        return imported
+
+    def close(self) -> None:
+        self.db.close()
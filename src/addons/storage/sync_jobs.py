@@ -0,0 +1,260 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from addons.metrics import timed_storage
+from addons.storage.base import DEFAULT_TENANT
+from addons.storage.sqlite import SQLiteDatabase
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_jobs (
+    id TEXT PRIMARY KEY,
+    crm TEXT NOT NULL,
+    tenant TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    trigger TEXT NOT NULL,
+    status TEXT NOT NULL,
+    modified_since TEXT,
+    next_page INTEGER NOT NULL DEFAULT 1,
+    pages INTEGER NOT NULL DEFAULT 0,
+    changed INTEGER NOT NULL DEFAULT 0,
+    high_water TEXT,
+    cursor TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    updated_at TEXT NOT NULL,
+    finished_at TEXT,
+    owner TEXT,
+    heartbeat TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sync_jobs_connection
+    ON sync_jobs (crm, tenant, created_at);
+CREATE INDEX IF NOT EXISTS idx_sync_jobs_status ON sync_jobs (status);
+"""
+
+# Columns added after the table was first released, created on open if missing.
+_ADDED_COLUMNS = (("owner", "TEXT"), ("heartbeat", "TEXT"))
+
+_UPDATABLE = {
+    "status",
+    "owner",
+    "next_page",
+    "pages",
+    "changed",
+    "high_water",
+    "cursor",
+    "attempts",
+    "error",
+    "started_at",
+    "finished_at",
+}
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _lease_time(offset: timedelta = timedelta(0)) -> str:
+    # Fixed precision, so heartbeats compare correctly as strings.
+    return (datetime.now(timezone.utc) + offset).isoformat(timespec="microseconds")
+
+
+class SyncJobStore:
+    """Contact sync jobs and their page checkpoints, one row per job.
+
+    ``next_page`` is advanced after each page is stored, so a job picked up
+    again after a crash or failure continues where it stopped.
+
+    Several processes may share the file. An unfinished job belongs to the
+    scheduler in its ``owner`` column, which keeps ``heartbeat`` current; a
+    job is only taken over through ``claim_job`` once it has no owner or its
+    owner's heartbeat is older than the lease.
+    """
+
+    def __init__(self, path: str = "sync_jobs.db"):
+        self.db = SQLiteDatabase(path, SCHEMA)
+        conn = self.db.connection()
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(sync_jobs)")}
+        for name, column_type in _ADDED_COLUMNS:
+            if name not in columns:
+                conn.execute(f"ALTER TABLE sync_jobs ADD COLUMN {name} {column_type}")
+
+    @timed_storage
+    def create_job(
+        self,
+        crm: str,
+        mode: str,
+        modified_since: Optional[str] = None,
+        trigger: str = "manual",
+        tenant: str = DEFAULT_TENANT,
+        owner: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        job_id = uuid.uuid4().hex
+        now = utc_now()
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT INTO sync_jobs (id, crm, tenant, mode, trigger, status, "
+                "modified_since, created_at, updated_at, owner, heartbeat) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job_id, crm.lower(), tenant, mode, trigger, QUEUED, modified_since,
+                    now, now, owner, _lease_time() if owner else None,
+                ),
+            )
+        return self.get_job(job_id)
+
+    @timed_storage
+    def claim_job(
+        self,
+        job_id: str,
+        owner: str,
+        lease_seconds: float,
+        statuses: Sequence[str] = ACTIVE_STATUSES,
+    ) -> Optional[Dict[str, Any]]:
+        """Atomically queue a job for ``owner`` if it is free; returns None if it is held.
+
+        A job is free when it is in one of ``statuses`` and has no owner, or
+        its owner has not renewed the heartbeat within ``lease_seconds``.
+        """
+        placeholders = ", ".join("?" for _ in statuses)
+        with self.db.transaction() as conn:
+            claimed = conn.execute(
+                f"UPDATE sync_jobs SET owner = ?, heartbeat = ?, status = ?, updated_at = ? "
+                f"WHERE id = ? AND status IN ({placeholders}) "
+                "AND (owner IS NULL OR heartbeat IS NULL OR heartbeat < ?)",
+                (
+                    owner, _lease_time(), QUEUED, utc_now(), job_id, *statuses,
+                    _lease_time(-timedelta(seconds=lease_seconds)),
+                ),
+            ).rowcount
+        return self.get_job(job_id) if claimed else None
+
+    @timed_storage
+    def renew_jobs(self, owner: str) -> int:
+        """Refresh the heartbeat of every unfinished job held by ``owner``."""
+        with self.db.transaction() as conn:
+            return conn.execute(
+                "UPDATE sync_jobs SET heartbeat = ? WHERE owner = ? AND status IN (?, ?)",
+                (_lease_time(), owner, *ACTIVE_STATUSES),
+            ).rowcount
+
+    @timed_storage
+    def release_jobs(self, owner: str) -> int:
+        """Requeue ``owner``'s unfinished jobs without an owner, for any scheduler to claim."""
+        with self.db.transaction() as conn:
+            return conn.execute(
+                "UPDATE sync_jobs SET owner = NULL, heartbeat = NULL, status = ?, updated_at = ? "
+                "WHERE owner = ? AND status IN (?, ?)",
+                (QUEUED, utc_now(), owner, *ACTIVE_STATUSES),
+            ).rowcount
+
+    @timed_storage
+    def update_job(self, job_id: str, **fields: Any) -> Dict[str, Any]:
+        unknown = set(fields) - _UPDATABLE
+        if unknown:
+            raise ValueError(f"Unknown sync job fields: {', '.join(sorted(unknown))}")
+        fields["updated_at"] = utc_now()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self.db.transaction() as conn:
+            conn.execute(
+                f"UPDATE sync_jobs SET {assignments} WHERE id = ?",
+                [*fields.values(), job_id],
+            )
+        return self.get_job(job_id)
+
+    @timed_storage
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = (
+            self.db.connection()
+            .execute("SELECT * FROM sync_jobs WHERE id = ?", (job_id,))
+            .fetchone()
+        )
+        return dict(row) if row else None
+
+    @timed_storage
+    def latest_job(
+        self,
+        crm: str,
+        tenant: str = DEFAULT_TENANT,
+        mode: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        clauses, params = ["crm = ?", "tenant = ?"], [crm.lower(), tenant]
+        if mode:
+            clauses.append("mode = ?")
+            params.append(mode)
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        row = (
+            self.db.connection()
+            .execute(
+                f"SELECT * FROM sync_jobs WHERE {' AND '.join(clauses)} "
+                "ORDER BY created_at DESC LIMIT 1",
+                params,
+            )
+            .fetchone()
+        )
+        return dict(row) if row else None
+
+    @timed_storage
+    def active_job(self, crm: str, tenant: str = DEFAULT_TENANT) -> Optional[Dict[str, Any]]:
+        row = (
+            self.db.connection()
+            .execute(
+                "SELECT * FROM sync_jobs WHERE crm = ? AND tenant = ? AND status IN (?, ?) "
+                "ORDER BY created_at LIMIT 1",
+                (crm.lower(), tenant, *ACTIVE_STATUSES),
+            )
+            .fetchone()
+        )
+        return dict(row) if row else None
+
+    @timed_storage
+    def list_jobs(
+        self,
+        crm: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        clauses, params = [], []
+        if crm:
+            clauses.append("crm = ?")
+            params.append(crm.lower())
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = (
+            self.db.connection()
+            .execute(
+                f"SELECT * FROM sync_jobs {where} ORDER BY created_at DESC LIMIT ?",
+                [*params, limit],
+            )
+            .fetchall()
+        )
+        return [dict(row) for row in rows]
+
+    @timed_storage
+    def unfinished_jobs(self) -> List[Dict[str, Any]]:
+        """Jobs left queued or running, e.g. by a stopped process, oldest first."""
+        rows = (
+            self.db.connection()
+            .execute(
+                "SELECT * FROM sync_jobs WHERE status IN (?, ?) ORDER BY created_at",
+                ACTIVE_STATUSES,
+            )
+            .fetchall()
+        )
+        return [dict(row) for row in rows]
+
+    def close(self) -> None:
+        self.db.close()
@@ -0,0 +1,85 @@
+from typing import Any, Dict, List, Optional
+
+from addons.metrics import timed_storage
+from addons.storage.base import DEFAULT_TENANT
+from addons.storage.sqlite import SQLiteDatabase
+from addons.storage.sync_jobs import utc_now
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS webhook_subscriptions (
+    crm TEXT NOT NULL,
+    tenant TEXT NOT NULL,
+    subscription_id TEXT NOT NULL,
+    token TEXT NOT NULL,
+    notify_url TEXT NOT NULL,
+    expires_at TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (crm, tenant)
+);
+"""
+
+
+class WebhookSubscriptionStore:
+    """Registered push subscriptions and the tokens their notifications must carry."""
+
+    def __init__(self, path: str = "webhooks.db"):
+        self.db = SQLiteDatabase(path, SCHEMA)
+
+    @timed_storage
+    def save_subscription(
+        self,
+        crm: str,
+        subscription_id: str,
+        token: str,
+        notify_url: str,
+        expires_at: Optional[str],
+        tenant: str = DEFAULT_TENANT,
+    ) -> Dict[str, Any]:
+        now = utc_now()
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT INTO webhook_subscriptions (crm, tenant, subscription_id, token, "
+                "notify_url, expires_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (crm, tenant) DO UPDATE SET "
+                "subscription_id = excluded.subscription_id, token = excluded.token, "
+                "notify_url = excluded.notify_url, expires_at = excluded.expires_at, "
+                "updated_at = excluded.updated_at",
+                (crm.lower(), tenant, subscription_id, token, notify_url, expires_at, now, now),
+            )
+        return self.get_subscription(crm, tenant)
+
+    @timed_storage
+    def get_subscription(
+        self, crm: str, tenant: str = DEFAULT_TENANT
+    ) -> Optional[Dict[str, Any]]:
+        row = (
+            self.db.connection()
+            .execute(
+                "SELECT * FROM webhook_subscriptions WHERE crm = ? AND tenant = ?",
+                (crm.lower(), tenant),
+            )
+            .fetchone()
+        )
+        return dict(row) if row else None
+
+    @timed_storage
+    def delete_subscription(self, crm: str, tenant: str = DEFAULT_TENANT) -> bool:
+        with self.db.transaction() as conn:
+            cursor = conn.execute(
+                "DELETE FROM webhook_subscriptions WHERE crm = ? AND tenant = ?",
+                (crm.lower(), tenant),
+            )
+        return cursor.rowcount > 0
+
+    @timed_storage
+    def list_subscriptions(self) -> List[Dict[str, Any]]:
+        rows = (
+            self.db.connection()
+            .execute("SELECT * FROM webhook_subscriptions ORDER BY crm, tenant")
+            .fetchall()
+        )
+        return [dict(row) for row in rows]
+
+    def close(self) -> None:
+        self.db.close()
@@ -0,0 +1,106 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from pluggy import PluginManager
+
+from addons.integration.hookspec import iter_crm_hook
+from addons.storage.contacts import ContactStore
+from addons.storage.sync_jobs import RUNNING, SUCCEEDED, SyncJobStore, utc_now
+from addons.token_manager import TokenManager
+from api.utils.logger import get_logger
+
+logger = get_logger()
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp from a CRM record; naive values are taken as UTC."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+async def run_sync_job(
+    pm: PluginManager,
+    token_manager: TokenManager,
+    contact_store: ContactStore,
+    job_store: SyncJobStore,
+    job: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Pull a job's contacts page by page into the contact store, checkpointing each page.
+
+    The walk starts at the job's ``next_page`` with the ``modified_since``
+    fixed when the job was created, so a resumed job asks for the same page
+    sequence. The new cursor is the latest ``updated_at`` seen (falling back
+    to the job's first start time) and is only saved once every page has
+    been stored, so a failed job leaves the previous cursor in place.
+    """
+    crm_name, tenant = job["crm"], job["tenant"]
+    started_at = job["started_at"] or utc_now()
+    job = await run_in_threadpool(
+        job_store.update_job,
+        job["id"],
+        status=RUNNING,
+        started_at=started_at,
+        attempts=job["attempts"] + 1,
+        error=None,
+    )
+    high_water = parse_timestamp(job["high_water"])
+    page_number = job["next_page"]
+    pages_done, changed = job["pages"], job["changed"]
+    logger.info(
+        "Running %s sync job %s for %s from page %s since %s",
+        job["mode"], job["id"], crm_name, page_number, job["modified_since"],
+    )
+
+    async def with_tokens(call):
+        return await token_manager.call_with_tokens(crm_name, call, tenant)
+
+    pages = iter_crm_hook(
+        pm,
+        "iter_contacts",
+        crm_name,
+        with_tokens=with_tokens,
+        per_page=None,
+        modified_since=job["modified_since"],
+        start_page=page_number,
+        columnar=False,
+    )
+
+    async for contacts in pages:
+        for contact in contacts:
+            updated_at = parse_timestamp(contact.get("updated_at"))
+            if updated_at and (high_water is None or updated_at > high_water):
+                high_water = updated_at
+        changed += await run_in_threadpool(
+            contact_store.upsert_contacts, crm_name, contacts
+        )
+        page_number += 1
+        pages_done += 1
+        await run_in_threadpool(
+            job_store.update_job,
+            job["id"],
+            next_page=page_number,
+            pages=pages_done,
+            changed=changed,
+            high_water=high_water.isoformat() if high_water else None,
+        )
+
+    new_cursor = (high_water or parse_timestamp(started_at)).isoformat()
+    await run_in_threadpool(
+        token_manager.store.save_sync_cursor, crm_name, new_cursor, tenant
+    )
+    job = await run_in_threadpool(
+        job_store.update_job,
+        job["id"],
+        status=SUCCEEDED,
+        owner=None,
+        cursor=new_cursor,
+        finished_at=utc_now(),
+    )
+    logger.info("Synced %s changed contacts from %s, cursor now %s", changed, crm_name, new_cursor)
+    return job
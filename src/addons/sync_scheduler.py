@@ -0,0 +1,219 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from pluggy import PluginManager
+
+from addons.storage.base import DEFAULT_TENANT
+from addons.storage.contacts import ContactStore
+from addons.storage.sync_jobs import FAILED, QUEUED, SyncJobStore, utc_now
+from addons.sync import parse_timestamp, run_sync_job
+from addons.token_manager import TokenManager
+from config.settings import SyncSettings
+from api.utils.logger import get_logger
+
+logger = get_logger()
+
+FULL = "full"
+INCREMENTAL = "incremental"
+
+
+class SyncScheduler:
+    """Run contact sync jobs on a fixed pool of background workers.
+
+    Jobs are persisted in ``job_store`` before they are queued, so jobs left
+    queued or running when the process stopped are picked up again and
+    continue from their last stored page. Each scheduler holds its jobs under
+    its own owner id and renews their lease while it runs; on start, and on
+    every lease renewal, it claims unfinished jobs that have no owner or whose
+    owner stopped renewing, so schedulers sharing the job store never resume
+    the same job twice. A connection has at most one
+    active job; asking for another returns the active one. A failed job is
+    resumed by the next request for that connection until ``max_attempts``.
+
+    When intervals are configured, a scheduler task periodically queues
+    incremental syncs, and full syncs, for every CRM with stored tokens.
+    """
+
+    def __init__(
+        self,
+        pm: PluginManager,
+        token_manager: TokenManager,
+        contact_store: ContactStore,
+        job_store: SyncJobStore,
+        settings: SyncSettings,
+        crm_names: Iterable[str],
+    ):
+        self.pm = pm
+        self.token_manager = token_manager
+        self.contact_store = contact_store
+        self.job_store = job_store
+        self.settings = settings
+        self.crm_names = sorted(name.lower() for name in crm_names)
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._enqueue_lock = asyncio.Lock()
+        self.owner = uuid.uuid4().hex
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        await self._claim_unfinished()
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"sync-worker-{i}")
+            for i in range(max(self.settings.workers, 1))
+        ]
+        self._tasks.append(asyncio.create_task(self._keep_leases(), name="sync-leases"))
+        if self.settings.incremental_interval_seconds or self.settings.full_interval_seconds:
+            self._tasks.append(asyncio.create_task(self._schedule(), name="sync-scheduler"))
+        logger.info("Sync scheduler started with %s workers", self.settings.workers)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await run_in_threadpool(self.job_store.release_jobs, self.owner)
+
+    async def _claim_unfinished(self) -> None:
+        for job in await run_in_threadpool(self.job_store.unfinished_jobs):
+            if job["owner"] == self.owner:
+                continue
+            claimed = await run_in_threadpool(
+                self.job_store.claim_job, job["id"], self.owner, self.settings.lease_seconds
+            )
+            if claimed is None:
+                continue
+            logger.info(
+                "Resuming %s sync job %s for %s at page %s",
+                job["status"], job["id"], job["crm"], job["next_page"],
+            )
+            self._queue.put_nowait(job["id"])
+
+    async def _keep_leases(self) -> None:
+        while True:
+            await asyncio.sleep(self.settings.lease_seconds / 3)
+            try:
+                await run_in_threadpool(self.job_store.renew_jobs, self.owner)
+                await self._claim_unfinished()
+            except Exception:
+                logger.exception("Renewing sync job leases failed")
+
+    async def enqueue(
+        self,
+        crm_name: str,
+        tenant: str = DEFAULT_TENANT,
+        full: bool = False,
+        trigger: str = "manual",
+    ) -> Dict[str, Any]:
+        """Queue a sync for a connection and return its job record."""
+        crm_name = crm_name.lower()
+        async with self._enqueue_lock:
+            active = await run_in_threadpool(self.job_store.active_job, crm_name, tenant)
+            if active:
+                return active
+
+            cursor = None
+            if not full:
+                cursor = await run_in_threadpool(
+                    self.token_manager.store.get_sync_cursor, crm_name, tenant
+                )
+            mode = INCREMENTAL if cursor else FULL
+
+            latest = await run_in_threadpool(self.job_store.latest_job, crm_name, tenant)
+            if (
+                latest
+                and latest["status"] == FAILED
+                and latest["mode"] == mode
+                and latest["attempts"] < self.settings.max_attempts
+            ):
+                job = await run_in_threadpool(
+                    self.job_store.claim_job,
+                    latest["id"],
+                    self.owner,
+                    self.settings.lease_seconds,
+                    (FAILED,),
+                )
+                if job is None:
+                    # Another scheduler resumed it first.
+                    return await run_in_threadpool(self.job_store.get_job, latest["id"])
+                logger.info(
+                    "Resuming failed sync job %s for %s at page %s",
+                    latest["id"], crm_name, latest["next_page"],
+                )
+            else:
+                job = await run_in_threadpool(
+                    self.job_store.create_job,
+                    crm_name,
+                    mode,
+                    cursor,
+                    trigger,
+                    tenant,
+                    self.owner,
+                )
+            self._queue.put_nowait(job["id"])
+        logger.info("Queued %s sync job %s for %s", job["mode"], job["id"], crm_name)
+        return job
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = await run_in_threadpool(self.job_store.get_job, job_id)
+                if job and job["status"] == QUEUED and job["owner"] == self.owner:
+                    await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        try:
+            await run_sync_job(
+                self.pm, self.token_manager, self.contact_store, self.job_store, job
+            )
+        except asyncio.CancelledError:
+            # Shutting down: leave the job queued so the next start resumes it.
+            await asyncio.shield(
+                run_in_threadpool(self.job_store.update_job, job["id"], status=QUEUED)
+            )
+            raise
+        except Exception as e:
+            logger.exception("Sync job %s for %s failed", job["id"], job["crm"])
+            await run_in_threadpool(
+                self.job_store.update_job,
+                job["id"],
+                status=FAILED,
+                owner=None,
+                error=str(e),
+                finished_at=utc_now(),
+            )
+
+    def _due(self, job: Optional[Dict[str, Any]], interval: float, now: datetime) -> bool:
+        if not interval:
+            return False
+        if job is None:
+            return True
+        last_run = parse_timestamp(job["created_at"])
+        return last_run is None or now - last_run >= timedelta(seconds=interval)
+
+    async def _schedule(self) -> None:
+        while True:
+            now = datetime.now(timezone.utc)
+            for crm_name in self.crm_names:
+                try:
+                    if not await run_in_threadpool(
+                        self.token_manager.store.get_tokens, crm_name
+                    ):
+                        continue
+                    last_full = await run_in_threadpool(
+                        self.job_store.latest_job, crm_name, DEFAULT_TENANT, FULL
+                    )
+                    last_any = await run_in_threadpool(
+                        self.job_store.latest_job, crm_name, DEFAULT_TENANT
+                    )
+                    if self._due(last_full, self.settings.full_interval_seconds, now):
+                        await self.enqueue(crm_name, full=True, trigger="scheduled")
+                    elif self._due(last_any, self.settings.incremental_interval_seconds, now):
+                        await self.enqueue(crm_name, trigger="scheduled")
+                except Exception:
+                    logger.exception("Scheduling sync for %s failed", crm_name)
+            await asyncio.sleep(self.settings.tick_seconds)
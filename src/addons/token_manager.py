@@ -0,0 +1,170 @@
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from addons.metrics import TOKEN_REFRESHES
+from addons.singleflight import SingleFlight
+from addons.storage.base import DEFAULT_TENANT, TokenStore
+from core.exception import OAuthError, TokenExpiredError
+from api.utils.logger import get_logger
+
+logger = get_logger()
+
+Refresher = Callable[[str, str], Awaitable[Dict[str, Any]]]
+
+
+class TokenManager:
+    """In-memory token cache in front of a TokenStore, with refresh-ahead.
+
+    Cached entries are dropped whenever tokens are written through the manager
+    and also age out after ``cache_ttl`` so writes from other workers are seen.
+    Tokens expiring within ``refresh_margin`` are refreshed before use, with at
+    most one refresh in flight per connection.
+    """
+
+    def __init__(
+        self,
+        store: TokenStore,
+        refresher: Refresher,
+        refresh_margin: timedelta = timedelta(minutes=5),
+        cache_ttl: timedelta = timedelta(minutes=1),
+    ):
+        self.store = store
+        self.refresher = refresher
+        self.refresh_margin = refresh_margin
+        self.cache_ttl = cache_ttl.total_seconds()
+        self._cache: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+        self._latest: Dict[str, Tuple[float, Optional[str]]] = {}
+        self._refreshes = SingleFlight()
+
+    def _fresh(self, cached_at: float) -> bool:
+        return time.monotonic() - cached_at < self.cache_ttl
+
+    def invalidate(
+        self, crm_name: Optional[str] = None, tenant: str = DEFAULT_TENANT
+    ) -> None:
+        if crm_name:
+            self._cache.pop((crm_name.lower(), tenant), None)
+        else:
+            for key in [key for key in self._cache if key[1] == tenant]:
+                del self._cache[key]
+        self._latest.pop(tenant, None)
+
+    async def get_tokens(
+        self, crm_name: Optional[str] = None, tenant: str = DEFAULT_TENANT
+    ) -> Optional[Dict[str, Any]]:
+        """Return cached tokens for a CRM, or for the most recently authenticated one."""
+        if not crm_name:
+            latest = self._latest.get(tenant)
+            if latest and self._fresh(latest[0]):
+                crm_name = latest[1]
+                if crm_name is None:
+                    return None
+            else:
+                tokens = await run_in_threadpool(self.store.get_latest_tokens, tenant)
+                self._latest[tenant] = (
+                    time.monotonic(),
+                    tokens["crm_name"] if tokens else None,
+                )
+                if tokens:
+                    self._cache[(tokens["crm_name"], tenant)] = (time.monotonic(), tokens)
+                return tokens
+
+        key = (crm_name.lower(), tenant)
+        cached = self._cache.get(key)
+        if cached and self._fresh(cached[0]):
+            return cached[1]
+
+        tokens = await run_in_threadpool(self.store.get_tokens, crm_name, tenant)
+        if tokens:
+            self._cache[key] = (time.monotonic(), tokens)
+        return tokens
+
+    def expires_soon(self, tokens: Dict[str, Any]) -> bool:
+        expires_at = tokens.get("expires_at")
+        if not expires_at:
+            return False
+        return datetime.fromisoformat(expires_at) - datetime.now() <= self.refresh_margin
+
+    async def get_valid_tokens(
+        self, crm_name: Optional[str] = None, tenant: str = DEFAULT_TENANT
+    ) -> Optional[Dict[str, Any]]:
+        """Like get_tokens, but refreshes tokens that are expired or about to expire."""
+        tokens = await self.get_tokens(crm_name, tenant)
+        if tokens and self.expires_soon(tokens):
+            logger.info("Access token for %s expires soon, refreshing ahead", tokens["crm_name"])
+            tokens = await self.refresh(tokens["crm_name"], tenant)
+        return tokens
+
+    async def save_tokens(
+        self, crm_name: str, tokens: Dict[str, Any], tenant: str = DEFAULT_TENANT
+    ) -> Dict[str, Any]:
+        record = await run_in_threadpool(self.store.save_tokens, crm_name, tokens, tenant)
+        self.invalidate(crm_name, tenant)
+        record = {**record, "crm_name": crm_name.lower()}
+        self._cache[(crm_name.lower(), tenant)] = (time.monotonic(), record)
+        return record
+
+    async def refresh(
+        self,
+        crm_name: str,
+        tenant: str = DEFAULT_TENANT,
+        stale_access_token: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Refresh a connection's tokens; concurrent callers share one refresh.
+
+        ``stale_access_token`` is the token the CRM rejected. If the stored token
+        has already moved on, another caller refreshed it and that result is
+        reused instead of calling the token endpoint again.
+        """
+        key = (crm_name.lower(), tenant)
+        return await self._refreshes.do(
+            key, lambda: self._refresh(crm_name, tenant, stale_access_token)
+        )
+
+    async def _refresh(
+        self, crm_name: str, tenant: str, stale_access_token: Optional[str]
+    ) -> Dict[str, Any]:
+        self.invalidate(crm_name, tenant)
+        current = await self.get_tokens(crm_name, tenant)
+        if not current or not current.get("refresh_token"):
+            raise OAuthError(detail=f"No refresh token stored for {crm_name}")
+
+        if stale_access_token is not None:
+            if current.get("access_token") != stale_access_token:
+                logger.info("Tokens for %s were already refreshed", crm_name)
+                return current
+        elif not self.expires_soon(current):
+            return current
+
+        try:
+            refreshed = await self.refresher(crm_name, current["refresh_token"])
+        except Exception:
+            TOKEN_REFRESHES.inc(crm=crm_name.lower(), outcome="error")
+            raise
+        TOKEN_REFRESHES.inc(crm=crm_name.lower(), outcome="success")
+        merged = {**current, **refreshed}
+        if "expires_at" not in refreshed:
+            merged.pop("expires_at", None)
+        return await self.save_tokens(crm_name, merged, tenant)
+
+    async def call_with_tokens(
+        self,
+        crm_name: str,
+        call: Callable[[Dict[str, Any]], Awaitable[Any]],
+        tenant: str = DEFAULT_TENANT,
+    ) -> Any:
+        """Run ``call`` with valid tokens, refreshing once if the CRM still rejects them."""
+        tokens = await self.get_valid_tokens(crm_name, tenant)
+        if not tokens:
+            raise OAuthError(detail=f"Authorization required for {crm_name}")
+        try:
+            return await call(tokens)
+        except TokenExpiredError:
+            logger.warning("Access token for %s was rejected, refreshing", crm_name)
+            tokens = await self.refresh(
+                crm_name, tenant, stale_access_token=tokens.get("access_token")
+            )
+            return await call(tokens)
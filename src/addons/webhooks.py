@@ -0,0 +1,317 @@
+import asyncio
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+from urllib.parse import urlencode
+
+from fastapi.concurrency import run_in_threadpool
+from pluggy import PluginManager
+
+from addons.integration.hookspec import call_crm_hook, get_crm_hook_caller
+from addons.metrics import WEBHOOK_EVENTS
+from addons.response_cache import ResponseCache
+from addons.storage.base import DEFAULT_TENANT
+from addons.storage.contacts import ContactStore
+from addons.storage.webhooks import WebhookSubscriptionStore
+from addons.sync import parse_timestamp
+from addons.token_manager import TokenManager
+from config.settings import WebhookSettings
+from core.exception import IntegrationError
+from api.utils.logger import get_logger
+
+logger = get_logger()
+
+_DELETED = object()
+_FETCH = object()
+_STOP = object()
+
+
+class WebhookEvent(NamedTuple):
+    crm_name: str
+    tenant: str
+    change: Dict[str, Any]
+
+
+class WebhookIngestor:
+    """Queue parsed notifications and write them to the contact store in batches.
+
+    Receiving a notification only validates and enqueues it. A single writer
+    task collects up to ``batch_size`` events, or whatever arrived within
+    ``flush_interval_seconds``, collapses repeated changes to the same contact,
+    fetches records that were announced by id, and stores each CRM's batch
+    with one upsert and one delete. A full queue rejects new notifications
+    so the CRM redelivers them later.
+    """
+
+    def __init__(
+        self,
+        pm: PluginManager,
+        token_manager: TokenManager,
+        contact_store: ContactStore,
+        settings: WebhookSettings,
+        response_cache: Optional[ResponseCache] = None,
+    ):
+        self.pm = pm
+        self.token_manager = token_manager
+        self.contact_store = contact_store
+        self.settings = settings
+        self.response_cache = response_cache
+        self._queue: "asyncio.Queue[WebhookEvent]" = asyncio.Queue(settings.queue_size)
+        self._writer: Optional[asyncio.Task] = None
+        self._closing = False
+
+    def start(self) -> None:
+        self._writer = asyncio.create_task(self._write_batches(), name="webhook-writer")
+
+    async def stop(self) -> None:
+        """Reject new notifications, then let the writer store everything already accepted.
+
+        The writer is not cancelled: events taken off the queue have been
+        acknowledged to the CRM, so a stop sentinel is queued behind them and
+        the writer exits once it has written the batch holding it.
+        """
+        self._closing = True
+        if self._writer is None:
+            remaining = []
+            while not self._queue.empty():
+                remaining.append(self._queue.get_nowait())
+            if remaining:
+                await self._write(remaining)
+            return
+        await self._queue.put(_STOP)
+        await self._writer
+        self._writer = None
+
+    def submit(self, crm_name: str, change: Dict[str, Any], tenant: str = DEFAULT_TENANT) -> None:
+        crm_name = crm_name.lower()
+        try:
+            if self._closing:
+                detail = "Webhook intake is shutting down, retry later"
+            else:
+                self._queue.put_nowait(WebhookEvent(crm_name, tenant, change))
+                detail = None
+        except asyncio.QueueFull:
+            detail = "Webhook queue is full, retry later"
+        if detail:
+            WEBHOOK_EVENTS.inc(crm=crm_name, outcome="dropped")
+            raise IntegrationError(detail=detail, status_code=503, headers={"Retry-After": "5"})
+        WEBHOOK_EVENTS.inc(crm=crm_name, outcome="accepted")
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    async def _write_batches(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            batch = []
+            event = await self._queue.get()
+            deadline = loop.time() + self.settings.flush_interval_seconds
+            while True:
+                if event is _STOP:
+                    stopping = True
+                    break
+                batch.append(event)
+                timeout = deadline - loop.time()
+                if len(batch) >= self.settings.batch_size or timeout <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            if batch:
+                await self._write(batch)
+
+    async def _write(self, batch: List[WebhookEvent]) -> None:
+        connections: Dict[tuple, List[WebhookEvent]] = {}
+        for event in batch:
+            connections.setdefault((event.crm_name, event.tenant), []).append(event)
+        for (crm_name, tenant), events in connections.items():
+            try:
+                await self._write_connection(crm_name, tenant, events)
+            except Exception:
+                # The scheduled incremental sync picks these changes up later.
+                WEBHOOK_EVENTS.inc(len(events), crm=crm_name, outcome="failed")
+                logger.exception("Storing %s webhook events from %s failed", len(events), crm_name)
+            else:
+                WEBHOOK_EVENTS.inc(len(events), crm=crm_name, outcome="stored")
+
+    async def _write_connection(
+        self, crm_name: str, tenant: str, events: List[WebhookEvent]
+    ) -> None:
+        # Latest change per contact id wins, in arrival order.
+        latest: Dict[str, Any] = {}
+        for event in events:
+            for record_id in event.change["deleted_ids"]:
+                latest.pop(record_id, None)
+                latest[record_id] = _DELETED
+            for record_id in event.change["record_ids"]:
+                latest.pop(record_id, None)
+                latest[record_id] = _FETCH
+            for record in event.change["records"]:
+                record_id = str(record.get("id"))
+                latest.pop(record_id, None)
+                latest[record_id] = record
+
+        deleted = [record_id for record_id, value in latest.items() if value is _DELETED]
+        to_fetch = [record_id for record_id, value in latest.items() if value is _FETCH]
+        records = [value for value in latest.values() if isinstance(value, dict)]
+        if to_fetch:
+            records += await self.token_manager.call_with_tokens(
+                crm_name,
+                lambda tokens: call_crm_hook(
+                    self.pm,
+                    "fetch_contacts_by_ids",
+                    crm_name,
+                    access_token=tokens["access_token"],
+                    ids=to_fetch,
+                ),
+                tenant,
+            )
+
+        stored = removed = 0
+        if records:
+            filter_contacts = get_crm_hook_caller(self.pm, "filter_contacts", crm_name)
+            contacts = filter_contacts(contacts=records)[0]
+            stored = await run_in_threadpool(
+                self.contact_store.upsert_contacts, crm_name, contacts
+            )
+        if deleted:
+            removed = await run_in_threadpool(
+                self.contact_store.delete_contacts, crm_name, deleted
+            )
+        if self.response_cache is not None and (stored or removed):
+            self.response_cache.invalidate((crm_name,))
+        logger.info(
+            "Stored %s webhook events from %s: %s upserted, %s deleted",
+            len(events), crm_name, stored, removed,
+        )
+
+
+class WebhookSubscriptions:
+    """Register and renew each connected CRM's push subscription.
+
+    Subscriptions point at ``{public_base_url}/integrations/webhooks/{crm}``
+    with a random token in the query string, which notifications must carry
+    back. A background task renews subscriptions within
+    ``renew_margin_seconds`` of expiry, re-verifies ones without an expiry
+    every ``verify_interval_seconds``, and registers missing ones for every
+    CRM with stored tokens; without a public base URL nothing is registered.
+    """
+
+    def __init__(
+        self,
+        pm: PluginManager,
+        token_manager: TokenManager,
+        store: WebhookSubscriptionStore,
+        settings: WebhookSettings,
+        crm_names: Iterable[str],
+    ):
+        self.pm = pm
+        self.token_manager = token_manager
+        self.store = store
+        self.settings = settings
+        self.crm_names = sorted(name.lower() for name in crm_names)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self.settings.public_base_url:
+            self._task = asyncio.create_task(self._maintain(), name="webhook-renewal")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _notify_url(self, crm_name: str, token: str) -> str:
+        base_url = self.settings.public_base_url.rstrip("/")
+        return f"{base_url}/integrations/webhooks/{crm_name}?{urlencode({'token': token})}"
+
+    async def subscribe(self, crm_name: str, tenant: str = DEFAULT_TENANT) -> Dict[str, Any]:
+        """Create the CRM's subscription, or renew the stored one."""
+        if not self.settings.public_base_url:
+            raise IntegrationError(
+                detail="webhooks.public_base_url is not configured", status_code=400
+            )
+        crm_name = crm_name.lower()
+        existing = await run_in_threadpool(self.store.get_subscription, crm_name, tenant)
+        token = existing["token"] if existing else secrets.token_urlsafe(24)
+        notify_url = self._notify_url(crm_name, token)
+        renewing = existing is not None and existing["notify_url"] == notify_url
+        expires_at = datetime.now(timezone.utc) + timedelta(
+            hours=self.settings.subscription_ttl_hours
+        )
+
+        subscription = await self.token_manager.call_with_tokens(
+            crm_name,
+            lambda tokens: call_crm_hook(
+                self.pm,
+                "subscribe_webhook",
+                crm_name,
+                access_token=tokens["access_token"],
+                notify_url=notify_url,
+                token=token,
+                expires_at=expires_at.isoformat(timespec="seconds"),
+                subscription_id=existing["subscription_id"] if renewing else None,
+            ),
+            tenant,
+        )
+        logger.info("%s webhook subscription for %s", "Renewed" if renewing else "Registered", crm_name)
+        return await run_in_threadpool(
+            self.store.save_subscription,
+            crm_name,
+            subscription["subscription_id"],
+            token,
+            notify_url,
+            subscription["expires_at"],
+            tenant,
+        )
+
+    async def unsubscribe(self, crm_name: str, tenant: str = DEFAULT_TENANT) -> bool:
+        crm_name = crm_name.lower()
+        existing = await run_in_threadpool(self.store.get_subscription, crm_name, tenant)
+        if existing is None:
+            return False
+        await self.token_manager.call_with_tokens(
+            crm_name,
+            lambda tokens: call_crm_hook(
+                self.pm,
+                "unsubscribe_webhook",
+                crm_name,
+                access_token=tokens["access_token"],
+                subscription_id=existing["subscription_id"],
+            ),
+            tenant,
+        )
+        return await run_in_threadpool(self.store.delete_subscription, crm_name, tenant)
+
+    def _needs_renewal(self, subscription: Optional[Dict[str, Any]]) -> bool:
+        if subscription is None:
+            return True
+        expires_at = parse_timestamp(subscription["expires_at"])
+        if expires_at is None:
+            # Subscriptions that never expire (Capsule REST hooks) are
+            # re-registered periodically, which recreates hooks removed upstream.
+            verified_at = parse_timestamp(subscription["updated_at"])
+            interval = timedelta(seconds=self.settings.verify_interval_seconds)
+            return verified_at is None or datetime.now(timezone.utc) - verified_at >= interval
+        margin = timedelta(seconds=self.settings.renew_margin_seconds)
+        return expires_at - datetime.now(timezone.utc) <= margin
+
+    async def _maintain(self) -> None:
+        while True:
+            for crm_name in self.crm_names:
+                try:
+                    if not await run_in_threadpool(
+                        self.token_manager.store.get_tokens, crm_name
+                    ):
+                        continue
+                    subscription = await run_in_threadpool(
+                        self.store.get_subscription, crm_name
+                    )
+                    if self._needs_renewal(subscription):
+                        await self.subscribe(crm_name)
+                except Exception:
+                    logger.exception("Maintaining the %s webhook subscription failed", crm_name)
+            await asyncio.sleep(self.settings.check_interval_seconds)
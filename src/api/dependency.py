@@ -1,7 +1,13 @@
-from typing import Annotated
+from typing import Annotated, Optional
 from fastapi import Depends, Request
 from pluggy import PluginManager
 
+from addons.http_client import HTTPClientRegistry
+from addons.response_cache import ResponseCache
+from addons.storage.contacts import ContactStore
+from addons.sync_scheduler import SyncScheduler
+from addons.webhooks import WebhookIngestor, WebhookSubscriptions
+from addons.token_manager import TokenManager
 from config.settings import AppSettings
 
 
@@ -13,5 +19,42 @@ def get_app_settings(request: Request) -> AppSettings:
     return request.app.state.settings
 
 
+def get_http_clients(request: Request) -> HTTPClientRegistry:
+    return request.app.state.http_clients
+
+
+def get_token_manager(request: Request) -> TokenManager:
+    return request.app.state.token_manager
+
+
+def get_contact_store(request: Request) -> ContactStore:
+    return request.app.state.contact_store
+
+
+def get_sync_scheduler(request: Request) -> SyncScheduler:
+    return request.app.state.sync_scheduler
+
+
+def get_webhook_ingestor(request: Request) -> WebhookIngestor:
+    return request.app.state.webhook_ingestor
+
+
+def get_webhook_subscriptions(request: Request) -> WebhookSubscriptions:
+    return request.app.state.webhook_subscriptions
+
+
+def get_response_cache(request: Request) -> Optional[ResponseCache]:
+    return request.app.state.response_cache
+
+
 AnnotatedPluginManager = Annotated[PluginManager, Depends(get_plugin_manager)]
 AnnotatedSettings = Annotated[AppSettings, Depends(get_app_settings)]
+AnnotatedHTTPClients = Annotated[HTTPClientRegistry, Depends(get_http_clients)]
+AnnotatedTokenManager = Annotated[TokenManager, Depends(get_token_manager)]
+AnnotatedContactStore = Annotated[ContactStore, Depends(get_contact_store)]
+AnnotatedSyncScheduler = Annotated[SyncScheduler, Depends(get_sync_scheduler)]
+AnnotatedWebhookIngestor = Annotated[WebhookIngestor, Depends(get_webhook_ingestor)]
+AnnotatedWebhookSubscriptions = Annotated[
+    WebhookSubscriptions, Depends(get_webhook_subscriptions)
+]
+AnnotatedResponseCache = Annotated[Optional[ResponseCache], Depends(get_response_cache)]
@@ -1,135 +1,278 @@
-from typing import Dict, List, Optional
+import asyncio
+import hmac
+from typing import Dict, List, Literal, Optional, Tuple
 from fastapi import APIRouter, Query, Request, HTTPException, status
-from addons.storage import (
-    get_stored_tokens,
-    save_contacts_to_json,
-    save_tokens_to_json,
-    get_state,
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from addons.integration.batching import CREATED, FAILED, UPDATED
+from addons.integration.columnar import ParquetStream, require_pyarrow
+from addons.metrics import CONTACT_WRITES, WEBHOOK_EVENTS
+from addons.response_cache import MISS
+from addons.serialization import dumps, loads
+from addons.storage import get_state
+from addons.storage.base import DEFAULT_TENANT
+from api.dependency import (
+    AnnotatedContactStore,
+    AnnotatedPluginManager,
+    AnnotatedResponseCache,
+    AnnotatedSettings,
+    AnnotatedSyncScheduler,
+    AnnotatedTokenManager,
+    AnnotatedWebhookIngestor,
+    AnnotatedWebhookSubscriptions,
 )
-from api.dependency import AnnotatedPluginManager, AnnotatedSettings
 from core.exception import (
     CRMIntegrationError,
     ContactsFetchError,
+    IntegrationError,
     InvalidPageNumberError,
     InvalidStateError,
+    InvalidWebhookError,
     OAuthError,
     TokenExchangeError,
     UnsupportedCRMError,
 )
-import os
-from addons.integration.crm_enum import CRMName  
+from addons.integration.hookspec import (
+    call_crm_hook,
+    crm_hook_callers,
+    get_crm_hook_caller,
+    iter_crm_hook,
+)
 from api.utils.logger import get_logger
+from api.utils.responses import FastJSONResponse
 
 logger = get_logger()
 
 router = APIRouter(prefix="/integrations", tags=["Integrations"])
 
-def get_plugin(crm_name: str):
-    logger.info(f"Fetching plugin for CRM: {crm_name}")
-    return CRMName.get_plugin(crm_name)
-
 @router.get("/authorization-url")
 def get_authorization_url_resource(
     pm: AnnotatedPluginManager,
     settings: AnnotatedSettings,
     crm_name: Optional[List[str]] = Query(default=None, alias="crm_name")
 ):
-    logger.info(f"Authorization URL requested for: {crm_name or 'all CRMs'}")
+    logger.info("Authorization URL requested for: %s", crm_name or "all CRMs")
     if not crm_name:
         plugin_results = pm.hook.get_auth_url(settings=settings)
     else:
-        matching_plugins = [
-            impl.plugin
-            for impl in pm.hook.get_auth_url.get_hookimpls()
-            if getattr(impl.plugin, "crm_name", None) in crm_name
-        ]
-
-        if not matching_plugins:
-            logger.warning(f"No matching CRM plugins found for: {crm_name}")
+        hook_callers = crm_hook_callers(pm)
+        if not hook_callers.supported() & {name.lower() for name in crm_name}:
+            logger.warning("No matching CRM plugins found for: %s", crm_name)
             raise UnsupportedCRMError(
-                message=f"No plugins found for integration(s): {crm_name}",
+                crm_name=", ".join(crm_name),
+                detail=f"No plugins found for integration(s): {crm_name}",
                 status_code=404,
             )
-
-        subset = pm.subset_hook_caller(
-            "get_auth_url",
-            remove_plugins=[
-                plugin for plugin in pm.get_plugins() if plugin not in matching_plugins
-            ]
-        )
-        plugin_results = subset(settings=settings)
+        plugin_results = hook_callers.caller("get_auth_url", crm_name)(settings=settings)
 
     merged_plugins: Dict[str, str] = {}
     for plugin_result in plugin_results:
         if isinstance(plugin_result, dict):
             merged_plugins.update(plugin_result)
         else:
-            logger.warning(f"Expected dict from plugin, got: {type(plugin_result)} - {plugin_result}")
+            logger.warning("Expected dict from plugin, got: %s", type(plugin_result).__name__)
 
-    logger.info(f"Successfully retrieved auth URLs: {merged_plugins}")
+    logger.info("Successfully retrieved auth URLs for: %s", ", ".join(merged_plugins))
     return merged_plugins
 
 @router.get("/callback/{crm_name}")
-def oauth_callback(crm_name: str, code: str, state: str):
-    logger.info(f"OAuth callback initiated for CRM: {crm_name}")
+async def oauth_callback(
+    crm_name: str,
+    code: str,
+    state: str,
+    pm: AnnotatedPluginManager,
+    settings: AnnotatedSettings,
+    token_manager: AnnotatedTokenManager,
+    response_cache: AnnotatedResponseCache,
+):
+    logger.info("OAuth callback initiated for CRM: %s", crm_name)
     try:
-        stored_state = get_state(crm_name)
+        stored_state = await run_in_threadpool(get_state, crm_name)
         if not stored_state or stored_state != state:
             logger.error("Invalid state parameter during OAuth callback")
             raise InvalidStateError("Invalid state parameter", 400)
 
-        plugin = get_plugin(crm_name)
-        token_response = plugin.exchange_token(code)
-        save_tokens_to_json(token_response, crm_name)
+        token_response = await call_crm_hook(
+            pm, "exchange_token", crm_name, code=code, settings=settings
+        )
+        await token_manager.save_tokens(crm_name, token_response)
+        if response_cache is not None:
+            response_cache.invalidate((crm_name.lower(),))
 
-        logger.info(f"OAuth token exchanged and saved for {crm_name}")
+        logger.info("OAuth token exchanged and saved for %s", crm_name)
         return {"status": "success", "crm": crm_name, **token_response}
     except Exception as e:
-        logger.exception(f"OAuth callback failed for {crm_name}: {e}")
+        logger.exception("OAuth callback failed for %s: %s", crm_name, e)
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/refresh-token/{crm_name}")
-def refresh_token(crm_name: str, refresh_token: str):
-    logger.info(f"Token refresh initiated for CRM: {crm_name}")
+async def refresh_token(
+    crm_name: str,
+    refresh_token: str,
+    pm: AnnotatedPluginManager,
+    settings: AnnotatedSettings,
+    token_manager: AnnotatedTokenManager,
+):
+    logger.info("Token refresh initiated for CRM: %s", crm_name)
     try:
-        plugin = get_plugin(crm_name)
-        token_response = plugin.refresh_access_token(refresh_token)
-        save_tokens_to_json(token_response, crm_name)
+        token_response = await call_crm_hook(
+            pm,
+            "refresh_access_token",
+            crm_name,
+            refresh_token=refresh_token,
+            settings=settings,
+        )
+        await token_manager.save_tokens(
+            crm_name, {"refresh_token": refresh_token, **token_response}
+        )
 
-        logger.info(f"Token refreshed successfully for {crm_name}")
+        logger.info("Token refreshed successfully for %s", crm_name)
         return {"status": "success", **token_response}
     except Exception as e:
-        logger.exception(f"Token refresh failed for {crm_name}: {e}")
+        logger.exception("Token refresh failed for %s: %s", crm_name, e)
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/contacts")
-def fetch_contacts(request: Request):
-    logger.info("Fetching contacts from CRM")
-    tokens = get_stored_tokens()
-    if not tokens:
-        logger.warning("No tokens found. Authentication required.")
-        raise OAuthError(
-            detail="Authorization required. Please authenticate with a CRM first.",
-            status_code=status.HTTP_401_UNAUTHORIZED
-        )
-
-    crm_name = tokens.get("crm_name")
-    if not crm_name:
-        logger.error("CRM name missing from stored tokens.")
-        raise CRMIntegrationError(
-            detail="Could not determine CRM from stored tokens.",
-            status_code=status.HTTP_400_BAD_REQUEST
-        )
+async def _fetch_crm_contacts(
+    crm_name: str,
+    tokens: dict,
+    page: int,
+    pm: AnnotatedPluginManager,
+    token_manager: AnnotatedTokenManager,
+    contact_store: AnnotatedContactStore,
+    response_cache: AnnotatedResponseCache,
+) -> Tuple[dict, Optional[str]]:
+    """Fetch one normalized contacts page from ``crm_name`` and store it locally.
 
-    access_token = tokens.get("access_token")
-    refresh_token = tokens.get("refresh_token")
-    if not access_token or not refresh_token:
-        logger.error("Missing access or refresh token in stored data.")
+    Returns the page and the response cache outcome (None when the cache is
+    disabled). Only the caller that downloaded a page stores it: pages served
+    from the cache or shared with a concurrent fetch are not stored again.
+    """
+    if not tokens.get("access_token") or not tokens.get("refresh_token"):
+        logger.error("Missing access or refresh token in stored data for %s.", crm_name)
         raise TokenExchangeError(
             detail="Invalid token format. Missing required tokens.",
             status_code=status.HTTP_400_BAD_REQUEST
         )
 
+    async def load_contacts_page(validators: Optional[dict]) -> dict:
+        async def get_contacts_page(tokens: dict) -> dict:
+            return await call_crm_hook(
+                pm,
+                "get_contacts",
+                crm_name.lower(),
+                access_token=tokens["access_token"],
+                page=page,
+                validators=validators,
+            )
+
+        try:
+            return await token_manager.call_with_tokens(crm_name, get_contacts_page)
+        except UnsupportedCRMError:
+            logger.exception("No plugin registered for %s", crm_name)
+            raise
+        except Exception as e:
+            logger.exception("Error fetching contacts from %s", crm_name)
+            raise ContactsFetchError(
+                detail=f"Failed to fetch contacts from {crm_name}: {str(e)}",
+                crm_name=crm_name,
+                page=page
+            )
+
+    if response_cache is None:
+        contacts, cache_status = await load_contacts_page(None), None
+    else:
+        contacts, cache_status = await response_cache.fetch(
+            (crm_name.lower(), DEFAULT_TENANT, page), load_contacts_page
+        )
+        logger.info("Contacts page %s for %s: cache %s", page, crm_name, cache_status)
+
+    if cache_status in (None, MISS):
+        saved = await run_in_threadpool(
+            contact_store.upsert_contacts, crm_name, contacts.get("data", [])
+        )
+        logger.info("Saved %s %s contacts to the local contact store", saved, crm_name)
+    return contacts, cache_status
+
+
+async def _fetch_contacts_from_crms(
+    crm_names: List[str],
+    page: int,
+    pm: AnnotatedPluginManager,
+    token_manager: AnnotatedTokenManager,
+    contact_store: AnnotatedContactStore,
+    response_cache: AnnotatedResponseCache,
+) -> dict:
+    """Query every requested CRM concurrently and merge their contacts pages."""
+    supported = crm_hook_callers(pm).supported()
+    unsupported = [name for name in crm_names if name not in supported]
+    if unsupported:
+        logger.warning("No matching CRM plugins found for: %s", unsupported)
+        raise UnsupportedCRMError(
+            crm_name=", ".join(unsupported),
+            detail=f"No plugins found for integration(s): {unsupported}",
+            status_code=404,
+        )
+
+    async def fetch_one(crm_name: str) -> Tuple[dict, Optional[str]]:
+        tokens = await token_manager.get_tokens(crm_name)
+        if not tokens:
+            raise OAuthError(
+                detail=f"Authorization required. Please authenticate with {crm_name} first.",
+                status_code=status.HTTP_401_UNAUTHORIZED
+            )
+        return await _fetch_crm_contacts(
+            crm_name, tokens, page, pm, token_manager, contact_store, response_cache
+        )
+
+    results = await asyncio.gather(
+        *(fetch_one(crm_name) for crm_name in crm_names), return_exceptions=True
+    )
+
+    merged: List[dict] = []
+    per_crm: Dict[str, dict] = {}
+    errors = []
+    for crm_name, result in zip(crm_names, results):
+        if isinstance(result, Exception):
+            errors.append(result)
+            per_crm[crm_name] = {
+                "status": "error",
+                "detail": getattr(result, "detail", str(result)),
+            }
+            continue
+        result, cache_status = result
+        contacts = result.get("data", [])
+        merged.extend({"crm": crm_name, **contact} for contact in contacts)
+        per_crm[crm_name] = {
+            "status": "success",
+            "count": len(contacts),
+            "pagination": {
+                "page": result.get("page", page),
+                "total": result.get("total", 0),
+            },
+        }
+        if cache_status:
+            per_crm[crm_name]["cache"] = cache_status
+
+    if len(errors) == len(crm_names):
+        raise errors[0]
+
+    return {
+        "status": "partial" if errors else "success",
+        "crms": per_crm,
+        "contacts": merged,
+        "message": f"Contacts fetched from {len(crm_names) - len(errors)} of {len(crm_names)} CRMs and saved to the local contact store"
+    }
+
+
+@router.get("/contacts")
+async def fetch_contacts(
+    request: Request,
+    pm: AnnotatedPluginManager,
+    token_manager: AnnotatedTokenManager,
+    contact_store: AnnotatedContactStore,
+    response_cache: AnnotatedResponseCache,
+    crm_name: Optional[List[str]] = Query(default=None, alias="crm_name"),
+):
     try:
         page = int(request.query_params.get("page", 1))
         if page < 1:
@@ -139,29 +282,35 @@ def fetch_contacts(request: Request):
         logger.error("Page parameter is not a valid integer.")
         raise InvalidPageNumberError()
 
-    try:
-        plugin = get_plugin(crm_name.lower())
-    except Exception as e:
-        logger.exception(f"Plugin initialization failed for {crm_name}")
-        raise UnsupportedCRMError(
-            crm_name=crm_name,
-            detail=f"Failed to initialize CRM plugin: {str(e)}"
+    if crm_name:
+        crm_names = list(dict.fromkeys(name.lower() for name in crm_name))
+        logger.info("Fetching contacts from CRMs: %s", crm_names)
+        return FastJSONResponse(
+            await _fetch_contacts_from_crms(
+                crm_names, page, pm, token_manager, contact_store, response_cache
+            )
         )
 
-    try:
-        contacts = plugin.get_contacts(
-            access_token=access_token,
-            refresh_token=refresh_token,
-            page=page
+    logger.info("Fetching contacts from CRM")
+    tokens = await token_manager.get_tokens()
+    if not tokens:
+        logger.warning("No tokens found. Authentication required.")
+        raise OAuthError(
+            detail="Authorization required. Please authenticate with a CRM first.",
+            status_code=status.HTTP_401_UNAUTHORIZED
         )
-    except Exception as e:
-        logger.exception(f"Error fetching contacts from {crm_name}")
-        raise ContactsFetchError(
-            detail=f"Failed to fetch contacts from {crm_name}: {str(e)}",
-            crm_name=crm_name,
-            page=page
+
+    crm_name = tokens.get("crm_name")
+    if not crm_name:
+        logger.error("CRM name missing from stored tokens.")
+        raise CRMIntegrationError(
+            detail="Could not determine CRM from stored tokens.",
+            status_code=status.HTTP_400_BAD_REQUEST
         )
 
+    contacts, cache_status = await _fetch_crm_contacts(
+        crm_name, tokens, page, pm, token_manager, contact_store, response_cache
+    )
     response_data = {
         "status": "success",
         "crm": crm_name.lower(),
@@ -170,11 +319,405 @@ def fetch_contacts(request: Request):
             "page": contacts.get("page", 1),
             "total": contacts.get("total", 0)
         },
-        "message": f"Contacts fetched from {crm_name} CRM"
+        "message": f"Contacts fetched from {crm_name} CRM and saved to the local contact store"
+    }
+    headers = {"X-Cache": cache_status.upper()} if cache_status else None
+    return FastJSONResponse(response_data, headers=headers)
+
+
+@router.get("/contacts/cache")
+def contacts_cache_stats(response_cache: AnnotatedResponseCache):
+    if response_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **response_cache.stats()}
+
+
+@router.delete("/contacts/cache")
+def clear_contacts_cache(
+    response_cache: AnnotatedResponseCache, crm_name: Optional[str] = None
+):
+    if response_cache is None:
+        return {"enabled": False, "removed": 0}
+    prefix = (crm_name.lower(),) if crm_name else ()
+    removed = response_cache.invalidate(prefix)
+    logger.info("Dropped %s cached contact pages for %s", removed, crm_name or "all CRMs")
+    return {"enabled": True, "removed": removed}
+
+
+@router.get("/contacts/local")
+async def search_local_contacts(
+    contact_store: AnnotatedContactStore,
+    crm_name: Optional[str] = None,
+    email: Optional[str] = None,
+    phone: Optional[str] = None,
+    company: Optional[str] = None,
+    page: int = Query(default=1, ge=1),
+    per_page: int = Query(default=50, ge=1, le=500),
+):
+    logger.info("Local contact lookup for crm=%s page=%s", crm_name, page)
+    contacts, total = await run_in_threadpool(
+        contact_store.query,
+        crm=crm_name,
+        email=email,
+        phone=phone,
+        company=company,
+        page=page,
+        per_page=per_page,
+    )
+    return FastJSONResponse(
+        {
+            "status": "success",
+            "contacts": contacts,
+            "pagination": {"page": page, "per_page": per_page, "total": total},
+        }
+    )
+
+
+@router.get("/contacts/export")
+async def export_contacts(
+    pm: AnnotatedPluginManager,
+    token_manager: AnnotatedTokenManager,
+    crm_name: Optional[str] = None,
+    per_page: Optional[int] = Query(default=None, ge=1),
+    bulk: bool = False,
+    export_format: Literal["ndjson", "parquet"] = Query(default="ndjson", alias="format"),
+):
+    logger.info("Contact export requested for: %s", crm_name or "latest CRM")
+    columnar = export_format == "parquet"
+    if columnar:
+        try:
+            require_pyarrow()
+        except RuntimeError as e:
+            raise IntegrationError(detail=str(e), status_code=status.HTTP_400_BAD_REQUEST)
+    tokens = await token_manager.get_tokens(crm_name)
+    if not tokens:
+        logger.warning("No tokens found. Authentication required.")
+        raise OAuthError(
+            detail="Authorization required. Please authenticate with a CRM first.",
+            status_code=status.HTTP_401_UNAUTHORIZED
+        )
+    crm_name = tokens["crm_name"]
+
+    async def with_tokens(call):
+        return await token_manager.call_with_tokens(crm_name, call)
+
+    if bulk:
+        if not get_crm_hook_caller(pm, "iter_contacts_bulk", crm_name).get_hookimpls():
+            raise IntegrationError(
+                detail=f"Bulk export is not supported for {crm_name}",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+        pages = iter_crm_hook(
+            pm,
+            "iter_contacts_bulk",
+            crm_name,
+            with_tokens=with_tokens,
+            modified_since=None,
+            columnar=columnar,
+        )
+    else:
+        pages = iter_crm_hook(
+            pm,
+            "iter_contacts",
+            crm_name,
+            with_tokens=with_tokens,
+            per_page=per_page,
+            modified_since=None,
+            start_page=1,
+            columnar=columnar,
+        )
+
+    async def ndjson_lines():
+        exported = 0
+        try:
+            async for contacts in pages:
+                exported += len(contacts)
+                yield b"".join(dumps(contact) + b"\n" for contact in contacts)
+        except Exception as e:
+            logger.exception("Contact export from %s failed after %s records", crm_name, exported)
+            yield dumps({"status": "error", "crm": crm_name, "detail": str(e)}) + b"\n"
+            return
+        logger.info("Exported %s contacts from %s", exported, crm_name)
+
+    async def parquet_chunks():
+        # Pages arrive as ContactColumns and are written as row groups, so no
+        # dict is built per contact and the file is never held whole.
+        exported = 0
+        stream = ParquetStream()
+        try:
+            async for batch in pages:
+                exported += len(batch)
+                chunk = await run_in_threadpool(stream.write, batch)
+                if chunk:
+                    yield chunk
+            yield stream.close()
+        except Exception:
+            # Parquet has no room for an error record; the aborted response
+            # leaves the client a file without its footer.
+            logger.exception("Contact export from %s failed after %s records", crm_name, exported)
+            raise
+        logger.info("Exported %s contacts from %s as Parquet", exported, crm_name)
+
+    if columnar:
+        return StreamingResponse(
+            parquet_chunks(),
+            media_type="application/vnd.apache.parquet",
+            headers={"Content-Disposition": f'attachment; filename="{crm_name}-contacts.parquet"'},
+        )
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
+@router.post("/contacts/{crm_name}/upsert")
+async def upsert_crm_contacts(
+    crm_name: str,
+    request: Request,
+    pm: AnnotatedPluginManager,
+    token_manager: AnnotatedTokenManager,
+    response_cache: AnnotatedResponseCache,
+):
+    """Create or update contacts in a CRM and return one result per contact.
+
+    The call returns once every contact is written, taking about
+    ``len(contacts) / (MAX_UPSERT_BATCH * write_concurrency)`` upstream round
+    trips. Capsule has no batch write endpoint, so each contact is its own
+    request: 500 contacts at the default ``write_concurrency`` of 4 take
+    about 8 s. Bodies needing more than ``http.max_write_requests`` write
+    requests (50 Capsule or 5000 Zoho contacts by default) are rejected with
+    413 and should be split by the caller.
+    """
+    crm_name = crm_name.lower()
+    if crm_name not in crm_hook_callers(pm).supported():
+        raise UnsupportedCRMError(crm_name=crm_name, status_code=404)
+    try:
+        payload = loads(await request.body())
+    except ValueError:
+        payload = None
+    contacts = payload.get("contacts") if isinstance(payload, dict) else payload
+    if not isinstance(contacts, list) or not all(isinstance(c, dict) for c in contacts):
+        raise IntegrationError(
+            detail='Body must be a list of contacts or {"contacts": [...]}',
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+    plugin = crm_hook_callers(pm).plugin(crm_name)
+    max_contacts = plugin.crm_settings.http.max_write_requests * plugin.MAX_UPSERT_BATCH
+    if len(contacts) > max_contacts:
+        raise IntegrationError(
+            detail=(
+                f"{crm_name} accepts at most {max_contacts} contacts per upsert "
+                f"({plugin.MAX_UPSERT_BATCH} per write request); split the request"
+            ),
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        )
+    if not await token_manager.get_tokens(crm_name):
+        raise OAuthError(
+            detail=f"Authorization required. Please authenticate with {crm_name} first.",
+            status_code=status.HTTP_401_UNAUTHORIZED,
+        )
+    logger.info("Writing %s contacts to %s", len(contacts), crm_name)
+
+    async def with_tokens(call):
+        return await token_manager.call_with_tokens(crm_name, call)
+
+    results = await call_crm_hook(
+        pm, "upsert_contacts", crm_name, with_tokens=with_tokens, contacts=contacts
+    )
+    counts = {CREATED: 0, UPDATED: 0, FAILED: 0}
+    for result in results:
+        counts[result["status"]] += 1
+    for outcome, count in counts.items():
+        if count:
+            CONTACT_WRITES.inc(count, crm=crm_name, outcome=outcome)
+    if response_cache is not None and counts[CREATED] + counts[UPDATED]:
+        response_cache.invalidate((crm_name,))
+    logger.info(
+        "Wrote contacts to %s: %s created, %s updated, %s failed",
+        crm_name, counts[CREATED], counts[UPDATED], counts[FAILED],
+    )
+    return FastJSONResponse(
+        {
+            "status": "success" if not counts[FAILED] else "partial",
+            "crm": crm_name,
+            "total": len(results),
+            **counts,
+            "results": results,
+        }
+    )
+
+
+@router.post("/sync/{crm_name}", status_code=status.HTTP_202_ACCEPTED)
+async def sync_crm_contacts(
+    crm_name: str,
+    pm: AnnotatedPluginManager,
+    sync_scheduler: AnnotatedSyncScheduler,
+    full: bool = False,
+):
+    logger.info("%s contact sync requested for %s", "Full" if full else "Incremental", crm_name)
+    if crm_name.lower() not in crm_hook_callers(pm).supported():
+        raise UnsupportedCRMError(crm_name=crm_name, status_code=404)
+    job = await sync_scheduler.enqueue(crm_name, full=full)
+    return {"status": job["status"], "job": job}
+
+
+@router.get("/sync")
+async def list_sync_jobs(
+    sync_scheduler: AnnotatedSyncScheduler,
+    crm_name: Optional[str] = None,
+    job_status: Optional[str] = Query(default=None, alias="status"),
+    limit: int = Query(default=50, ge=1, le=500),
+):
+    jobs = await run_in_threadpool(
+        sync_scheduler.job_store.list_jobs, crm_name, job_status, limit
+    )
+    return {"jobs": jobs}
+
+
+@router.get("/sync/jobs/{job_id}")
+async def get_sync_job(job_id: str, sync_scheduler: AnnotatedSyncScheduler):
+    job = await run_in_threadpool(sync_scheduler.job_store.get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Sync job {job_id} not found")
+    return job
+
+
+def _public_subscription(subscription: dict) -> dict:
+    return {
+        key: value
+        for key, value in subscription.items()
+        if key not in ("token", "notify_url")
+    }
+
+
+@router.post("/webhooks/{crm_name}", status_code=status.HTTP_202_ACCEPTED)
+async def receive_webhook(
+    crm_name: str,
+    request: Request,
+    pm: AnnotatedPluginManager,
+    webhook_ingestor: AnnotatedWebhookIngestor,
+    webhook_subscriptions: AnnotatedWebhookSubscriptions,
+    token: Optional[str] = None,
+):
+    crm_name = crm_name.lower()
+    if crm_name not in crm_hook_callers(pm).supported():
+        raise UnsupportedCRMError(crm_name=crm_name, status_code=404)
+    try:
+        payload = loads(await request.body())
+    except ValueError:
+        payload = None
+    try:
+        if not isinstance(payload, dict):
+            raise InvalidWebhookError("Webhook body must be a JSON object")
+        # The token is checked before the body reaches the plugin parser. It
+        # comes from the notify URL's query string, or the body for CRMs
+        # that echo it there.
+        subscription = await run_in_threadpool(
+            webhook_subscriptions.store.get_subscription, crm_name
+        )
+        presented = token if token is not None else payload.get("token")
+        if (
+            subscription is None
+            or not isinstance(presented, str)
+            or not hmac.compare_digest(presented.encode(), subscription["token"].encode())
+        ):
+            raise InvalidWebhookError("Invalid webhook token", status_code=401)
+        change = get_crm_hook_caller(pm, "parse_webhook", crm_name)(
+            crm_name=crm_name, payload=payload
+        )[0]
+    except InvalidWebhookError:
+        WEBHOOK_EVENTS.inc(crm=crm_name, outcome="rejected")
+        raise
+
+    webhook_ingestor.submit(crm_name, change)
+    return {"status": "accepted"}
+
+
+@router.get("/webhooks/subscriptions")
+async def list_webhook_subscriptions(
+    webhook_ingestor: AnnotatedWebhookIngestor,
+    webhook_subscriptions: AnnotatedWebhookSubscriptions,
+):
+    subscriptions = await run_in_threadpool(webhook_subscriptions.store.list_subscriptions)
+    return {
+        "subscriptions": [_public_subscription(item) for item in subscriptions],
+        "pending_events": webhook_ingestor.pending(),
     }
 
-    filepath = save_contacts_to_json(response_data, crm_name=crm_name)
-    logger.info(f"Contacts saved to file: {filepath}")
 
-    response_data["message"] = f"Contacts fetched from {crm_name} CRM and saved to {os.path.basename(filepath)}"
-    return response_data
+@router.post("/webhooks/{crm_name}/subscription")
+async def subscribe_webhook(
+    crm_name: str,
+    pm: AnnotatedPluginManager,
+    webhook_subscriptions: AnnotatedWebhookSubscriptions,
+):
+    if crm_name.lower() not in crm_hook_callers(pm).supported():
+        raise UnsupportedCRMError(crm_name=crm_name, status_code=404)
+    logger.info("Webhook subscription requested for %s", crm_name)
+    subscription = await webhook_subscriptions.subscribe(crm_name)
+    return {"status": "success", "subscription": _public_subscription(subscription)}
+
+
+@router.delete("/webhooks/{crm_name}/subscription")
+async def unsubscribe_webhook(
+    crm_name: str,
+    webhook_subscriptions: AnnotatedWebhookSubscriptions,
+):
+    removed = await webhook_subscriptions.unsubscribe(crm_name)
+    return {"status": "success", "removed": removed}
+
+
+def _identity_index(contact_store):
+    if contact_store.identity is None:
+        raise IntegrationError(detail="Identity resolution is disabled", status_code=404)
+    return contact_store.identity
+
+
+@router.get("/contacts/golden")
+async def search_golden_contacts(
+    contact_store: AnnotatedContactStore,
+    email: Optional[str] = None,
+    phone: Optional[str] = None,
+    crm_name: Optional[str] = None,
+    contact_id: Optional[str] = None,
+    min_sources: int = Query(default=1, ge=1),
+    page: int = Query(default=1, ge=1),
+    per_page: int = Query(default=50, ge=1, le=500),
+):
+    identity = _identity_index(contact_store)
+    if email or phone or (crm_name and contact_id):
+        contacts = await run_in_threadpool(
+            identity.find_golden, email, phone, crm_name, contact_id
+        )
+        total = len(contacts)
+    else:
+        contacts, total = await run_in_threadpool(
+            identity.list_golden, page, per_page, min_sources
+        )
+    return FastJSONResponse(
+        {
+            "status": "success",
+            "contacts": contacts,
+            "pagination": {"page": page, "per_page": per_page, "total": total},
+        }
+    )
+
+
+@router.get("/contacts/golden/stats")
+async def golden_contacts_stats(contact_store: AnnotatedContactStore):
+    identity = _identity_index(contact_store)
+    return await run_in_threadpool(identity.stats)
+
+
+@router.get("/contacts/golden/{cluster_id}")
+async def get_golden_contact(cluster_id: str, contact_store: AnnotatedContactStore):
+    golden = await run_in_threadpool(_identity_index(contact_store).get_golden, cluster_id)
+    if golden is None:
+        raise HTTPException(status_code=404, detail=f"Golden contact {cluster_id} not found")
+    return golden
+
+
+@router.post("/contacts/golden/rebuild")
+async def rebuild_golden_contacts(contact_store: AnnotatedContactStore):
+    identity = _identity_index(contact_store)
+    logger.info("Identity index rebuild requested")
+    summary = await run_in_threadpool(identity.rebuild)
+    logger.info("Identity index rebuilt: %s", summary)
+    return {"status": "success", **summary}
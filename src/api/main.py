@@ -1,35 +1,142 @@
 from contextlib import asynccontextmanager
+from datetime import timedelta
 from fastapi import FastAPI
 
-from core.middleware import ExceptionHandlerMiddleware
-from api.entrypoints import routes
+from core.handlers import register_exception_handlers
+from api.entrypoints import metrics, routes
 from api.entrypoints.routes import router as callback_router
+from api.utils.responses import FastJSONResponse
 
 from config.settings import AppSettings
-from addons.integration.hookspec import get_plugin_manager
+from addons.integration.hookspec import call_crm_hook, get_plugin_manager
+from addons.http_client import HTTPClientRegistry
+from addons.identity import IdentityLinker
+from addons.metrics import monitor_hooks
+from addons.response_cache import ResponseCache
+from addons.storage import create_token_store, set_token_store
+from addons.storage.contacts import ContactStore
+from addons.storage.sync_jobs import SyncJobStore
+from addons.storage.webhooks import WebhookSubscriptionStore
+from addons.sync_scheduler import SyncScheduler
+from addons.webhooks import WebhookIngestor, WebhookSubscriptions
+from addons.token_manager import TokenManager
 from config import settings
+from api.utils.logger import get_logger, start_log_listener, stop_log_listener
+
+logger = get_logger()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print("Starting up...")
+    start_log_listener()
+    logger.info("Starting up...")
 
     app.state.settings = AppSettings()
+    app.state.token_store = create_token_store(app.state.settings.storage)
+    set_token_store(app.state.token_store)
+    app.state.contact_store = ContactStore(
+        app.state.settings.storage.contacts_path, app.state.settings.identity
+    )
+    app.state.identity_linker = None
+    if app.state.contact_store.identity is not None:
+        app.state.identity_linker = IdentityLinker(
+            app.state.contact_store.identity, app.state.settings.identity
+        )
+        app.state.identity_linker.start()
     app.state.plugin_manager = get_plugin_manager()
+    monitor_hooks(app.state.plugin_manager)
+    app.state.http_clients = HTTPClientRegistry(app.state.settings)
+    cache_settings = app.state.settings.response_cache
+    app.state.response_cache = (
+        ResponseCache(
+            ttl=cache_settings.ttl_seconds,
+            max_entries=cache_settings.max_entries,
+            max_bytes=cache_settings.max_bytes,
+        )
+        if cache_settings.enabled
+        else None
+    )
+
+    for plugin in app.state.plugin_manager.get_plugins():
+        http_client = app.state.http_clients.for_crm(plugin.crm_name)
+        http_client.warm(plugin.api_base_url, plugin.crm_settings.config.token_url)
+        plugin.bind_http_client(http_client)
+
+    async def refresh_tokens(crm_name: str, refresh_token: str) -> dict:
+        return await call_crm_hook(
+            app.state.plugin_manager,
+            "refresh_access_token",
+            crm_name,
+            refresh_token=refresh_token,
+            settings=app.state.settings,
+        )
+
+    auth_settings = app.state.settings.auth
+    app.state.token_manager = TokenManager(
+        app.state.token_store,
+        refresh_tokens,
+        refresh_margin=timedelta(seconds=auth_settings.refresh_margin_seconds),
+        cache_ttl=timedelta(seconds=auth_settings.cache_ttl_seconds),
+    )
+
+    app.state.sync_job_store = SyncJobStore(app.state.settings.storage.sync_jobs_path)
+    app.state.sync_scheduler = SyncScheduler(
+        app.state.plugin_manager,
+        app.state.token_manager,
+        app.state.contact_store,
+        app.state.sync_job_store,
+        app.state.settings.sync,
+        [plugin.crm_name for plugin in app.state.plugin_manager.get_plugins()],
+    )
+    await app.state.sync_scheduler.start()
+
+    app.state.webhook_ingestor = WebhookIngestor(
+        app.state.plugin_manager,
+        app.state.token_manager,
+        app.state.contact_store,
+        app.state.settings.webhooks,
+        app.state.response_cache,
+    )
+    app.state.webhook_ingestor.start()
+    app.state.webhook_store = WebhookSubscriptionStore(app.state.settings.storage.webhooks_path)
+    app.state.webhook_subscriptions = WebhookSubscriptions(
+        app.state.plugin_manager,
+        app.state.token_manager,
+        app.state.webhook_store,
+        app.state.settings.webhooks,
+        [plugin.crm_name for plugin in app.state.plugin_manager.get_plugins()],
+    )
+    app.state.webhook_subscriptions.start()
 
-    print("Settings loaded:", app.state.settings)
+    logger.info(
+        "Settings loaded: crms=%s storage=%s",
+        ", ".join(app.state.settings.crms),
+        app.state.settings.storage.backend,
+    )
     yield
 
-    print("Shutting down...")
+    logger.info("Shutting down...")
+    await app.state.webhook_subscriptions.stop()
+    await app.state.webhook_ingestor.stop()
+    await app.state.sync_scheduler.stop()
+    if app.state.identity_linker is not None:
+        await app.state.identity_linker.stop()
+    await app.state.http_clients.aclose()
+    app.state.token_store.close()
+    app.state.contact_store.close()
+    app.state.sync_job_store.close()
+    app.state.webhook_store.close()
+    stop_log_listener()
 
 
 def init_app() -> FastAPI:
-    app = FastAPI(lifespan=lifespan)
+    app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
-    app.add_middleware(ExceptionHandlerMiddleware)
+    register_exception_handlers(app)
 
     app.include_router(routes.router)
     app.include_router(callback_router)
+    app.include_router(metrics.router)
 
     return app
 
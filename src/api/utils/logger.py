@@ -1,29 +1,135 @@
+import atexit
+import copy
+import datetime
+import decimal
+import json
 import logging
-from logging.handlers import RotatingFileHandler
 import os
+import queue
+import threading
+import uuid
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+log_folder = os.getenv("LOG_DIR", "app_log")
+log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+log_format = os.getenv("LOG_FORMAT", "json").lower()
+log_max_bytes = int(os.getenv("LOG_MAX_BYTES", 10 * 1024 * 1024))
+log_backup_count = int(os.getenv("LOG_BACKUP_COUNT", 5))
 
-log_folder = "app_log"
 if not os.path.exists(log_folder):
     os.makedirs(log_folder)
 
 log_file_path = os.path.join(log_folder, "app.log")
 
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+# Argument types whose rendering cannot change after the log call.
+_IMMUTABLE_ARGS = (
+    str, bytes, int, float, complex, bool, type(None),
+    decimal.Decimal, datetime.date, datetime.time, datetime.timedelta, uuid.UUID,
+)
+
+
+def _immutable(value) -> bool:
+    if isinstance(value, (tuple, frozenset)):
+        return all(_immutable(item) for item in value)
+    return isinstance(value, _IMMUTABLE_ARGS)
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line; ``extra=`` fields are emitted as top-level keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """Enqueue records without formatting them on the caller's thread.
+
+    The stock handler renders the message before enqueueing; here messages
+    whose ``%`` args are all immutable values, and tracebacks, are rendered
+    by the listener thread, so such a log call costs a record copy and a
+    queue put. Any other args (lists, dicts, arbitrary objects) are rendered
+    immediately, so the log shows their state at the time of the call.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        if record.args and not (
+            isinstance(record.args, tuple) and _immutable(record.args)
+        ):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+text_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+file_formatter = JSONFormatter() if log_format == "json" else text_formatter
 
 ch = logging.StreamHandler()
-ch.setLevel(logging.INFO)
+ch.setFormatter(text_formatter)
+
+file_handler = RotatingFileHandler(
+    log_file_path, maxBytes=log_max_bytes, backupCount=log_backup_count, delay=True
+)
+file_handler.setFormatter(file_formatter)
 
-formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-ch.setFormatter(formatter)
+log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+queue_handler = DeferredQueueHandler(log_queue)
+listener = QueueListener(log_queue, ch, file_handler, respect_handler_level=True)
+_listener_lock = threading.Lock()
+_listening = False
 
+logger = logging.getLogger(__name__)
+logger.setLevel(log_level)
 logger.addHandler(ch)
+logger.addHandler(file_handler)
 
-file_handler = RotatingFileHandler(log_file_path, maxBytes=1000, backupCount=6)
-file_handler.setLevel(logging.INFO)
-file_handler.setFormatter(formatter)
 
-logger.addHandler(file_handler)
+def start_log_listener() -> None:
+    """Hand records to the background listener thread instead of writing them inline.
+
+    Until this is called (and again after ``stop_log_listener``) records are
+    written by the calling thread, so imports, scripts and tests need no
+    listener.
+    """
+    global _listening
+    with _listener_lock:
+        if _listening:
+            return
+        listener.start()
+        logger.addHandler(queue_handler)
+        logger.removeHandler(ch)
+        logger.removeHandler(file_handler)
+        _listening = True
+
+
+def stop_log_listener() -> None:
+    """Write records inline again and flush the ones still queued."""
+    global _listening
+    with _listener_lock:
+        if not _listening:
+            return
+        logger.addHandler(ch)
+        logger.addHandler(file_handler)
+        logger.removeHandler(queue_handler)
+        listener.stop()
+        _listening = False
+
+
+# Backstop for processes that exit without running the app's shutdown.
+atexit.register(stop_log_listener)
 
 
 def get_logger():
@@ -0,0 +1,16 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from addons.serialization import dumps
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson/msgspec when installed.
+
+    Route handlers returning large payloads should return this directly:
+    FastAPI then skips ``jsonable_encoder``, which walks every value.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from pydantic_settings import BaseSettings
 
@@ -11,14 +11,121 @@ class CRMOAuthConfig(BaseModel):
     redirect_path: str
 
 
+class CRMHTTPConfig(BaseModel):
+    """Connection pool settings for the shared per-CRM HTTP clients."""
+
+    api_base_url: Optional[str] = None
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = True
+    timeout: float = 30.0
+    connect_timeout: float = 10.0
+    page_concurrency: int = 4
+    write_concurrency: int = 4
+    # Upstream write requests one upsert call may take; larger bodies get 413.
+    max_write_requests: int = Field(default=50, ge=1)
+    bulk_poll_seconds: float = 5.0
+    bulk_timeout_seconds: float = 3600.0
+
+
+class CRMRateLimitConfig(BaseModel):
+    """Client-side request budget and retry policy for one CRM connection."""
+
+    requests_per_second: float = Field(default=10.0, gt=0)
+    burst: int = Field(default=20, ge=1)
+    max_retries: int = Field(default=5, ge=0)
+    backoff_base: float = Field(default=0.5, ge=0)
+    backoff_max: float = Field(default=30.0, ge=0)
+    retry_statuses: List[int] = [429, 500, 502, 503, 504]
+
+
 class CRMSettings(BaseModel):
     client_id: str
     client_secret: str
     config: CRMOAuthConfig
+    http: CRMHTTPConfig = Field(default_factory=CRMHTTPConfig)
+    rate_limit: CRMRateLimitConfig = Field(default_factory=CRMRateLimitConfig)
+
+
+class StorageSettings(BaseModel):
+    """Token/state store selection; ``json`` is intended for local development.
+
+    With ``sqlite``, tokens and sync cursors found in ``token_file_path`` and
+    ``cursor_file_path`` are imported once on the first start.
+    """
+
+    backend: str = "sqlite"
+    sqlite_path: str = "crmintegration.db"
+    token_file_path: str = "tokens.json"
+    state_file_path: str = "states.json"
+    cursor_file_path: str = "sync_cursors.json"
+    contacts_path: str = "contacts.db"
+    sync_jobs_path: str = "sync_jobs.db"
+    webhooks_path: str = "webhooks.db"
+    state_ttl_minutes: int = 10
+
+
+class AuthSettings(BaseModel):
+    """In-process token cache and refresh-ahead behaviour."""
+
+    refresh_margin_seconds: int = 300
+    cache_ttl_seconds: int = 60
+
+
+class ResponseCacheSettings(BaseModel):
+    """Optional cache of upstream contact pages, keyed by CRM, connection and page."""
+
+    enabled: bool = False
+    ttl_seconds: float = 60.0
+    max_entries: int = 256
+    max_bytes: int = 32 * 1024 * 1024
+
+
+class SyncSettings(BaseModel):
+    """Background contact sync workers and schedule; an interval of 0 disables it."""
+
+    workers: int = 2
+    incremental_interval_seconds: float = 900.0
+    full_interval_seconds: float = 86400.0
+    tick_seconds: float = 30.0
+    max_attempts: int = 3
+    lease_seconds: float = Field(default=300.0, gt=0)
+
+
+class WebhookSettings(BaseModel):
+    """Push notifications; subscriptions are only registered with a public base URL."""
+
+    public_base_url: Optional[str] = None
+    subscription_ttl_hours: float = 24.0
+    renew_margin_seconds: float = 3600.0
+    verify_interval_seconds: float = 21600.0
+    check_interval_seconds: float = 300.0
+    queue_size: int = 10000
+    batch_size: int = 500
+    flush_interval_seconds: float = 1.0
+
+
+class IdentitySettings(BaseModel):
+    """Cross-CRM contact linking; ``default_country_code`` applies to numbers without one."""
+
+    enabled: bool = False
+    default_country_code: str = "1"
+    max_block_size: int = 50
+    rebuild_chunk_size: int = 5000
+    link_batch_size: int = 2000
+    link_interval_seconds: float = 1.0
+    rebuild_lease_seconds: float = 300.0
 
 
 class AppSettings(BaseSettings):
     crms: Dict[str, CRMSettings] = Field(..., alias="CRMS")
+    storage: StorageSettings = Field(default_factory=StorageSettings)
+    auth: AuthSettings = Field(default_factory=AuthSettings)
+    response_cache: ResponseCacheSettings = Field(default_factory=ResponseCacheSettings)
+    sync: SyncSettings = Field(default_factory=SyncSettings)
+    webhooks: WebhookSettings = Field(default_factory=WebhookSettings)
+    identity: IdentitySettings = Field(default_factory=IdentitySettings)
 
     class Config:
         env_file = ".env"
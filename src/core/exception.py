@@ -38,6 +38,18 @@ class TokenRefreshError(OAuthError):
         super().__init__(detail=detail, status_code=status_code, **kwargs)
 
 
+class TokenExpiredError(OAuthError):
+    """The CRM rejected the access token (HTTP 401)"""
+
+    def __init__(
+        self,
+        detail: str = "Access token expired or revoked",
+        status_code: int = status.HTTP_401_UNAUTHORIZED,
+        **kwargs,
+    ) -> None:
+        super().__init__(detail=detail, status_code=status_code, **kwargs)
+
+
 class InvalidStateError(OAuthError):
     def __init__(
         self,
@@ -128,3 +140,15 @@ class ContactsFetchError(CRMIntegrationError):
         **kwargs,
     ) -> None:
         super().__init__(detail=detail, status_code=status_code, **kwargs)
+
+
+class InvalidWebhookError(IntegrationError):
+    """Webhook payload or verification token rejected"""
+
+    def __init__(
+        self,
+        detail: str = "Invalid webhook payload",
+        status_code: int = status.HTTP_400_BAD_REQUEST,
+        **kwargs,
+    ) -> None:
+        super().__init__(detail=detail, status_code=status_code, **kwargs)
@@ -0,0 +1,48 @@
+from fastapi import FastAPI, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from starlette.responses import JSONResponse
+
+from core.exception import IntegrationError
+from api.utils.logger import get_logger
+
+logger = get_logger()
+
+
+async def integration_error_handler(request: Request, exc: IntegrationError):
+    logger.warning("%s on %s: %s", type(exc).__name__, request.url.path, exc.detail)
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers=exc.headers,
+    )
+
+
+async def validation_error_handler(request: Request, exc: RequestValidationError):
+    logger.warning("Validation error: %s", exc.errors())
+    # errors() can carry the raw input and exception objects in ``ctx``.
+    return JSONResponse(status_code=422, content={"detail": jsonable_encoder(exc.errors())})
+
+
+async def value_error_handler(request: Request, exc: ValueError):
+    logger.warning("Value error: %s", exc)
+    return JSONResponse(status_code=404, content={"detail": str(exc)})
+
+
+async def unexpected_error_handler(request: Request, exc: Exception):
+    logger.error("Unexpected error: %s", exc, exc_info=exc)
+    return JSONResponse(
+        status_code=500, content={"detail": "An unexpected error occurred."}
+    )
+
+
+def register_exception_handlers(app: FastAPI) -> None:
+    """Map errors to JSON responses without wrapping requests in middleware.
+
+    Handlers run only when a route raises, so successful requests, including
+    streamed exports, pass through untouched.
+    """
+    app.add_exception_handler(IntegrationError, integration_error_handler)
+    app.add_exception_handler(RequestValidationError, validation_error_handler)
+    app.add_exception_handler(ValueError, value_error_handler)
+    app.add_exception_handler(Exception, unexpected_error_handler)
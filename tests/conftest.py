@@ -0,0 +1,14 @@
+import os
+import tempfile
+
+# Plugin modules read AppSettings at import time, so both CRMs need a
+# configuration before anything under addons.integration.plugins is imported.
+for _crm in ("ZOHO", "CAPSULE"):
+    _prefix = f"CRMS__{_crm}__"
+    os.environ.setdefault(f"{_prefix}CLIENT_ID", "test-client")
+    os.environ.setdefault(f"{_prefix}CLIENT_SECRET", "test-secret")
+    os.environ.setdefault(f"{_prefix}CONFIG__AUTH_URL", "https://example.test/oauth/authorize")
+    os.environ.setdefault(f"{_prefix}CONFIG__TOKEN_URL", "https://example.test/oauth/token")
+    os.environ.setdefault(f"{_prefix}CONFIG__SCOPE", "contacts")
+    os.environ.setdefault(f"{_prefix}CONFIG__REDIRECT_PATH", f"/integrations/callback/{_crm.lower()}")
+os.environ.setdefault("LOG_DIR", tempfile.mkdtemp(prefix="crmintegration-logs-"))
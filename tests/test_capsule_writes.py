@@ -0,0 +1,55 @@
+from addons.integration.mappings import CAPSULE_CONTACT_MAPPING
+
+
+def _apply_capsule_update(party, changes):
+    """Capsule's PUT semantics: list items with an id replace it, others are added."""
+    party = dict(party)
+    for key in ("emailAddresses", "phoneNumbers"):
+        items = {item["id"]: item for item in party.get(key, [])}
+        for item in changes.get(key, []):
+            if "id" in item:
+                items[item["id"]] = {**items[item["id"]], **item}
+            else:
+                new_id = max(items, default=0) + 1
+                items[new_id] = {**item, "id": new_id}
+        party[key] = list(items.values())
+    party.update({k: v for k, v in changes.items() if k not in ("emailAddresses", "phoneNumbers")})
+    return party
+
+
+PARTY = {
+    "id": 7,
+    "type": "person",
+    "firstName": "Jane",
+    "lastName": "Doe",
+    "emailAddresses": [
+        {"id": 1, "type": "Home", "address": "jane@home.example"},
+        {"id": 2, "type": "Work", "address": "jane@old.example"},
+    ],
+    "phoneNumbers": [{"id": 3, "type": "Work", "number": "+1 555 0100"}],
+}
+
+
+def test_update_replaces_work_entries_by_id():
+    changes = CAPSULE_CONTACT_MAPPING.unmap(
+        {"id": 7, "email": "jane@new.example", "phone": "+1 555 0199"}, PARTY
+    )
+    assert changes["emailAddresses"] == [{"type": "Work", "address": "jane@new.example", "id": 2}]
+    assert changes["phoneNumbers"] == [{"type": "Work", "number": "+1 555 0199", "id": 3}]
+
+
+def test_update_round_trip():
+    party = PARTY
+    for email in ("jane@new.example", "jane@newer.example"):
+        changes = CAPSULE_CONTACT_MAPPING.unmap({"id": 7, "email": email}, party)
+        party = _apply_capsule_update(party, changes)
+        assert CAPSULE_CONTACT_MAPPING.map(party)["email"] == email
+    assert len(party["emailAddresses"]) == 2
+
+
+def test_create_adds_new_entries():
+    record = CAPSULE_CONTACT_MAPPING.unmap({"first_name": "Bob", "email": "bob@example.com"})
+    assert record == {
+        "firstName": "Bob",
+        "emailAddresses": [{"type": "Work", "address": "bob@example.com"}],
+    }
@@ -0,0 +1,42 @@
+import io
+
+import pytest
+
+from addons.integration.columnar import CONTACT_COLUMNS, ContactColumns, ParquetStream
+from addons.integration.mappings import CAPSULE_CONTACT_MAPPING, ZOHO_CONTACT_MAPPING
+
+
+def _pages():
+    zoho = ContactColumns.from_records(
+        ZOHO_CONTACT_MAPPING,
+        [{"id": 10, "First_Name": "Jane", "Email": "jane@example.com", "Owner": {"email": "o@x"}}],
+        "zoho",
+    )
+    capsule = ContactColumns.from_records(
+        CAPSULE_CONTACT_MAPPING,
+        [{"id": 7, "firstName": "Bob", "organisation": {"name": "Acme"}}],
+        "capsule",
+    )
+    return [zoho, ContactColumns(), capsule]
+
+
+def test_batches_from_different_crms_share_one_schema():
+    zoho, empty, capsule = _pages()
+    zoho.concat(empty)
+    zoho.concat(capsule)
+    rows = list(zoho.rows())
+    assert [row["crm"] for row in rows] == ["zoho", "capsule"]
+    assert rows[0]["owner_email"] == "o@x"
+    assert rows[1]["company"] == "Acme"
+    assert zoho.to_pydict()["id"] == ["10", "7"]
+
+
+def test_parquet_stream_round_trip():
+    parquet = pytest.importorskip("pyarrow.parquet")
+    stream = ParquetStream()
+    pieces = [stream.write(batch) for batch in _pages()]
+    pieces.append(stream.close())
+    table = parquet.read_table(io.BytesIO(b"".join(pieces)))
+    assert table.column_names == list(CONTACT_COLUMNS)
+    assert table.column("id").to_pylist() == ["10", "7"]
+    assert table.column("first_name").to_pylist() == ["Jane", "Bob"]
@@ -0,0 +1,25 @@
+from addons.integration.columnar import CONTACT_COLUMNS, ContactColumns
+from addons.integration.mappings import CAPSULE_CONTACT_MAPPING, ZOHO_CONTACT_MAPPING
+
+
+def test_map_columns_empty_batch():
+    for mapping in (ZOHO_CONTACT_MAPPING, CAPSULE_CONTACT_MAPPING):
+        expected = {field.name: [] for field in mapping.fields}
+        assert mapping.map_columns([]) == expected
+        assert mapping.map_columns([None, "not a record"]) == expected
+
+
+def test_contact_columns_from_empty_page():
+    batch = ContactColumns.from_records(ZOHO_CONTACT_MAPPING, [], "zoho")
+    assert len(batch) == 0
+    assert batch.to_pydict() == {name: [] for name in CONTACT_COLUMNS}
+
+
+def test_map_columns_matches_map_many():
+    records = [
+        {"id": 1, "First_Name": "Jane", "Last_Name": "Doe", "Email": "jane@example.com"},
+        {"id": 2, "first_name": "Bob", "last_name": "Roe", "Full_Name": "Robert Roe"},
+    ]
+    columns = ZOHO_CONTACT_MAPPING.map_columns(records)
+    for row, expected in enumerate(ZOHO_CONTACT_MAPPING.map_many(records)):
+        assert {name: column[row] for name, column in columns.items()} == expected
@@ -0,0 +1,25 @@
+import asyncio
+import json
+
+from fastapi.exceptions import RequestValidationError
+
+from core.handlers import validation_error_handler
+
+
+def test_validation_error_handler_encodes_error_context():
+    exc = RequestValidationError(
+        [
+            {
+                "type": "value_error",
+                "loc": ("body", "since"),
+                "msg": "Value error, bad timestamp",
+                "input": b"not-a-date",
+                "ctx": {"error": ValueError("bad timestamp")},
+            }
+        ]
+    )
+    response = asyncio.run(validation_error_handler(None, exc))
+    assert response.status_code == 422
+    (error,) = json.loads(response.body)["detail"]
+    assert error["loc"] == ["body", "since"]
+    assert error["ctx"] == {"error": {}}
@@ -0,0 +1,19 @@
+import pytest
+
+from addons.integration.hookspec import crm_hook_callers, get_plugin_manager
+from core.exception import UnsupportedCRMError
+
+
+def test_unknown_crm_names_do_not_grow_caller_memo():
+    hook_callers = crm_hook_callers(get_plugin_manager())
+    first = hook_callers.caller("get_auth_url", ["zoho", "unknown-1"])
+    for i in range(2, 50):
+        assert hook_callers.caller("get_auth_url", ["ZOHO", f"unknown-{i}"]) is first
+    assert len(hook_callers._callers) == 1
+
+
+def test_only_unknown_crm_names_are_rejected():
+    hook_callers = crm_hook_callers(get_plugin_manager())
+    with pytest.raises(UnsupportedCRMError):
+        hook_callers.caller("get_auth_url", ["unknown"])
+    assert not hook_callers._callers
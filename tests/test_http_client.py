@@ -0,0 +1,80 @@
+import asyncio
+
+import httpx
+import pytest
+
+from addons.http_client import CRMHTTPClient
+from config.settings import CRMRateLimitConfig
+
+URL = "https://crm.example.test/contacts"
+
+
+def _client(handler, **policy):
+    policy = {"backoff_base": 0.0, "backoff_max": 1.0, "max_retries": 2, **policy}
+    client = CRMHTTPClient(
+        "zoho", rate_limit=CRMRateLimitConfig(requests_per_second=1000, burst=100, **policy)
+    )
+    client._clients["https://crm.example.test"] = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler)
+    )
+    return client
+
+
+def _send(client, method):
+    async def run():
+        try:
+            return await client.request(method, URL)
+        finally:
+            await client.aclose()
+
+    return asyncio.run(run())
+
+
+def _counting(status_code, headers=None):
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        return httpx.Response(status_code, headers=headers)
+
+    return handler, calls
+
+
+def test_5xx_is_retried_only_for_idempotent_methods():
+    handler, calls = _counting(503)
+    assert _send(_client(handler), "GET").status_code == 503
+    assert calls == ["GET"] * 3
+
+    handler, calls = _counting(503)
+    assert _send(_client(handler), "POST").status_code == 503
+    assert calls == ["POST"]
+
+
+def test_429_is_retried_for_any_method():
+    handler, calls = _counting(429, {"Retry-After": "0"})
+    assert _send(_client(handler), "POST").status_code == 429
+    assert calls == ["POST"] * 3
+
+
+def test_retry_after_beyond_backoff_max_is_not_waited_for():
+    handler, calls = _counting(429, {"Retry-After": "3600"})
+    assert _send(_client(handler), "GET").status_code == 429
+    assert calls == ["GET"]
+
+
+def test_transport_errors_are_retried_only_for_idempotent_methods():
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        if len(calls) < 3:
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(200)
+
+    assert _send(_client(handler), "PUT").status_code == 200
+    assert calls == ["PUT"] * 3
+
+    calls.clear()
+    with pytest.raises(httpx.ConnectError):
+        _send(_client(handler), "POST")
+    assert calls == ["POST"]
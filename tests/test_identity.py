@@ -0,0 +1,220 @@
+import asyncio
+
+import pytest
+
+from addons.identity import IdentityLinker
+from addons.storage.contacts import ContactStore
+from config.settings import IdentitySettings
+from core.exception import IntegrationError
+
+
+def _store(tmp_path, **settings):
+    return ContactStore(
+        str(tmp_path / "contacts.db"), IdentitySettings(enabled=True, **settings)
+    )
+
+
+def _contact(contact_id, email="", phone="", first="", last=""):
+    return {
+        "id": contact_id,
+        "email": email,
+        "phone": phone,
+        "first_name": first,
+        "last_name": last,
+        "updated_at": "2025-01-01T00:00:00Z",
+    }
+
+
+def _linked(store, crm, contacts):
+    store.upsert_contacts(crm, contacts)
+    store.identity.link_pending(1000)
+
+
+def _cluster_of(store, crm, contact_id):
+    (golden,) = store.identity.find_golden(crm=crm, contact_id=contact_id)
+    return golden["cluster_id"]
+
+
+def test_link_merges_on_email_phone_and_name_at_company(tmp_path):
+    store = _store(tmp_path)
+    _linked(
+        store,
+        "zoho",
+        [
+            _contact("z1", email="Jane.Doe+crm@gmail.com"),
+            _contact("z2", phone="(555) 010-0100"),
+            {**_contact("z3", first="José", last="Núñez"), "company": "Acme Inc."},
+        ],
+    )
+    _linked(
+        store,
+        "capsule",
+        [
+            _contact("c1", email="janedoe@googlemail.com"),
+            _contact("c2", phone="+1 555 010 0100"),
+            {**_contact("c3", first="Jose", last="Nunez"), "company": "ACME"},
+            _contact("c4", email="someone@example.com"),
+        ],
+    )
+    assert _cluster_of(store, "zoho", "z1") == _cluster_of(store, "capsule", "c1")
+    assert _cluster_of(store, "zoho", "z2") == _cluster_of(store, "capsule", "c2")
+    assert _cluster_of(store, "zoho", "z3") == _cluster_of(store, "capsule", "c3")
+    assert store.identity.stats() == {
+        "clusters": 4, "members": 7, "merged_clusters": 3, "pending": 0
+    }
+    store.close()
+
+
+def test_bridging_contact_merges_clusters(tmp_path):
+    store = _store(tmp_path)
+    _linked(store, "zoho", [_contact("z1", email="jane@example.com")])
+    _linked(store, "capsule", [_contact("c1", phone="5550100100")])
+    assert _cluster_of(store, "zoho", "z1") != _cluster_of(store, "capsule", "c1")
+
+    _linked(store, "capsule", [_contact("c2", email="jane@example.com", phone="5550100100")])
+    cluster_id = _cluster_of(store, "zoho", "z1")
+    assert _cluster_of(store, "capsule", "c1") == cluster_id
+    assert store.identity.get_golden(cluster_id)["phones"] == ["+15550100100"]
+    assert store.identity.stats()["clusters"] == 1
+    store.close()
+
+
+def test_new_clusters_get_opaque_ids(tmp_path):
+    store = _store(tmp_path)
+    _linked(store, "zoho", [_contact("z1", email="jane@example.com")])
+    assert _cluster_of(store, "zoho", "z1") not in ("z1", "zoho:z1")
+    store.close()
+
+
+def test_recreated_contact_does_not_rejoin_cluster_it_left(tmp_path):
+    store = _store(tmp_path)
+    _linked(
+        store,
+        "zoho",
+        [_contact("z1", email="jane@example.com"), _contact("z2", email="jane@example.com")],
+    )
+    old_cluster = _cluster_of(store, "zoho", "z2")
+    store.delete_contacts("zoho", ["z1"])
+    store.identity.link_pending(1000)
+    assert _cluster_of(store, "zoho", "z2") == old_cluster
+
+    _linked(store, "zoho", [_contact("z1", email="bob@example.com")])
+    assert _cluster_of(store, "zoho", "z1") != old_cluster
+    assert [source["id"] for source in store.identity.get_golden(old_cluster)["sources"]] == [
+        "z2"
+    ]
+    store.close()
+
+
+def test_upsert_only_queues_contacts_for_linking(tmp_path):
+    store = _store(tmp_path)
+    store.upsert_contacts("zoho", [_contact("z1", email="jane@example.com")])
+    store.upsert_contacts("capsule", [_contact("c1", email="Jane@Example.com")])
+    assert store.identity.stats()["pending"] == 2
+    assert store.identity.find_golden(email="jane@example.com") == []
+
+    assert store.identity.link_pending(10) == 2
+    (golden,) = store.identity.find_golden(email="jane@example.com")
+    assert {(source["crm"], source["id"]) for source in golden["sources"]} == {
+        ("zoho", "z1"),
+        ("capsule", "c1"),
+    }
+    assert store.identity.stats()["pending"] == 0
+    store.close()
+
+
+def test_queued_deletes_unlink_contacts(tmp_path):
+    store = _store(tmp_path)
+    store.upsert_contacts(
+        "zoho", [_contact("z1", email="jane@example.com"), _contact("z2", email="jane@example.com")]
+    )
+    store.identity.link_pending(10)
+    store.delete_contacts("zoho", ["z1"])
+    store.identity.link_pending(10)
+    (golden,) = store.identity.find_golden(email="jane@example.com")
+    assert [source["id"] for source in golden["sources"]] == ["z2"]
+    assert store.identity.find_golden(crm="zoho", contact_id="z1") == []
+    store.close()
+
+
+def test_linker_drains_queue_in_batches(tmp_path):
+    settings = IdentitySettings(enabled=True, link_batch_size=2, link_interval_seconds=0.01)
+    store = ContactStore(str(tmp_path / "contacts.db"), settings)
+    store.upsert_contacts("zoho", [_contact(f"z{i}", email=f"user{i}@example.com") for i in range(5)])
+
+    async def run():
+        linker = IdentityLinker(store.identity, settings)
+        linker.start()
+        for _ in range(100):
+            if store.identity.stats()["pending"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        await linker.stop()
+
+    asyncio.run(run())
+    assert store.identity.stats()["pending"] == 0
+    assert store.identity.stats()["clusters"] == 5
+    store.close()
+
+
+def test_unchanged_contacts_are_not_requeued(tmp_path):
+    store = _store(tmp_path)
+    contacts = [_contact("z1", email="jane@example.com"), _contact("z2", email="bob@example.com")]
+    store.upsert_contacts("zoho", contacts)
+    store.identity.link_pending(10)
+    store.upsert_contacts("zoho", [*contacts[:1], _contact("z2", email="rob@example.com")])
+    assert store.identity.stats()["pending"] == 1
+    store.close()
+
+
+def test_rebuild_splits_stale_links_and_swaps_atomically(tmp_path):
+    store = _store(tmp_path)
+    store.upsert_contacts(
+        "zoho", [_contact("z1", email="jane@example.com"), _contact("z2", email="jane@example.com")]
+    )
+    store.identity.link_pending(10)
+    store.upsert_contacts("zoho", [_contact("z2", email="bob@example.com")])
+    store.identity.link_pending(10)
+    # Linking only merges, so z2 stays in Jane's cluster until a rebuild.
+    assert store.identity.stats()["clusters"] == 1
+
+    index = store.identity
+    link = index.link
+    seen_during_rebuild = []
+
+    def link_and_look(*args, **kwargs):
+        seen_during_rebuild.append(index.stats()["clusters"])
+        return link(*args, **kwargs)
+
+    index.link = link_and_look
+    summary = index.rebuild()
+    index.link = link
+
+    assert seen_during_rebuild == [1]
+    assert summary["contacts"] == 2
+    assert summary["clusters"] == 2
+    (golden,) = index.find_golden(email="jane@example.com")
+    assert [source["id"] for source in golden["sources"]] == ["z1"]
+    tables = {
+        row[0] for row in store.db.connection().execute("SELECT name FROM sqlite_master")
+    }
+    assert not any(name.startswith("identity_rebuild_") for name in tables)
+    store.close()
+
+
+def test_running_rebuild_pauses_linking(tmp_path):
+    store = _store(tmp_path)
+    conn = store.db.connection()
+    conn.execute(
+        "INSERT INTO identity_rebuild (id, owner, heartbeat) VALUES (1, 'other', ?)",
+        ("9999-12-31T00:00:00.000000+00:00",),
+    )
+    store.upsert_contacts("zoho", [_contact("z1", email="jane@example.com")])
+    assert store.identity.link_pending(10) == 0
+    with pytest.raises(IntegrationError) as error:
+        store.identity.rebuild()
+    assert error.value.status_code == 409
+
+    conn.execute("DELETE FROM identity_rebuild")
+    assert store.identity.link_pending(10) == 1
+    store.close()
@@ -0,0 +1,44 @@
+import logging
+import queue
+
+from api.utils import logger as logging_setup
+from api.utils.logger import DeferredQueueHandler, logger, start_log_listener, stop_log_listener
+
+
+def _prepared(msg, *args):
+    handler = DeferredQueueHandler(queue.SimpleQueue())
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, msg, args, None)
+    return handler.prepare(record)
+
+
+def test_mutable_args_are_rendered_at_call_time():
+    contacts = ["z1"]
+    record = _prepared("Saving %s", contacts)
+    contacts.append("z2")
+    assert record.getMessage() == "Saving ['z1']"
+    assert record.args is None
+
+
+def test_immutable_args_are_left_for_the_listener():
+    record = _prepared("Synced %s contacts from %s", 3, ("zoho", "default"))
+    assert record.args == (3, ("zoho", "default"))
+    assert record.getMessage() == "Synced 3 contacts from ('zoho', 'default')"
+
+
+def test_listener_flushes_queued_records_on_stop():
+    seen = []
+
+    class Collect(logging.Handler):
+        def emit(self, record):
+            seen.append(record.getMessage())
+
+    handlers = logging_setup.listener.handlers
+    logging_setup.listener.handlers = (Collect(),)
+    start_log_listener()
+    try:
+        logger.error("queued %s", 1)
+    finally:
+        stop_log_listener()
+        logging_setup.listener.handlers = handlers
+    assert seen == ["queued 1"]
+    assert all(not isinstance(handler, DeferredQueueHandler) for handler in logger.handlers)
@@ -0,0 +1,62 @@
+import asyncio
+
+from addons.integration.pagination import Page, iter_pages
+
+
+def _pages(last_page, delay=0.01, total_pages=None):
+    started, finished, cancelled = [], [], []
+
+    async def fetch_page(number):
+        started.append(number)
+        try:
+            # Later pages take longer, so they are still in flight when earlier ones land.
+            await asyncio.sleep(delay * number)
+        except asyncio.CancelledError:
+            cancelled.append(number)
+            raise
+        finished.append(number)
+        return Page(number, [{"id": number}], number < last_page, total_pages)
+
+    return fetch_page, started, finished, cancelled
+
+
+def test_pages_are_yielded_in_order():
+    fetch_page, started, finished, cancelled = _pages(last_page=5)
+
+    async def run():
+        return [page.number async for page in iter_pages(fetch_page, concurrency=3)]
+
+    assert asyncio.run(run()) == [1, 2, 3, 4, 5]
+    assert set(finished) >= {1, 2, 3, 4, 5}
+    # Speculative requests past the last page are cancelled, not left running.
+    assert cancelled
+    assert set(started) == set(finished) | set(cancelled)
+
+
+def test_known_total_pages_bounds_the_requests():
+    fetch_page, started, _, _ = _pages(last_page=3, total_pages=3)
+
+    async def run():
+        return [page.number async for page in iter_pages(fetch_page, concurrency=4)]
+
+    assert asyncio.run(run()) == [1, 2, 3]
+    assert sorted(started) == [1, 2, 3]
+
+
+def test_stopping_early_cancels_the_speculative_window():
+    fetch_page, started, finished, cancelled = _pages(last_page=100)
+
+    async def run():
+        pages = iter_pages(fetch_page, concurrency=4)
+        seen = []
+        async for page in pages:
+            seen.append(page.number)
+            if len(seen) == 2:
+                break
+        await pages.aclose()
+        return seen
+
+    assert asyncio.run(run()) == [1, 2]
+    assert sorted(started) == [1, 2, 3, 4, 5]
+    assert sorted(cancelled) == [3, 4, 5]
+    assert sorted(finished) == [1, 2]
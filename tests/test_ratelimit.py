@@ -0,0 +1,57 @@
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+from pydantic import ValidationError
+
+from addons.ratelimit import TokenBucket, backoff_delay, parse_retry_after
+from config.settings import CRMRateLimitConfig
+
+
+def test_parse_retry_after_delta_seconds():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(" 0 ") == 0.0
+
+
+def test_parse_retry_after_http_date():
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=90)
+    delay = parse_retry_after(format_datetime(retry_at, usegmt=True))
+    assert 85 <= delay <= 90
+    past = datetime.now(timezone.utc) - timedelta(hours=1)
+    assert parse_retry_after(format_datetime(past, usegmt=True)) == 0.0
+
+
+def test_parse_retry_after_rejects_missing_or_invalid_values():
+    for value in (None, "", "soon", "-5", "1.5"):
+        assert parse_retry_after(value) is None
+
+
+def test_backoff_delay_stays_within_capped_exponential_bound():
+    random.seed(7)
+    for attempt in range(12):
+        bound = min(30.0, 0.5 * 2**attempt)
+        delays = [backoff_delay(attempt, 0.5, 30.0) for _ in range(200)]
+        assert all(0 <= delay <= bound for delay in delays)
+    assert max(backoff_delay(20, 0.5, 30.0) for _ in range(200)) > 15
+
+
+def test_rate_limit_settings_reject_zero_rate_or_burst():
+    for invalid in ({"requests_per_second": 0}, {"requests_per_second": -1}, {"burst": 0}):
+        with pytest.raises(ValidationError):
+            CRMRateLimitConfig(**invalid)
+
+
+def test_token_bucket_allows_burst_then_paces():
+    bucket = TokenBucket(rate=50, capacity=5)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for _ in range(10):
+            await bucket.acquire()
+        return loop.time() - started
+
+    elapsed = asyncio.run(run())
+    assert 0.08 <= elapsed < 0.5
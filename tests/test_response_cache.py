@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+from addons.response_cache import HIT, MISS, REVALIDATED, SHARED, ResponseCache
+
+
+def _loader(value, calls, delay=0.0):
+    async def load(validators):
+        calls.append(validators)
+        await asyncio.sleep(delay)
+        return {**value, "validators": {"etag": '"v1"'}}
+
+    return load
+
+
+def test_fresh_entries_are_hits_and_expired_entries_reload():
+    cache = ResponseCache(ttl=0.05)
+    calls = []
+    load = _loader({"data": [1]}, calls)
+
+    assert asyncio.run(cache.fetch("page", load)) == ({"data": [1]}, MISS)
+    assert asyncio.run(cache.fetch("page", load)) == ({"data": [1]}, HIT)
+    time.sleep(0.06)
+    assert asyncio.run(cache.fetch("page", load))[1] == MISS
+    assert calls == [None, {"etag": '"v1"'}]
+
+
+def test_not_modified_renews_the_stale_entry():
+    cache = ResponseCache(ttl=0.0)
+    asyncio.run(cache.fetch("page", _loader({"data": [1]}, [])))
+    validators_sent = []
+
+    async def not_modified(validators):
+        validators_sent.append(validators)
+        return {"not_modified": True}
+
+    assert asyncio.run(cache.fetch("page", not_modified)) == ({"data": [1]}, REVALIDATED)
+    assert validators_sent == [{"etag": '"v1"'}]
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", {"data": "a"})
+    cache.set("b", {"data": "b"})
+    cache.get("a")
+    cache.set("c", {"data": "c"})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.evictions == 1
+
+
+def test_byte_cap_evicts_and_skips_oversized_values():
+    cache = ResponseCache(max_bytes=40)
+    cache.set("a", {"data": "x" * 10})
+    cache.set("b", {"data": "y" * 10})
+    assert len(cache) == 1 and cache.get("b") is not None
+    cache.set("b", {"data": "z" * 100})
+    assert len(cache) == 0
+    assert cache.stats()["bytes"] == 0
+
+
+def test_concurrent_misses_share_one_load():
+    cache = ResponseCache()
+    calls = []
+    load = _loader({"data": [1]}, calls, delay=0.01)
+
+    async def run():
+        return await asyncio.gather(*(cache.fetch("page", load) for _ in range(3)))
+
+    outcomes = [outcome for _, outcome in asyncio.run(run())]
+    assert sorted(outcomes) == sorted([MISS, SHARED, SHARED])
+    assert len(calls) == 1
+    assert cache.stats()["shared"] == 2
+
+
+def test_invalidate_drops_entries_by_prefix():
+    cache = ResponseCache()
+    cache.set(("zoho", "default", 1), {"data": []})
+    cache.set(("zoho", "default", 2), {"data": []})
+    cache.set(("capsule", "default", 1), {"data": []})
+    assert cache.invalidate(("zoho",)) == 2
+    assert len(cache) == 1
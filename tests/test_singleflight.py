@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from addons.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "tokens"
+
+    async def run():
+        return await asyncio.gather(*(flight.do("zoho", work) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["tokens"] * 5
+    assert len(calls) == 1
+    assert not flight.in_flight("zoho")
+
+
+def test_exception_is_shared_and_key_released():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("refresh failed")
+
+    async def run():
+        return await asyncio.gather(
+            *(flight.do("zoho", fail) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert not flight.in_flight("zoho")
+
+
+def test_cancelled_leader_hands_over_to_a_follower():
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def run():
+        leader = asyncio.create_task(flight.do("zoho", work))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(flight.do("zoho", work)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*followers)
+
+    assert asyncio.run(run()) == [2, 2, 2]
+    assert len(calls) == 2
+
+
+def test_cancelled_follower_does_not_cancel_the_shared_call():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.03)
+        return "tokens"
+
+    async def run():
+        leader = asyncio.create_task(flight.do("zoho", work))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("zoho", work))
+        other = asyncio.create_task(flight.do("zoho", work))
+        await asyncio.sleep(0.01)
+        follower.cancel()
+        return await leader, await other
+
+    assert asyncio.run(run()) == ("tokens", "tokens")
+
+
+def test_do_sync_coalesces_threads():
+    flight = SingleFlight()
+    calls = []
+    results = []
+
+    def work():
+        calls.append(1)
+        time.sleep(0.05)
+        return "tokens"
+
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.do_sync("zoho", work)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["tokens"] * 4
+    assert len(calls) == 1
@@ -0,0 +1,126 @@
+import asyncio
+import sqlite3
+
+import pluggy
+
+from addons.integration.hooks import hookimpl
+from addons.integration.hookspec import Spec
+from addons.storage.contacts import ContactStore
+from addons.storage.sqlite_store import SQLiteTokenStore
+from addons.storage.sync_jobs import RUNNING, SUCCEEDED, SyncJobStore
+from addons.sync_scheduler import SyncScheduler
+from addons.token_manager import TokenManager
+from config.settings import IdentitySettings, SyncSettings
+
+PAGES = {
+    page: [{"id": f"z{page}", "updated_at": f"2025-01-0{page}T00:00:00Z"}]
+    for page in range(1, 5)
+}
+
+
+class FakeZoho:
+    crm_name = "zoho"
+
+    def __init__(self):
+        self.start_pages = []
+
+    @hookimpl
+    async def iter_contacts(
+        self, crm_name, with_tokens, per_page, modified_since, start_page, columnar
+    ):
+        self.start_pages.append(start_page)
+        for page in range(start_page, len(PAGES) + 1):
+            yield await with_tokens(lambda tokens, page=page: _page(page))
+
+
+async def _page(page):
+    return PAGES[page]
+
+
+def _scheduler(tmp_path, **settings):
+    pm = pluggy.PluginManager("crmintegration")
+    pm.add_hookspecs(Spec)
+    plugin = FakeZoho()
+    pm.register(plugin)
+    token_store = SQLiteTokenStore(str(tmp_path / "tokens.db"))
+    token_store.save_tokens("zoho", {"access_token": "a", "refresh_token": "r"})
+
+    async def refresher(crm_name, refresh_token):
+        raise AssertionError("tokens do not expire in these tests")
+
+    scheduler = SyncScheduler(
+        pm,
+        TokenManager(token_store, refresher),
+        ContactStore(str(tmp_path / "contacts.db"), IdentitySettings()),
+        SyncJobStore(str(tmp_path / "sync_jobs.db")),
+        SyncSettings(
+            workers=1, incremental_interval_seconds=0, full_interval_seconds=0, **settings
+        ),
+        ["zoho"],
+    )
+    return scheduler, plugin
+
+
+async def _drain(scheduler):
+    await scheduler.start()
+    await asyncio.wait_for(scheduler._queue.join(), 5)
+    await scheduler.stop()
+
+
+def test_claim_is_exclusive_until_the_lease_expires(tmp_path):
+    store = SyncJobStore(str(tmp_path / "sync_jobs.db"))
+    job = store.create_job("zoho", "full")
+    assert store.claim_job(job["id"], "first", lease_seconds=60)["owner"] == "first"
+    assert store.claim_job(job["id"], "second", lease_seconds=60) is None
+
+    store.db.connection().execute(
+        "UPDATE sync_jobs SET heartbeat = '2000-01-01T00:00:00.000000+00:00'"
+    )
+    assert store.claim_job(job["id"], "second", lease_seconds=60)["owner"] == "second"
+    assert store.release_jobs("second") == 1
+    assert store.get_job(job["id"])["owner"] is None
+    store.close()
+
+
+def test_start_resumes_an_orphaned_job_from_its_next_page(tmp_path):
+    scheduler, plugin = _scheduler(tmp_path)
+    job = scheduler.job_store.create_job("zoho", "full")
+    scheduler.job_store.update_job(job["id"], status=RUNNING, next_page=3, pages=2, changed=2)
+
+    asyncio.run(_drain(scheduler))
+
+    assert plugin.start_pages == [3]
+    job = scheduler.job_store.get_job(job["id"])
+    assert (job["status"], job["next_page"], job["pages"], job["owner"]) == (SUCCEEDED, 5, 4, None)
+    assert scheduler.contact_store.get_contact("zoho", "z1") is None
+    assert scheduler.contact_store.get_contact("zoho", "z4") is not None
+
+
+def test_start_leaves_jobs_held_by_a_live_scheduler(tmp_path):
+    scheduler, plugin = _scheduler(tmp_path)
+    job = scheduler.job_store.create_job("zoho", "full", owner="other-process")
+    scheduler.job_store.update_job(job["id"], status=RUNNING)
+
+    asyncio.run(_drain(scheduler))
+
+    assert plugin.start_pages == []
+    job = scheduler.job_store.get_job(job["id"])
+    assert (job["status"], job["owner"]) == (RUNNING, "other-process")
+
+
+def test_existing_job_tables_gain_ownership_columns(tmp_path):
+    path = str(tmp_path / "sync_jobs.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE sync_jobs (id TEXT PRIMARY KEY, crm TEXT NOT NULL, tenant TEXT NOT NULL, "
+        "mode TEXT NOT NULL, trigger TEXT NOT NULL, status TEXT NOT NULL, modified_since TEXT, "
+        "next_page INTEGER NOT NULL DEFAULT 1, pages INTEGER NOT NULL DEFAULT 0, "
+        "changed INTEGER NOT NULL DEFAULT 0, high_water TEXT, cursor TEXT, "
+        "attempts INTEGER NOT NULL DEFAULT 0, error TEXT, created_at TEXT NOT NULL, "
+        "started_at TEXT, updated_at TEXT NOT NULL, finished_at TEXT)"
+    )
+    conn.close()
+    store = SyncJobStore(path)
+    job = store.create_job("zoho", "full")
+    assert store.claim_job(job["id"], "owner", lease_seconds=60)["owner"] == "owner"
+    store.close()
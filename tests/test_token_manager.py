@@ -0,0 +1,115 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from addons.storage.sqlite_store import SQLiteTokenStore
+from addons.token_manager import TokenManager
+from core.exception import TokenExpiredError
+
+
+def _tokens(access_token, expires_in):
+    expires_at = datetime.now() + timedelta(seconds=expires_in)
+    return {
+        "access_token": access_token,
+        "refresh_token": "refresh",
+        "expires_at": expires_at.isoformat(),
+    }
+
+
+class Refresher:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self, crm_name, refresh_token):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        expires_at = datetime.now() + timedelta(hours=1)
+        return {"access_token": f"access-{self.calls}", "expires_at": expires_at.isoformat()}
+
+
+def _manager(tmp_path, refresher, **options):
+    store = SQLiteTokenStore(str(tmp_path / "tokens.db"))
+    return store, TokenManager(store, refresher, **options)
+
+
+def test_concurrent_refreshes_are_coalesced(tmp_path):
+    refresher = Refresher(delay=0.02)
+    store, manager = _manager(tmp_path, refresher)
+    store.save_tokens("zoho", _tokens("stale", 3600))
+
+    async def run():
+        return await asyncio.gather(
+            *(manager.refresh("zoho", stale_access_token="stale") for _ in range(5))
+        )
+
+    results = asyncio.run(run())
+    assert refresher.calls == 1
+    assert {tokens["access_token"] for tokens in results} == {"access-1"}
+    assert store.get_tokens("zoho")["access_token"] == "access-1"
+    store.close()
+
+
+def test_tokens_are_refreshed_ahead_of_expiry(tmp_path):
+    refresher = Refresher()
+    store, manager = _manager(tmp_path, refresher, refresh_margin=timedelta(minutes=5))
+
+    store.save_tokens("zoho", _tokens("valid", 3600))
+    assert asyncio.run(manager.get_valid_tokens("zoho"))["access_token"] == "valid"
+    assert refresher.calls == 0
+
+    store.save_tokens("capsule", _tokens("expiring", 120))
+    assert asyncio.run(manager.get_valid_tokens("capsule"))["access_token"] == "access-1"
+    assert refresher.calls == 1
+    store.close()
+
+
+def test_writes_through_the_manager_invalidate_the_cache(tmp_path):
+    store, manager = _manager(tmp_path, Refresher(), cache_ttl=timedelta(hours=1))
+    store.save_tokens("zoho", _tokens("first", 3600))
+    assert asyncio.run(manager.get_tokens("zoho"))["access_token"] == "first"
+
+    # A write that bypasses the manager is only seen once the cache entry ages out.
+    store.save_tokens("zoho", _tokens("second", 3600))
+    assert asyncio.run(manager.get_tokens("zoho"))["access_token"] == "first"
+
+    asyncio.run(manager.save_tokens("zoho", _tokens("third", 3600)))
+    assert asyncio.run(manager.get_tokens("zoho"))["access_token"] == "third"
+    assert asyncio.run(manager.get_tokens())["access_token"] == "third"
+    store.close()
+
+
+def test_rejected_token_is_refreshed_and_retried_once(tmp_path):
+    refresher = Refresher()
+    store, manager = _manager(tmp_path, refresher)
+    store.save_tokens("zoho", _tokens("revoked", 3600))
+    seen = []
+
+    async def call(tokens):
+        seen.append(tokens["access_token"])
+        if tokens["access_token"] == "revoked":
+            raise TokenExpiredError()
+        return "ok"
+
+    assert asyncio.run(manager.call_with_tokens("zoho", call)) == "ok"
+    assert seen == ["revoked", "access-1"]
+    assert refresher.calls == 1
+    store.close()
+
+
+def test_second_rejection_is_not_retried_again(tmp_path):
+    refresher = Refresher()
+    store, manager = _manager(tmp_path, refresher)
+    store.save_tokens("zoho", _tokens("revoked", 3600))
+    seen = []
+
+    async def call(tokens):
+        seen.append(tokens["access_token"])
+        raise TokenExpiredError()
+
+    with pytest.raises(TokenExpiredError):
+        asyncio.run(manager.call_with_tokens("zoho", call))
+    assert seen == ["revoked", "access-1"]
+    assert refresher.calls == 1
+    store.close()
@@ -0,0 +1,61 @@
+from addons.storage import create_token_store
+from addons.storage.json_store import JSONTokenStore
+from config.settings import StorageSettings
+
+
+def _settings(tmp_path):
+    return StorageSettings(
+        sqlite_path=str(tmp_path / "crmintegration.db"),
+        token_file_path=str(tmp_path / "tokens.json"),
+        state_file_path=str(tmp_path / "states.json"),
+        cursor_file_path=str(tmp_path / "sync_cursors.json"),
+    )
+
+
+def test_sqlite_store_imports_json_tokens_on_first_start(tmp_path):
+    settings = _settings(tmp_path)
+    legacy = JSONTokenStore(
+        settings.token_file_path, settings.state_file_path, settings.cursor_file_path
+    )
+    legacy.save_tokens("Zoho", {"access_token": "a1", "refresh_token": "r1"})
+    legacy.save_tokens("capsule", {"access_token": "a2", "refresh_token": "r2"}, "acme")
+    legacy.save_sync_cursor("zoho", "2025-01-01T00:00:00+00:00")
+
+    store = create_token_store(settings)
+    assert store.get_tokens("zoho")["refresh_token"] == "r1"
+    assert store.get_tokens("capsule", "acme")["refresh_token"] == "r2"
+    assert store.get_latest_tokens()["crm_name"] == "zoho"
+    assert store.get_sync_cursor("zoho") == "2025-01-01T00:00:00+00:00"
+    store.close()
+
+
+def test_json_tokens_are_imported_only_once(tmp_path):
+    settings = _settings(tmp_path)
+    legacy = JSONTokenStore(
+        settings.token_file_path, settings.state_file_path, settings.cursor_file_path
+    )
+    legacy.save_tokens("zoho", {"access_token": "old", "refresh_token": "r1"})
+
+    store = create_token_store(settings)
+    store.save_tokens("zoho", {"access_token": "new", "refresh_token": "r2"})
+    store.clear_tokens("zoho")
+    store.close()
+
+    store = create_token_store(settings)
+    assert store.get_tokens("zoho") is None
+    store.close()
+
+
+def test_existing_sqlite_tokens_win_over_json(tmp_path):
+    settings = _settings(tmp_path)
+    store = create_token_store(settings)
+    store.save_tokens("zoho", {"access_token": "sqlite", "refresh_token": "r1"})
+    store.close()
+    legacy = JSONTokenStore(
+        settings.token_file_path, settings.state_file_path, settings.cursor_file_path
+    )
+    legacy.save_tokens("zoho", {"access_token": "json", "refresh_token": "r0"})
+
+    store = create_token_store(settings)
+    assert store.get_tokens("zoho")["access_token"] == "sqlite"
+    store.close()
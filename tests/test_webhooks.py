@@ -0,0 +1,59 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from addons.integration.hookspec import get_plugin_manager
+from addons.storage.contacts import ContactStore
+from addons.webhooks import WebhookIngestor, WebhookSubscriptions
+from config.settings import WebhookSettings
+
+
+def _change(record_id):
+    return {
+        "token": None,
+        "records": [{"id": record_id, "firstName": "A"}],
+        "record_ids": [],
+        "deleted_ids": [],
+    }
+
+
+def test_stop_stores_batch_in_flight(tmp_path):
+    store = ContactStore(str(tmp_path / "contacts.db"))
+
+    async def run():
+        ingestor = WebhookIngestor(
+            get_plugin_manager(),
+            None,
+            store,
+            WebhookSettings(batch_size=2, flush_interval_seconds=5),
+        )
+        ingestor.start()
+        for record_id in range(5):
+            ingestor.submit("capsule", _change(record_id))
+        await asyncio.sleep(0)
+        await ingestor.stop()
+
+    asyncio.run(run())
+    assert store.query(crm="capsule")[1] == 5
+    store.close()
+
+
+def _subscriptions(**settings):
+    return WebhookSubscriptions(None, None, None, WebhookSettings(**settings), [])
+
+
+def test_subscriptions_without_expiry_are_reverified():
+    subscriptions = _subscriptions(verify_interval_seconds=3600)
+    now = datetime.now(timezone.utc)
+    fresh = {"expires_at": None, "updated_at": now.isoformat()}
+    stale = {"expires_at": None, "updated_at": (now - timedelta(hours=2)).isoformat()}
+    assert not subscriptions._needs_renewal(fresh)
+    assert subscriptions._needs_renewal(stale)
+
+
+def test_expiring_subscriptions_renew_within_margin():
+    subscriptions = _subscriptions(renew_margin_seconds=600)
+    now = datetime.now(timezone.utc)
+    soon = {"expires_at": (now + timedelta(minutes=5)).isoformat(), "updated_at": now.isoformat()}
+    later = {"expires_at": (now + timedelta(hours=5)).isoformat(), "updated_at": now.isoformat()}
+    assert subscriptions._needs_renewal(soon)
+    assert not subscriptions._needs_renewal(later)
@@ -0,0 +1,25 @@
+import io
+import zipfile
+
+from addons.integration.mappings import ZOHO_CONTACT_MAPPING
+from addons.integration.plugins.zoho import ZohoCRMPlugin
+
+
+def _archive(text: str) -> io.BytesIO:
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as bundle:
+        bundle.writestr("1.csv", text)
+    return archive
+
+
+def test_bulk_rows_resolve_owner_email():
+    archive = _archive(
+        "Id,First_Name,Last_Name,Email,Owner\n"
+        "10,Jane,Doe,jane@example.com,1\n"
+        "11,Bob,Roe,bob@example.com,2\n"
+        "12,Ann,Poe,ann@example.com,\n"
+    )
+    rows = ZohoCRMPlugin._bulk_rows(archive, {"1": "owner@example.com"})
+    contacts = ZOHO_CONTACT_MAPPING.map_many(rows)
+    assert [contact["id"] for contact in contacts] == ["10", "11", "12"]
+    assert [contact["owner_email"] for contact in contacts] == ["owner@example.com", "", ""]